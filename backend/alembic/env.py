@@ -21,7 +21,7 @@ load_dotenv()
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.db.base_class import Base
-from app.models.models import Usuario, Cliente, Rol, Contrato, Plantilla, Pago, Abono
+import app.models  # noqa: F401  (registers every model on Base.metadata)
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
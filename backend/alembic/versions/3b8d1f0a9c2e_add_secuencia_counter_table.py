@@ -0,0 +1,34 @@
+"""Add secuencia counter table
+
+Revision ID: 3b8d1f0a9c2e
+Revises: e7a508a9f979
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8d1f0a9c2e'
+down_revision: Union[str, Sequence[str], None] = 'e7a508a9f979'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Counters are seeded lazily from the existing ids the first time a prefix is used
+    op.create_table('secuencia',
+        sa.Column('prefijo', sa.String(length=20), nullable=False),
+        sa.Column('anio', sa.Integer(), nullable=False),
+        sa.Column('valor', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('prefijo', 'anio')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('secuencia')
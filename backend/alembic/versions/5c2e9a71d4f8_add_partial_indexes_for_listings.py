@@ -0,0 +1,55 @@
+"""Add partial indexes for listings and counts
+
+Revision ID: 5c2e9a71d4f8
+Revises: 8f41c7d2b6a5
+Create Date: 2026-10-18 11:26:52.318044
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a71d4f8'
+down_revision: Union[str, Sequence[str], None] = '8f41c7d2b6a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTRATOS_ACTIVOS = sa.text("es_biblioteca = false AND is_deleted = false")
+BIBLIOTECA_ACTIVA = sa.text("es_biblioteca = true AND is_deleted = false")
+CLIENTES_ACTIVOS = sa.text("is_deleted = false")
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ('ix_contrato_activos_id', 'contrato', ['id'], CONTRATOS_ACTIVOS),
+    ('ix_contrato_abogado_id', 'contrato', ['abogado_id', 'id'], CONTRATOS_ACTIVOS),
+    ('ix_contrato_abogado_estado', 'contrato', ['abogado_id', 'estado'], CONTRATOS_ACTIVOS),
+    ('ix_contrato_biblioteca_tipo', 'contrato', ['tipo', 'id'], BIBLIOTECA_ACTIVA),
+    ('ix_cliente_usuario_id', 'cliente', ['usuario_id', 'id'], CLIENTES_ACTIVOS),
+    ('ix_pago_contrato_id', 'pago', ['contrato_id', 'id'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids locking the tables against writes while the indexes build,
+    # and it cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=where, sqlite_where=where,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.execute("ANALYZE contrato")
+        op.execute("ANALYZE cliente")
+        op.execute("ANALYZE pago")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,29 @@
+"""Add huella_pagos to contrato
+
+Revision ID: 8f41c7d2b6a5
+Revises: 3b8d1f0a9c2e
+Create Date: 2026-10-18 10:03:17.550921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f41c7d2b6a5'
+down_revision: Union[str, Sequence[str], None] = '3b8d1f0a9c2e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL means "never synchronized": the next save of each contract diffs its payments once
+    op.add_column('contrato', sa.Column('huella_pagos', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contrato', 'huella_pagos')
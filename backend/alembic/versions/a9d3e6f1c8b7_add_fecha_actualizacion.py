@@ -0,0 +1,34 @@
+"""Add fecha_actualizacion to contrato, cliente and usuario
+
+Revision ID: a9d3e6f1c8b7
+Revises: 5c2e9a71d4f8
+Create Date: 2026-10-18 13:41:09.772315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e6f1c8b7'
+down_revision: Union[str, Sequence[str], None] = '5c2e9a71d4f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('contrato', 'cliente', 'usuario')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows get the migration time as their first version
+    for table in TABLES:
+        op.add_column(table, sa.Column('fecha_actualizacion', sa.DateTime(timezone=True),
+                                       server_default=sa.func.now(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_column(table, 'fecha_actualizacion')
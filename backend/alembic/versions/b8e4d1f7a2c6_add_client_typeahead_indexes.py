@@ -0,0 +1,67 @@
+"""Add cliente.nombre_busqueda and the typeahead indexes
+
+Revision ID: b8e4d1f7a2c6
+Revises: f6a1c9d4e2b8
+Create Date: 2026-10-18 18:03:15.277940
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d1f7a2c6'
+down_revision: Union[str, Sequence[str], None] = 'f6a1c9d4e2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CLIENTES_ACTIVOS = "is_deleted = false"
+BATCH_SIZE = 5000
+
+
+def _normalize(value):
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    return ' '.join(''.join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('cliente', sa.Column('nombre_busqueda', sa.String(length=300), nullable=True))
+
+    # Backfill in id order, BATCH_SIZE rows per round trip
+    bind = op.get_bind()
+    cliente = sa.table('cliente', sa.column('id', sa.Integer), sa.column('nombre', sa.String),
+                       sa.column('apellido', sa.String), sa.column('nombre_busqueda', sa.String))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(cliente.c.id, cliente.c.nombre, cliente.c.apellido)
+            .where(cliente.c.id > last_id).order_by(cliente.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            cliente.update().where(cliente.c.id == sa.bindparam('client_id')).values(nombre_busqueda=sa.bindparam('normalized')),
+            [{'client_id': row.id, 'normalized': _normalize(f"{row.nombre or ''} {row.apellido or ''}")} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    op.create_index('ix_cliente_usuario_cedula', 'cliente', ['usuario_id', 'cedula'],
+                    postgresql_ops={'cedula': 'varchar_pattern_ops'},
+                    postgresql_where=sa.text(CLIENTES_ACTIVOS), sqlite_where=sa.text(CLIENTES_ACTIVOS))
+    if bind.dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index('ix_cliente_nombre_trgm', 'cliente', ['nombre_busqueda'], postgresql_using='gin',
+                        postgresql_ops={'nombre_busqueda': 'gin_trgm_ops'}, postgresql_where=sa.text(CLIENTES_ACTIVOS))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_cliente_nombre_trgm', table_name='cliente', postgresql_where=sa.text(CLIENTES_ACTIVOS))
+    op.drop_index('ix_cliente_usuario_cedula', table_name='cliente',
+                  postgresql_where=sa.text(CLIENTES_ACTIVOS), sqlite_where=sa.text(CLIENTES_ACTIVOS))
+    op.drop_column('cliente', 'nombre_busqueda')
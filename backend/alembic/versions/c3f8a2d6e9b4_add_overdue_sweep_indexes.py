@@ -0,0 +1,47 @@
+"""Add the partial indexes of the overdue payment sweep
+
+Revision ID: c3f8a2d6e9b4
+Revises: b8e4d1f7a2c6
+Create Date: 2026-10-18 20:41:06.512387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2d6e9b4'
+down_revision: Union[str, Sequence[str], None] = 'b8e4d1f7a2c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PAGOS_PENDIENTES = sa.text("estado = 'PENDIENTE'")
+PAGOS_VENCIDOS = sa.text("estado = 'VENCIDO'")
+
+# (name, columns, partial predicate)
+INDEXES = [
+    ('ix_pago_pendiente_vencimiento', ['fecha_vencimiento'], PAGOS_PENDIENTES),
+    ('ix_pago_vencido_contrato', ['contrato_id'], PAGOS_VENCIDOS),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps pago writable while the indexes build
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name, 'pago', columns,
+                postgresql_where=where, sqlite_where=where,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        op.execute("ANALYZE pago")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='pago', postgresql_concurrently=True, if_exists=True)
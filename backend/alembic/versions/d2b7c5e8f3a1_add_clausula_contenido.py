@@ -0,0 +1,103 @@
+"""Add clausula_contenido and move clause bodies out of contrato.clauses
+
+Revision ID: d2b7c5e8f3a1
+Revises: a9d3e6f1c8b7
+Create Date: 2026-10-18 16:05:27.518204
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7c5e8f3a1'
+down_revision: Union[str, Sequence[str], None] = 'a9d3e6f1c8b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REF_KEY = '$ref'
+BATCH_SIZE = 500
+
+
+def _contrato_table(bind):
+    json_type = postgresql.JSONB() if bind.dialect.name == 'postgresql' else sa.JSON()
+    return sa.table('contrato', sa.column('id', sa.String), sa.column('clauses', json_type))
+
+
+def _map_entries(clauses, fn):
+    if isinstance(clauses, list):
+        return [fn(entry) if isinstance(entry, dict) else entry for entry in clauses]
+    if isinstance(clauses, dict):
+        return fn(clauses)
+    return clauses
+
+
+def _rewrite_clauses(bind, rewrite):
+    """Rewrites every contrato.clauses document in id order, BATCH_SIZE rows per round trip."""
+    contrato = _contrato_table(bind)
+    last_id = ''
+    while True:
+        rows = bind.execute(
+            sa.select(contrato.c.id, contrato.c.clauses)
+            .where(contrato.c.id > last_id, contrato.c.clauses.isnot(None))
+            .order_by(contrato.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        updates = []
+        for row_id, clauses in rows:
+            new_clauses = rewrite(clauses)
+            if new_clauses != clauses:
+                updates.append({'row_id': row_id, 'clauses': new_clauses})
+        if updates:
+            bind.execute(
+                contrato.update().where(contrato.c.id == sa.bindparam('row_id')).values(clauses=sa.bindparam('clauses')),
+                updates
+            )
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    clausula_contenido = op.create_table('clausula_contenido',
+        sa.Column('huella', sa.String(length=64), nullable=False),
+        sa.Column('texto', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('huella')
+    )
+    bind = op.get_bind()
+    stored = set()
+
+    def to_reference(entry):
+        texto = entry.get('texto')
+        if not isinstance(texto, str) or not texto:
+            return entry
+        huella = hashlib.sha256(texto.encode('utf-8')).hexdigest()
+        if huella not in stored:
+            bind.execute(clausula_contenido.insert().values(huella=huella, texto=texto))
+            stored.add(huella)
+        reference = {key: value for key, value in entry.items() if key != 'texto'}
+        reference[REF_KEY] = huella
+        return reference
+
+    _rewrite_clauses(bind, lambda clauses: _map_entries(clauses, to_reference))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    clausula_contenido = sa.table('clausula_contenido', sa.column('huella', sa.String), sa.column('texto', sa.Text))
+    bodies = dict(bind.execute(sa.select(clausula_contenido.c.huella, clausula_contenido.c.texto)).all())
+
+    def inline(entry):
+        if REF_KEY not in entry:
+            return entry
+        resolved = {key: value for key, value in entry.items() if key != REF_KEY}
+        resolved.setdefault('texto', bodies.get(entry[REF_KEY], ''))
+        return resolved
+
+    _rewrite_clauses(bind, lambda clauses: _map_entries(clauses, inline))
+    op.drop_table('clausula_contenido')
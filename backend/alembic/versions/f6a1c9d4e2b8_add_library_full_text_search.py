@@ -0,0 +1,82 @@
+"""Add texto_busqueda and the full-text index of the legal library
+
+Revision ID: f6a1c9d4e2b8
+Revises: d2b7c5e8f3a1
+Create Date: 2026-10-18 17:22:48.903611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a1c9d4e2b8'
+down_revision: Union[str, Sequence[str], None] = 'd2b7c5e8f3a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DOCUMENTO_BUSQUEDA = "to_tsvector('spanish'::regconfig, coalesce(titulo, '') || ' ' || coalesce(texto_busqueda, ''))"
+BIBLIOTECA_ACTIVA = "es_biblioteca = true AND is_deleted = false"
+
+
+def _search_text(clauses, bodies):
+    entries = [clauses] if isinstance(clauses, dict) else [e for e in clauses or [] if isinstance(e, dict)]
+    parts = []
+    for entry in entries:
+        texto = entry.get('texto') or bodies.get(entry.get('$ref'), '')
+        parts.extend(part for part in (entry.get('titulo'), texto) if part)
+    return '\n'.join(parts)
+
+
+def _backfill(bind):
+    json_type = postgresql.JSONB() if bind.dialect.name == 'postgresql' else sa.JSON()
+    contrato = sa.table('contrato', sa.column('id', sa.String), sa.column('clauses', json_type),
+                        sa.column('es_biblioteca', sa.Boolean), sa.column('texto_busqueda', sa.Text))
+    clausula_contenido = sa.table('clausula_contenido', sa.column('huella', sa.String), sa.column('texto', sa.Text))
+    # The library is small compared to the contracts; load it in one go
+    items = bind.execute(sa.select(contrato.c.id, contrato.c.clauses).where(contrato.c.es_biblioteca == sa.true())).all()
+    refs = {e.get('$ref') for _, clauses in items for e in ([clauses] if isinstance(clauses, dict) else clauses or [])
+            if isinstance(e, dict) and e.get('$ref')}
+    bodies = dict(bind.execute(
+        sa.select(clausula_contenido.c.huella, clausula_contenido.c.texto).where(clausula_contenido.c.huella.in_(refs))
+    ).all()) if refs else {}
+    updates = [{'item_id': item_id, 'texto_busqueda': _search_text(clauses, bodies)} for item_id, clauses in items]
+    if updates:
+        bind.execute(
+            contrato.update().where(contrato.c.id == sa.bindparam('item_id')).values(texto_busqueda=sa.bindparam('texto_busqueda')),
+            updates
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contrato', sa.Column('texto_busqueda', sa.Text(), nullable=True))
+    bind = op.get_bind()
+    _backfill(bind)
+    if bind.dialect.name == 'postgresql':
+        op.create_index('ix_contrato_biblioteca_busqueda', 'contrato', [sa.text(DOCUMENTO_BUSQUEDA)],
+                        postgresql_using='gin', postgresql_where=sa.text(BIBLIOTECA_ACTIVA))
+    elif bind.dialect.name == 'sqlite':
+        from app.models.contract import CONTRATO_BUSQUEDA_DDL
+        for statement in CONTRATO_BUSQUEDA_DDL:
+            op.execute(statement)
+        op.execute(
+            "INSERT INTO contrato_busqueda (contrato_id, titulo, texto) "
+            "SELECT id, titulo, texto_busqueda FROM contrato WHERE es_biblioteca AND NOT is_deleted"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.drop_index('ix_contrato_biblioteca_busqueda', table_name='contrato',
+                      postgresql_where=sa.text(BIBLIOTECA_ACTIVA))
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('contrato_busqueda_ai', 'contrato_busqueda_au', 'contrato_busqueda_ad'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS contrato_busqueda")
+    op.drop_column('contrato', 'texto_busqueda')
@@ -0,0 +1,188 @@
+"""
+Content-addressed clause store. Contract and template clauses keep only a
+reference to their body ({"titulo": ..., "variables": [...], "$ref": <sha256>});
+the text lives once in clausula_contenido however many contracts use it.
+Everything else in the entry (title, variables...) stays inline as the
+per-contract part; editing a clause's text in one contract just points that
+entry at a new body and leaves the other contracts untouched.
+
+Writes need nothing special: before every flush, new or changed Contrato.clauses
+have their bodies moved to the store (INSERT ... ON CONFLICT DO NOTHING) and
+the instance gets the resolved value back afterwards. Reads go through
+`resolve`/`resolve_async`, which the contract repository calls on the rows it
+returns: all references of a batch are looked up in one query, and bodies are
+cached per process (they never change, so the cache cannot go stale).
+"""
+import hashlib
+from typing import Dict, Iterable
+from sqlalchemy import event, insert, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.cache import TTLCache
+from app.core.config import CLAUSE_CACHE_SIZE, CLAUSE_CACHE_TTL_SECONDS
+from app.models.clause import ClausulaContenido
+from app.models.contract import Contrato
+
+REF_KEY = "$ref"
+_PENDING_KEY = "clause_bodies_written"
+_RESOLVED_KEY = "clauses_to_restore"
+
+clause_bodies = TTLCache(CLAUSE_CACHE_SIZE, CLAUSE_CACHE_TTL_SECONDS)
+
+def content_hash(texto: str) -> str:
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+def _map_entries(clauses, fn):
+    """Applies `fn` to every clause entry; clauses is a list of entries or a single entry (library clauses)."""
+    if isinstance(clauses, list):
+        return [fn(entry) if isinstance(entry, dict) else entry for entry in clauses]
+    if isinstance(clauses, dict):
+        return fn(clauses)
+    return clauses
+
+def _entries(clauses) -> Iterable[dict]:
+    if isinstance(clauses, dict):
+        return (clauses,)
+    if isinstance(clauses, list):
+        return (entry for entry in clauses if isinstance(entry, dict))
+    return ()
+
+def to_references(clauses, bodies: Dict[str, str]):
+    """Returns `clauses` with every body replaced by its reference, adding the bodies to `bodies`."""
+    def reference(entry):
+        texto = entry.get("texto")
+        if not isinstance(texto, str) or not texto:
+            return entry
+        huella = content_hash(texto)
+        bodies[huella] = texto
+        stored = {key: value for key, value in entry.items() if key != "texto"}
+        stored[REF_KEY] = huella
+        return stored
+    return _map_entries(clauses, reference)
+
+def references(clauses) -> set:
+    return {entry[REF_KEY] for entry in _entries(clauses) if REF_KEY in entry}
+
+def resolve_references(clauses, bodies: Dict[str, str]):
+    def resolved(entry):
+        if REF_KEY not in entry:
+            return entry
+        resolved_entry = {key: value for key, value in entry.items() if key != REF_KEY}
+        resolved_entry.setdefault("texto", bodies.get(entry[REF_KEY], ""))
+        return resolved_entry
+    return _map_entries(clauses, resolved)
+
+def _bodies_query(huellas):
+    return select(ClausulaContenido.huella, ClausulaContenido.texto).where(ClausulaContenido.huella.in_(huellas))
+
+def _pending_references(contracts):
+    """References used by `contracts`, split into cached bodies and hashes still to fetch."""
+    known, missing = {}, set()
+    for contract in contracts:
+        for huella in references(contract.clauses):
+            if huella in known:
+                continue
+            texto = clause_bodies.get(huella)
+            if texto is None:
+                missing.add(huella)
+            else:
+                known[huella] = texto
+    return known, missing
+
+def _apply(contracts, bodies: Dict[str, str], fetched):
+    for huella, texto in fetched:
+        clause_bodies.set(huella, texto)
+        bodies[huella] = texto
+    for contract in contracts:
+        if references(contract.clauses):
+            # Loaded state, not a change: nothing is written back unless the caller edits it
+            set_committed_value(contract, "clauses", resolve_references(contract.clauses, bodies))
+    return contracts
+
+def _resolve_from_cache(contract: Contrato):
+    clauses = contract.__dict__.get("clauses")
+    huellas = references(clauses)
+    if not huellas:
+        return
+    bodies = {huella: clause_bodies.get(huella) for huella in huellas}
+    if None not in bodies.values():
+        set_committed_value(contract, "clauses", resolve_references(clauses, bodies))
+
+@event.listens_for(Contrato, "load")
+def _resolve_loaded(contract, context):
+    # Cache hits only: no I/O while rows are being loaded. Misses are left to resolve()
+    _resolve_from_cache(contract)
+
+@event.listens_for(Contrato, "refresh")
+def _resolve_refreshed(contract, context, attrs):
+    if attrs is None or "clauses" in attrs:
+        _resolve_from_cache(contract)
+
+def resolve(db: Session, contracts):
+    """Replaces clause references by their text on already loaded contracts (one query for cache misses)."""
+    contracts = [contract for contract in contracts if contract is not None]
+    bodies, missing = _pending_references(contracts)
+    fetched = db.execute(_bodies_query(missing)).all() if missing else []
+    return _apply(contracts, bodies, fetched)
+
+async def resolve_async(db: AsyncSession, contracts):
+    contracts = [contract for contract in contracts if contract is not None]
+    bodies, missing = _pending_references(contracts)
+    fetched = (await db.execute(_bodies_query(missing))).all() if missing else []
+    return _apply(contracts, bodies, fetched)
+
+def _insert_bodies(session: Session, rows: list):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(ClausulaContenido).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(ClausulaContenido).on_conflict_do_nothing()
+    else:
+        existing = {huella for huella, _ in session.execute(_bodies_query([row["huella"] for row in rows]))}
+        rows = [row for row in rows if row["huella"] not in existing]
+        stmt = insert(ClausulaContenido)
+    if rows:
+        session.execute(stmt, rows)
+
+def _clauses_changed(session: Session, contract: Contrato):
+    if contract in session.new:
+        return contract.clauses is not None
+    return inspect(contract).attrs.clauses.history.has_changes()
+
+@event.listens_for(Session, "before_flush")
+def _store_bodies(session, flush_context, instances):
+    bodies = {}
+    to_restore = session.info.setdefault(_RESOLVED_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Contrato) or not _clauses_changed(session, obj):
+            continue
+        own_bodies = {}
+        stored = to_references(obj.clauses, own_bodies)
+        if own_bodies:
+            bodies.update(own_bodies)
+            to_restore[obj] = obj.clauses
+            obj.clauses = stored
+
+    # Bodies already in the cache are known to be stored
+    new_rows = [{"huella": h, "texto": t} for h, t in bodies.items() if clause_bodies.get(h) is None]
+    if new_rows:
+        _insert_bodies(session, new_rows)
+        session.info.setdefault(_PENDING_KEY, {}).update(bodies)
+
+@event.listens_for(Session, "after_flush_postexec")
+def _restore_resolved(session, flush_context):
+    # The row now holds references; hand the caller back the text it wrote
+    for obj, clauses in session.info.pop(_RESOLVED_KEY, {}).items():
+        set_committed_value(obj, "clauses", clauses)
+
+@event.listens_for(Session, "after_commit")
+def _cache_written_bodies(session):
+    for huella, texto in session.info.pop(_PENDING_KEY, {}).items():
+        clause_bodies.set(huella, texto)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_bodies(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_RESOLVED_KEY, None)
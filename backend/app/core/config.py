@@ -1,9 +1,36 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Async request path (asyncpg / aiosqlite). Defaults to DATABASE_URL with the async driver.
+# With ASYNC_DB_ENABLED=false no async engine is built (the driver need not be installed)
+# and the async routes run their queries on the sync pool, in the threadpool
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+ASYNC_DB_ENABLED = os.getenv("ASYNC_DB_ENABLED", "true").lower() == "true"
+
+# Optional read replica for read-only routes. Reads fall back to the primary when the
+# measured replica lag exceeds REPLICA_MAX_LAG_SECONDS (or is unknown), and a user's
+# reads stay on the primary for REPLICA_READ_YOUR_WRITES_SECONDS after they write
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL")
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 5))
+REPLICA_READ_YOUR_WRITES_SECONDS = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", 30))
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", 5))
+
+# Connection pool, per engine and per worker process (the sync and async engines
+# each get their own). Size with the db_pool_* series from GET /metrics
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# GET /metrics (Prometheus) is off unless enabled. With METRICS_TOKEN set, scrapers must
+# send it as a bearer token (Prometheus `authorization` / `bearer_token` setting)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
@@ -15,3 +42,58 @@ MAIL_FROM = os.getenv("MAIL_FROM")
 MAIL_PORT = int(os.getenv("MAIL_PORT", 587))
 MAIL_SERVER = os.getenv("MAIL_SERVER", "smtp.gmail.com")
 MAIL_FROM_NAME = os.getenv("MAIL_FROM_NAME", "LexContract")
+
+# Stats counters: in-process counters kept up to date on every commit and
+# fully reconciled against the database every STATS_RECONCILE_SECONDS
+STATS_COUNTERS_ENABLED = os.getenv("STATS_COUNTERS_ENABLED", "true").lower() == "true"
+STATS_RECONCILE_SECONDS = int(os.getenv("STATS_RECONCILE_SECONDS", 300))
+
+# Legal library cache: local writes invalidate it immediately, the TTL bounds how
+# long another worker's edits take to show up
+LIBRARY_CACHE_TTL_SECONDS = int(os.getenv("LIBRARY_CACHE_TTL_SECONDS", 60))
+
+# Authenticated principals (id, estado, role names) cached per worker; local
+# writes evict immediately, the TTL bounds staleness across workers
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 30))
+
+# Shared clause bodies resolved on read; entries are content addressed, so they
+# never go stale and the TTL only bounds memory held by rarely used clauses
+CLAUSE_CACHE_SIZE = int(os.getenv("CLAUSE_CACHE_SIZE", 20000))
+CLAUSE_CACHE_TTL_SECONDS = int(os.getenv("CLAUSE_CACHE_TTL_SECONDS", 3600))
+
+# Compiled clause templates used by the render engine, and the most contracts
+# one render request may ask for
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", 20000))
+RENDER_CACHE_TTL_SECONDS = int(os.getenv("RENDER_CACHE_TTL_SECONDS", 3600))
+RENDER_MAX_ITEMS = int(os.getenv("RENDER_MAX_ITEMS", 200))
+
+# Rows fetched per round trip by the streaming CSV / NDJSON exports; memory use
+# is bounded by one batch whatever the size of the export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+# Bulk client import: rows validated and upserted per round trip, and the most
+# rows one upload may carry (the whole import is one transaction)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 1000))
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", 100000))
+
+# Contract documents (PDF / DOCX): rendered by a bounded process pool and cached
+# on local disk by content hash; files not downloaded for DOCUMENT_CACHE_MAX_AGE_DAYS
+# are deleted by a job running every DOCUMENT_CACHE_PRUNE_SECONDS
+DOCUMENT_RENDER_WORKERS = int(os.getenv("DOCUMENT_RENDER_WORKERS", min(2, os.cpu_count() or 1)))
+DOCUMENT_RENDER_QUEUE_LIMIT = int(os.getenv("DOCUMENT_RENDER_QUEUE_LIMIT", 16))
+DOCUMENT_CACHE_DIR = os.getenv("DOCUMENT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "lexcontract-documentos"))
+DOCUMENT_CACHE_MAX_AGE_DAYS = int(os.getenv("DOCUMENT_CACHE_MAX_AGE_DAYS", 30))
+DOCUMENT_CACHE_PRUNE_SECONDS = int(os.getenv("DOCUMENT_CACHE_PRUNE_SECONDS", 3600))
+
+# Overdue sweep: marks past-due installments and their contracts as VENCIDO every
+# OVERDUE_SWEEP_SECONDS (0 disables the job; scripts/sweep_overdue.py runs it once)
+OVERDUE_SWEEP_SECONDS = int(os.getenv("OVERDUE_SWEEP_SECONDS", 900))
+
+# Upper bound on the contracts generated by one batch request
+BULK_GENERATE_MAX_ITEMS = int(os.getenv("BULK_GENERATE_MAX_ITEMS", 500))
+
+# Password hashing runs on a dedicated bounded pool; beyond workers + queue limit
+# concurrent hash/verify requests are rejected with 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", 32))
@@ -1,13 +1,132 @@
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+from app.core.config import (
+    DATABASE_URL, ASYNC_DATABASE_URL, ASYNC_DB_ENABLED, DATABASE_REPLICA_URL, ASYNC_DATABASE_REPLICA_URL,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+)
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
+from app.core.unit_of_work import track
 
-engine = create_engine(DATABASE_URL, connect_args={"connect_timeout": 10})
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+def _connect_args(url) -> dict:
+    # connect_timeout is a libpq option; sqlite3.connect() rejects it
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return {"check_same_thread": False}
+    return {"connect_timeout": 10}
+
+def _async_connect_args(url) -> dict:
+    if make_url(url).get_backend_name() == "postgresql":
+        return {"timeout": 10}  # asyncpg's name for the connect timeout
+    return {}
+
+def _pool_args(url, poolclass, name: str) -> dict:
+    # SQLite keeps SQLAlchemy's own pool choice (a QueuePool would break :memory:)
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"pool_logging_name": name}
+    return {
+        "poolclass": poolclass,
+        "pool_logging_name": name,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+def async_database_url(url: str) -> str:
+    """Same database as `url`, addressed through its async driver."""
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    return sa_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+class ThreadedSession:
+    """
+    Sync fallback for the async routes when ASYNC_DB_ENABLED is off: the part of the
+    AsyncSession API they use, run on a sync Session in the threadpool.
+    """
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    async def execute(self, statement, params=None, **kwargs):
+        # Rows fetched in the worker thread, as AsyncSession does
+        return await run_in_threadpool(lambda: self.sync_session.execute(statement, params, **kwargs).freeze()())
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return (await self.execute(statement, params, **kwargs)).scalars()
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+def _threaded(factory):
+    return lambda: ThreadedSession(factory())
+
+engine = instrument(create_engine(
+    DATABASE_URL, connect_args=_connect_args(DATABASE_URL), **_pool_args(DATABASE_URL, InstrumentedQueuePool, "sync")
+))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-def get_db():
+# Read replica (optional). Without DATABASE_REPLICA_URL the read factories are the
+# primary ones; app.core.replica decides per request which factory a read route gets
+REPLICA_ENABLED = bool(DATABASE_REPLICA_URL)
+if REPLICA_ENABLED:
+    replica_engine = instrument(create_engine(
+        DATABASE_REPLICA_URL, connect_args=_connect_args(DATABASE_REPLICA_URL),
+        **_pool_args(DATABASE_REPLICA_URL, InstrumentedQueuePool, "replica")
+    ))
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+else:
+    replica_engine = engine
+    ReadSessionLocal = SessionLocal
+
+def _async_engine(url: str, pool_name: str):
+    async_engine = create_async_engine(
+        url, connect_args=_async_connect_args(url), **_pool_args(url, InstrumentedAsyncQueuePool, pool_name)
+    )
+    instrument(async_engine.sync_engine)
+    return async_engine
+
+# Async engine for the hot read routes: they run on the event loop instead of the
+# AnyIO threadpool, so concurrency is bounded by the pool, not by thread count
+if ASYNC_DB_ENABLED:
+    async_engine = _async_engine(ASYNC_DATABASE_URL or async_database_url(DATABASE_URL), "async")
+    # expire_on_commit=False: an AsyncSession cannot lazy-load expired attributes during serialization
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if REPLICA_ENABLED:
+        async_replica_engine = _async_engine(
+            ASYNC_DATABASE_REPLICA_URL or async_database_url(DATABASE_REPLICA_URL), "async-replica"
+        )
+        AsyncReadSessionLocal = async_sessionmaker(async_replica_engine, autoflush=False, expire_on_commit=False)
+    else:
+        AsyncReadSessionLocal = AsyncSessionLocal
+else:
+    async_engine = None
+    AsyncSessionLocal = _threaded(SessionLocal)
+    AsyncReadSessionLocal = _threaded(ReadSessionLocal)
+
+def get_db(request: Request):
     db = SessionLocal()
+    # Committed once by UnitOfWorkRoute when the endpoint succeeds
+    track(request, db)
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
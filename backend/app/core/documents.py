@@ -0,0 +1,100 @@
+"""
+PDF / DOCX layout of a rendered contract. Runs inside the document process pool
+(app.services.contract_documents), so it only depends on the standard library,
+reportlab and python-docx: spawned workers import this module (app.core has an
+empty __init__), not the routes, services and database engines.
+
+The input is the plain dict built by contract_documents.document_payload
+(rendered clauses plus party data); the output is written atomically to `path`.
+"""
+import io
+import os
+import tempfile
+from xml.sax.saxutils import escape
+
+# Part of the cache key: bump it whenever the layout changes so cached files are rebuilt
+LAYOUT_VERSION = 1
+
+DOCUMENT_FORMATS = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+def _party_lines(payload: dict):
+    lines = []
+    cliente = payload.get("cliente")
+    if cliente:
+        lines.append(("Cliente", " ".join(filter(None, (cliente.get("nombre"), cliente.get("apellido"))))
+                      + (f" — C.C. {cliente['cedula']}" if cliente.get("cedula") else "")))
+        contact = ", ".join(filter(None, (cliente.get("direccion"), cliente.get("ciudad"), cliente.get("celular"), cliente.get("correo"))))
+        if contact:
+            lines.append(("Contacto", contact))
+    abogado = payload.get("abogado")
+    if abogado:
+        lines.append(("Abogado", " ".join(filter(None, (abogado.get("nombre"), abogado.get("apellido"))))
+                      + (f" — C.C. {abogado['cedula']}" if abogado.get("cedula") else "")))
+    for label, key in (("Fecha", "fecha"), ("Valor total", "total"), ("Estado", "estado")):
+        if payload.get(key):
+            lines.append((label, str(payload[key])))
+    return lines
+
+def _render_pdf(payload: dict) -> bytes:
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    buffer = io.BytesIO()
+    title = payload.get("titulo") or payload["id"]
+    document = SimpleDocTemplate(buffer, pagesize=LETTER, title=title, leftMargin=2.5 * cm, rightMargin=2.5 * cm,
+                                 topMargin=2.5 * cm, bottomMargin=2.5 * cm)
+    story = [Paragraph(escape(title), styles["Title"])]
+    for label, value in _party_lines(payload):
+        story.append(Paragraph(f"<b>{escape(label)}:</b> {escape(value)}", styles["Normal"]))
+    for clause in payload["clausulas"]:
+        story.append(Spacer(1, 0.4 * cm))
+        if clause.get("titulo"):
+            story.append(Paragraph(escape(clause["titulo"]), styles["Heading3"]))
+        for paragraph in (clause.get("texto") or "").split("\n"):
+            if paragraph.strip():
+                story.append(Paragraph(escape(paragraph), styles["BodyText"]))
+    document.build(story)
+    return buffer.getvalue()
+
+def _render_docx(payload: dict) -> bytes:
+    from docx import Document
+
+    document = Document()
+    title = payload.get("titulo") or payload["id"]
+    document.core_properties.title = title
+    document.add_heading(title, level=0)
+    for label, value in _party_lines(payload):
+        paragraph = document.add_paragraph()
+        paragraph.add_run(f"{label}: ").bold = True
+        paragraph.add_run(value)
+    for clause in payload["clausulas"]:
+        if clause.get("titulo"):
+            document.add_heading(clause["titulo"], level=2)
+        for paragraph in (clause.get("texto") or "").split("\n"):
+            if paragraph.strip():
+                document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def render_to_file(payload: dict, formato: str, path: str) -> str:
+    """Process pool entry point: renders the document and moves it into place at `path`."""
+    data = _render_pdf(payload) if formato == "pdf" else _render_docx(payload)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write next to the target and rename, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
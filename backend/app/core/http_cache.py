@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response, status
+
+def make_etag(*parts) -> str:
+    """Strong validator from the response body (bytes) or from cheap version parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as required for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+def conditional_json(request: Request, body: bytes, etag: str) -> Response:
+    """Serves pre-serialized JSON, or 304 Not Modified when the client already has it."""
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    # no-cache: the browser may keep the body but must revalidate it on every use
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+def row_version(row) -> str:
+    """Cheap version of a row that carries fecha_actualizacion; plain dicts are versioned by value."""
+    if isinstance(row, dict):
+        return repr(row)
+    return f"{row.__tablename__}:{row.id}:{row.fecha_actualizacion}"
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes (stored in UTC); PostgreSQL uses the session time zone
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+class ConditionalGet:
+    """
+    Dependency for conditional GET on ORM-backed endpoints. The ETag is derived from the
+    (table, id, fecha_actualizacion) of every row the handler is about to return, so a
+    revalidation costs the query but skips serialization and the body transfer.
+    """
+    def __init__(self, request: Request, response: Response):
+        self.request = request
+        self.response = response
+
+    def check(self, *rows, last_modified: bool = False) -> Optional[Response]:
+        """
+        Returns a 304 response when the client copy is current, otherwise sets the validators
+        on the outgoing response and returns None. Last-Modified is only meaningful for single
+        resources: a list can lose rows without any remaining row getting newer.
+        """
+        rows = [row for row in rows if row is not None]
+        etag = make_etag(*(row_version(row) for row in rows))
+        modified = None
+        if last_modified:
+            stamps = [_as_utc(row.fecha_actualizacion) for row in rows if row.fecha_actualizacion]
+            modified = max(stamps).replace(microsecond=0) if stamps else None
+
+        if etag_matches(self.request, etag) or self._not_modified_since(modified):
+            return not_modified(etag)
+        self.response.headers["ETag"] = etag
+        self.response.headers["Cache-Control"] = "private, no-cache"
+        if modified:
+            self.response.headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+        return None
+
+    def _not_modified_since(self, modified: Optional[datetime]) -> bool:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110, 13.2.2)
+        header = self.request.headers.get("if-modified-since")
+        if not modified or not header or "if-none-match" in self.request.headers:
+            return False
+        try:
+            since = parsedate_to_datetime(header)
+        except (TypeError, ValueError):
+            return False
+        return modified <= _as_utc(since)
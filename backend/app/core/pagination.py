@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(key: Any) -> str:
+    """Encodes the sort key of the last row of a page into an opaque cursor."""
+    payload = json.dumps({"k": key}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str], key_type: type = int):
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        key = None
+    if not isinstance(key, key_type) or isinstance(key, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+    return key
+
+def set_next_cursor(response: Response, items: list, limit: int, key: str = "id"):
+    """
+    Publishes the cursor of the following page in the X-Next-Cursor header.
+    A short page means there is nothing left, so no header is sent.
+    """
+    if items and len(items) >= limit:
+        last = items[-1]
+        value = last[key] if isinstance(last, dict) else getattr(last, key)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(value)
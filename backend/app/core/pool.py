@@ -0,0 +1,79 @@
+"""
+Connection pool instrumentation. The pool classes time every checkout (which
+includes the wait for a free connection) and count the callers currently
+waiting; pool events keep the in-use gauge; overflow and configured size are
+read from each registered pool when /metrics is scraped.
+
+Pools are told apart by their logging name (create_engine(pool_logging_name=...)),
+which SQLAlchemy preserves when the pool is recreated on dispose().
+"""
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.metrics import registry
+
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "Time to obtain a connection from the pool, including waits", ("pool",), CHECKOUT_BUCKETS
+)
+checkout_timeouts = registry.counter("db_pool_checkout_timeouts_total", "Checkouts that gave up after pool_timeout", ("pool",))
+connections_opened = registry.counter("db_pool_connections_opened_total", "New DBAPI connections opened by the pool", ("pool",))
+waiting = registry.gauge("db_pool_waiting", "Callers currently waiting for a connection", ("pool",))
+in_use = registry.gauge("db_pool_checked_out", "Connections currently checked out", ("pool",))
+overflow = registry.gauge("db_pool_overflow", "Connections open beyond pool_size (negative while the pool is filling)", ("pool",))
+size = registry.gauge("db_pool_size", "Configured pool_size", ("pool",))
+
+class _InstrumentedPool:
+    @property
+    def metrics_name(self):
+        return self.logging_name or "default"
+
+    def _do_get(self):
+        name = self.metrics_name
+        waiting.inc(pool=name)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            checkout_timeouts.inc(pool=name)
+            raise
+        finally:
+            waiting.dec(pool=name)
+            checkout_seconds.observe(time.perf_counter() - start, pool=name)
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    pass
+
+_engines = []
+
+def instrument(engine):
+    """Hooks the engine's pool events into the metrics registry; returns the engine."""
+    name = engine.pool.logging_name or "default"
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        connections_opened.inc(pool=name)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc(pool=name)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        in_use.dec(pool=name)
+
+    _engines.append((name, engine))
+    return engine
+
+def _collect():
+    for name, engine in _engines:
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            overflow.set(pool.overflow(), pool=name)
+            size.set(pool.size(), pool=name)
+
+registry.add_collector(_collect)
@@ -0,0 +1,104 @@
+"""
+Authenticated principals: the few user columns every request needs (id, estado,
+role names), cached per process so resolving the caller of an authenticated
+request does not hit the database.
+
+Any flush that changes or deletes a Usuario (including its roles collection)
+records the ids on the session, and they are evicted when that transaction
+commits, so update_user, login lockouts and role changes take effect on the
+next request. A renamed or deleted Rol clears the whole cache. Other workers'
+writes are picked up when the TTL expires.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+from app.models.auth import Usuario, Rol
+
+_EVICT_KEY = "principals_to_evict"
+_ALL = object()
+
+# Id of the authenticated caller of the current request (set by get_current_user / get_current_user_async),
+# so commit hooks can attribute writes without threading the user through services
+current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    estado: str
+    roles: Tuple[str, ...]
+
+    def has_role(self, nombre: str) -> bool:
+        return nombre.lower() in (role.lower() for role in self.roles)
+
+    @property
+    def is_admin(self) -> bool:
+        return self.has_role("administrador")
+
+principal_cache = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
+def _principal_query(condition):
+    # One round trip: the user columns repeated once per role (or once with NULL)
+    return select(Usuario.id, Usuario.estado, Rol.nombre).outerjoin(Usuario.roles).where(condition).order_by(Rol.id)
+
+def _from_rows(rows) -> Optional[Principal]:
+    if not rows:
+        return None
+    return Principal(
+        id=rows[0].id,
+        estado=rows[0].estado,
+        roles=tuple(row.nombre for row in rows if row.nombre is not None),
+    )
+
+def get_principal(db: Session, user_id: int) -> Optional[Principal]:
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _from_rows(db.execute(_principal_query(Usuario.id == user_id)).all())
+        if principal is not None:
+            principal_cache.set(user_id, principal)
+    return principal
+
+def get_principal_by_email(db: Session, correo: str) -> Optional[Principal]:
+    """Uncached lookup for old tokens whose subject is still the email."""
+    return _from_rows(db.execute(_principal_query(Usuario.correo == correo)).all())
+
+async def get_principal_async(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _from_rows((await db.execute(_principal_query(Usuario.id == user_id))).all())
+        if principal is not None:
+            principal_cache.set(user_id, principal)
+    return principal
+
+async def get_principal_by_email_async(db: AsyncSession, correo: str) -> Optional[Principal]:
+    """Uncached lookup for old tokens whose subject is still the email."""
+    return _from_rows((await db.execute(_principal_query(Usuario.correo == correo))).all())
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    pending = session.info.setdefault(_EVICT_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Usuario) and obj.id is not None:
+            pending.add(obj.id)
+        # Assigning user.roles also touches Rol.usuarios; only a rename or delete matters
+        elif isinstance(obj, Rol) and (obj in session.deleted or session.is_modified(obj, include_collections=False)):
+            pending.add(_ALL)
+
+@event.listens_for(Session, "after_commit")
+def _evict_on_commit(session):
+    pending = session.info.pop(_EVICT_KEY, None)
+    if not pending:
+        return
+    if _ALL in pending:
+        principal_cache.clear()
+        return
+    for user_id in pending:
+        principal_cache.pop(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_EVICT_KEY, None)
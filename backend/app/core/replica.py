@@ -0,0 +1,105 @@
+"""
+Read routing between the primary and the optional read replica.
+
+Read-only routes take `get_read_db` / `get_async_read_db` instead of the primary
+dependencies. A request is served from the replica only when
+  - the last measured replica lag is within REPLICA_MAX_LAG_SECONDS (the lag is
+    measured by a periodic job; until the first measurement reads stay on the
+    primary), and
+  - the caller has not written in the last REPLICA_READ_YOUR_WRITES_SECONDS.
+
+Writes are attributed to the authenticated user through `current_user_id` when
+their transaction commits. That bookkeeping is per worker process: with several
+workers, a read that lands on another worker is only guaranteed to be as fresh
+as the lag tolerance.
+"""
+import logging
+from typing import Optional
+from fastapi import Depends
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import REPLICA_MAX_LAG_SECONDS, REPLICA_READ_YOUR_WRITES_SECONDS
+from app.core.database import (
+    REPLICA_ENABLED, replica_engine, SessionLocal, ReadSessionLocal, AsyncSessionLocal, AsyncReadSessionLocal,
+)
+from app.core.metrics import registry
+from app.core.principals import Principal, current_user_id
+from app.core.security import get_current_user, get_current_user_async
+
+logger = logging.getLogger(__name__)
+
+_WROTE_KEY = "replica_wrote"
+_recent_writers = TTLCache(maxsize=100_000, ttl_seconds=REPLICA_READ_YOUR_WRITES_SECONDS)
+_lag_seconds: Optional[float] = None
+
+replica_lag = registry.gauge("db_replica_lag_seconds", "Last measured replication lag of the read replica")
+read_routing = registry.counter("db_read_routing_total", "Read-only requests by the database that served them", ("target",))
+
+# 0 when the standby has replayed everything it received, otherwise the age of the
+# last replayed transaction (an idle primary would otherwise look infinitely behind)
+LAG_QUERY = text("""
+    SELECT COALESCE(
+        CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+             ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END,
+        0)
+""")
+
+def measure_replica_lag():
+    """Periodic job: refreshes the lag used for routing; a failed probe routes reads to the primary."""
+    global _lag_seconds
+    try:
+        with replica_engine.connect() as conn:
+            _lag_seconds = float(conn.execute(LAG_QUERY).scalar()) if replica_engine.dialect.name == "postgresql" else 0.0
+    except Exception:
+        _lag_seconds = None
+        logger.warning("Could not measure read replica lag; reads go to the primary", exc_info=True)
+    replica_lag.set(_lag_seconds if _lag_seconds is not None else -1)
+
+def use_replica(user_id: Optional[int]) -> bool:
+    if not REPLICA_ENABLED or _lag_seconds is None or _lag_seconds > REPLICA_MAX_LAG_SECONDS:
+        return False
+    return user_id is None or _recent_writers.get(user_id) is None
+
+def get_read_session_factory(current_user: Principal = Depends(get_current_user)):
+    """
+    Session factory for reads that outlive the request handler, such as streaming
+    responses: the dependency session would be closed before the body is sent.
+    """
+    replica = use_replica(current_user.id)
+    read_routing.inc(target="replica" if replica else "primary")
+    return ReadSessionLocal if replica else SessionLocal
+
+def get_read_db(current_user: Principal = Depends(get_current_user)):
+    replica = use_replica(current_user.id)
+    read_routing.inc(target="replica" if replica else "primary")
+    db = (ReadSessionLocal if replica else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(current_user: Principal = Depends(get_current_user_async)):
+    replica = use_replica(current_user.id)
+    read_routing.inc(target="replica" if replica else "primary")
+    async with (AsyncReadSessionLocal if replica else AsyncSessionLocal)() as db:
+        yield db
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _record_writer(session):
+    user_id = current_user_id.get()
+    if session.info.pop(_WROTE_KEY, False) and user_id is not None:
+        _recent_writers.set(user_id, True)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_WROTE_KEY, None)
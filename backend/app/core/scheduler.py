@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Callable, List
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+class PeriodicJob:
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], None]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.task = None
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                # Jobs are synchronous (they use the sync Session), keep them off the event loop
+                await run_in_threadpool(self.func)
+            except Exception:
+                logger.exception(f"Periodic job '{self.name}' failed")
+
+_jobs: List[PeriodicJob] = []
+
+def register_job(name: str, interval_seconds: float, func: Callable[[], None]):
+    """Registers a function to run every `interval_seconds` while the API is up."""
+    if interval_seconds > 0:
+        _jobs.append(PeriodicJob(name, interval_seconds, func))
+
+def start():
+    for job in _jobs:
+        if job.task is None:
+            job.task = asyncio.create_task(job._loop())
+            logger.info(f"Periodic job '{job.name}' scheduled every {job.interval_seconds}s")
+
+async def stop():
+    for job in _jobs:
+        if job.task is not None:
+            job.task.cancel()
+    await asyncio.gather(*(job.task for job in _jobs if job.task is not None), return_exceptions=True)
+    for job in _jobs:
+        job.task = None
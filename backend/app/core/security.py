@@ -1,22 +1,58 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.core.database import get_db
-from app.models.auth import Usuario
+from starlette.concurrency import run_in_threadpool
+from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT
+from app.core.database import get_async_db, get_db
+from app.core.principals import (
+    Principal, current_user_id, principal_cache, get_principal, get_principal_async, get_principal_by_email,
+    get_principal_by_email_async,
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# bcrypt releases the GIL while hashing, so a small dedicated thread pool gives real
+# CPU parallelism without blocking the event loop or starving the shared threadpool.
+# Requests beyond the queue limit are turned away with 503 instead of piling up.
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT)
+
+def _submit_hash_job(func, *args) -> Future:
+    if not _hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El servicio está ocupado, intente nuevamente en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _hash_executor.submit(func, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    """Blocking variant for sync code (already off the event loop)."""
+    return _submit_hash_job(pwd_context.verify, plain_password, hashed_password).result()
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return _submit_hash_job(pwd_context.hash, password).result()
+
+async def verify_password_async(plain_password, hashed_password):
+    return await asyncio.wrap_future(_submit_hash_job(pwd_context.verify, plain_password, hashed_password))
+
+async def get_password_hash_async(password):
+    return await asyncio.wrap_future(_submit_hash_job(pwd_context.hash, password))
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -24,33 +60,33 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+def _raise_credentials():
+    raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudo validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_subject(token: str):
+    """The user id in the token, or the email of old tokens."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            _raise_credentials()
     except JWTError:
-        raise credentials_exception
-    
+        _raise_credentials()
+
     # Try to parse ID as integer
     try:
-        user_id_int = int(user_id)
+        return int(user_id)
     except ValueError:
         # Fallback if the token still has an email (old tokens)
-        user = db.query(Usuario).filter(Usuario.correo == user_id).first()
-        if user:
-            return user
-        raise credentials_exception
+        return user_id
 
-    user = db.query(Usuario).filter(Usuario.id == user_id_int).first()
+def _check_principal(user: Optional[Principal]) -> Principal:
     if user is None:
-        raise credentials_exception
+        _raise_credentials()
 
     if user.estado == "Inactivo":
         raise HTTPException(
@@ -64,11 +100,29 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
             detail="Cuenta bloqueada temporalmente"
         )
 
+    current_user_id.set(user.id)
     return user
 
-def check_admin_role(current_user: Usuario = Depends(get_current_user)):
-    user_roles = [r.nombre.lower() for r in current_user.roles]
-    if "administrador" not in user_roles:
+async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Caller of a sync route. Async so that a principal-cache hit does no I/O and takes
+    no threadpool slot (and current_user_id is set in the request's context); a miss
+    is looked up on the route's own sync session, so the request uses a single pool.
+    """
+    subject = _token_subject(token)
+    if isinstance(subject, str):
+        return await run_in_threadpool(get_principal_by_email, db, subject) or _raise_credentials()
+    return _check_principal(principal_cache.get(subject) or await run_in_threadpool(get_principal, db, subject))
+
+async def get_current_user_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    """Caller of an async route, looked up on an AsyncSession on a principal-cache miss."""
+    subject = _token_subject(token)
+    if isinstance(subject, str):
+        return await get_principal_by_email_async(db, subject) or _raise_credentials()
+    return _check_principal(await get_principal_async(db, subject))
+
+async def check_admin_role(current_user: Principal = Depends(get_current_user)):
+    if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos suficientes para acceder a este recurso"
@@ -0,0 +1,36 @@
+"""
+Per-request unit of work for the sync Session.
+
+Repositories and services only flush (INSERT/UPDATE ... RETURNING brings back
+generated keys and server defaults), and the request's session is committed
+once, after the endpoint has built its response and before that response is
+sent. A request that raises is never committed; get_db's close rolls it back.
+
+Paths that must persist something on an error response (the failed-login
+counter) still commit explicitly before raising.
+"""
+from typing import Callable
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+_STATE_KEY = "unit_of_work_session"
+
+def track(request: Request, db: Session):
+    """Registers `db` as the session the request commits on success."""
+    setattr(request.state, _STATE_KEY, db)
+
+class UnitOfWorkRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def unit_of_work_handler(request: Request) -> Response:
+            response = await handler(request)
+            db = getattr(request.state, _STATE_KEY, None)
+            if db is not None and db.in_transaction() and response.status_code < 400:
+                # Commit before the response leaves: a failed commit must not look like success
+                await run_in_threadpool(db.commit)
+            return response
+
+        return unit_of_work_handler
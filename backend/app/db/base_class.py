@@ -1,3 +1,8 @@
+from datetime import datetime, timezone
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
+
+def utcnow():
+    """Python-side timestamp default: microsecond precision on every backend, known without a refresh."""
+    return datetime.now(timezone.utc)
@@ -1,8 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.db.base_class import Base # Keep for sync for now
-from app.core.database import engine
-from app.routes import auth, clients, contracts, users, stats, roles
+from app.core import scheduler
+from app.core.config import STATS_COUNTERS_ENABLED, STATS_RECONCILE_SECONDS, METRICS_ENABLED, REPLICA_LAG_CHECK_SECONDS, DOCUMENT_CACHE_PRUNE_SECONDS, OVERDUE_SWEEP_SECONDS
+from app.core.database import engine, REPLICA_ENABLED
+from app.core import replica
+from app.routes import auth, clients, contracts, payments, users, stats, roles, metrics
+from app.services import stats_service, contract_documents, overdue_service
 
 # Synchronize models (using core engine)
 print("Sincronizando modelos con la base de datos...")
@@ -10,7 +15,21 @@ print("Sincronizando modelos con la base de datos...")
 from app.models import auth as auth_models, client, contract, payment
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="LexContract API", version="1.0.0")
+if STATS_COUNTERS_ENABLED:
+    scheduler.register_job("stats-reconcile", STATS_RECONCILE_SECONDS, stats_service.reconcile_counters)
+if REPLICA_ENABLED:
+    scheduler.register_job("replica-lag", REPLICA_LAG_CHECK_SECONDS, replica.measure_replica_lag)
+scheduler.register_job("document-cache-prune", DOCUMENT_CACHE_PRUNE_SECONDS, contract_documents.prune_cache)
+scheduler.register_job("overdue-sweep", OVERDUE_SWEEP_SECONDS, overdue_service.run_overdue_sweep)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler.start()
+    yield
+    await scheduler.stop()
+    contract_documents.shutdown()
+
+app = FastAPI(title="LexContract API", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -39,8 +58,11 @@ app.include_router(auth.router, tags=["auth"])
 app.include_router(users.router, prefix="/users", tags=["users"])
 app.include_router(clients.router, prefix="/clients", tags=["clients"])
 app.include_router(contracts.router, prefix="/contracts", tags=["contracts"])
+app.include_router(payments.router, prefix="/payments", tags=["payments"])
 app.include_router(stats.router, prefix="/stats", tags=["stats"])
 app.include_router(roles.router, prefix="/roles", tags=["roles"])
+if METRICS_ENABLED:
+    app.include_router(metrics.router, tags=["metrics"])
 
 # For backward compatibility with root /token and /forgot-password
 # (Already handled by auth.router without prefix)
@@ -2,3 +2,5 @@ from .auth import Rol, Usuario, usuario_rol
 from .client import Cliente
 from .contract import Contrato, Plantilla
 from .payment import Pago
+from .sequence import Secuencia
+from .clause import ClausulaContenido
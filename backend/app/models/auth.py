@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.db.base_class import Base
+from app.db.base_class import Base, utcnow
 
 # Association Table for M:N relationship between Usuario and Rol
 usuario_rol = Table(
@@ -18,6 +18,8 @@ class Rol(Base):
 
 class Usuario(Base):
     __tablename__ = "usuario"
+    # fecha_creacion and func.now() assignments come back through RETURNING, no refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(100), nullable=False)
     apellido = Column(String(100), nullable=False)
@@ -30,6 +32,7 @@ class Usuario(Base):
     biografia = Column(Text)
     ultima_conexion = Column(DateTime(timezone=True))
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_actualizacion = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, server_default=func.now())
     
     roles = relationship("Rol", secondary=usuario_rol, back_populates="usuarios")
     contratos = relationship("Contrato", back_populates="abogado")
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, Text
+from app.db.base_class import Base
+
+class ClausulaContenido(Base):
+    """
+    Clause bodies stored once and shared by every contract and template that uses
+    them. The key is the SHA-256 of the text, so rows are immutable: an edited
+    clause is a new row, never an UPDATE.
+    """
+    __tablename__ = "clausula_contenido"
+    huella = Column(String(64), primary_key=True)
+    texto = Column(Text, nullable=False)
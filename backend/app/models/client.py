@@ -1,9 +1,35 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+import unicodedata
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, event, inspect, text
 from sqlalchemy.orm import relationship
-from app.db.base_class import Base
+from sqlalchemy.sql import func
+from app.db.base_class import Base, utcnow
+
+CLIENTES_ACTIVOS = text("is_deleted = false")
+
+def normalize_search_text(value: str) -> str:
+    """Lower case, accents stripped and whitespace collapsed: 'José  Peña' -> 'jose pena'."""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).lower().split())
+
+def _has_pg_trgm(ddl, target, bind, **kw):
+    # The migration installs pg_trgm; create_all on a bare server skips the trigram index
+    return bind.dialect.name == "postgresql" and bind.exec_driver_sql(
+        "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+    ).scalar() is not None
 
 class Cliente(Base):
     __tablename__ = "cliente"
+    __table_args__ = (
+        # Per-owner listing and counts over live clients: usuario_id = ? ORDER BY id
+        Index("ix_cliente_usuario_id", "usuario_id", "id",
+              postgresql_where=CLIENTES_ACTIVOS, sqlite_where=CLIENTES_ACTIVOS),
+        # Typeahead: usuario_id = ? AND cedula LIKE 'prefix%'
+        Index("ix_cliente_usuario_cedula", "usuario_id", "cedula", postgresql_ops={"cedula": "varchar_pattern_ops"},
+              postgresql_where=CLIENTES_ACTIVOS, sqlite_where=CLIENTES_ACTIVOS),
+        # Typeahead: nombre_busqueda LIKE '%word%' and similarity (nombre_busqueda % q)
+        Index("ix_cliente_nombre_trgm", "nombre_busqueda", postgresql_using="gin",
+              postgresql_ops={"nombre_busqueda": "gin_trgm_ops"}, postgresql_where=CLIENTES_ACTIVOS).ddl_if(callable_=_has_pg_trgm),
+    )
     id = Column(Integer, primary_key=True, index=True)
     cedula = Column(String(20), unique=True, nullable=False)
     nombre = Column(String(200), nullable=False)
@@ -15,4 +41,19 @@ class Cliente(Base):
     estado = Column(String(20), default="Activo")
     is_deleted = Column(Boolean, default=False)
     usuario_id = Column(Integer, ForeignKey("usuario.id"), nullable=True)
+    nombre_busqueda = Column(String(300)) # normalize_search_text(nombre + apellido), kept by the mapper events below
+    fecha_actualizacion = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, server_default=func.now())
     contratos = relationship("Contrato", back_populates="cliente")
+
+def _nombre_busqueda(cliente):
+    return normalize_search_text(f"{cliente.nombre or ''} {cliente.apellido or ''}")
+
+@event.listens_for(Cliente, "before_insert")
+def _set_nombre_busqueda(mapper, connection, target):
+    target.nombre_busqueda = _nombre_busqueda(target)
+
+@event.listens_for(Cliente, "before_update")
+def _update_nombre_busqueda(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if attrs.nombre.history.has_changes() or attrs.apellido.history.has_changes():
+        target.nombre_busqueda = _nombre_busqueda(target)
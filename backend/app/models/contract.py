@@ -1,11 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Numeric, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Numeric, Boolean, DateTime, Index, Text, DDL, event, literal_column, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
-from app.db.base_class import Base
+from app.db.base_class import Base, utcnow
 
 class Plantilla(Base):
     __tablename__ = "plantilla"
+    # Fetch server-generated values with RETURNING on INSERT and UPDATE instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(Integer, primary_key=True, index=True)
     nombre = Column(String(255), nullable=False)
     tipo = Column(String(50))
@@ -14,8 +16,32 @@ class Plantilla(Base):
     clause_ids = Column(JSONB)
     contratos = relationship("Contrato", back_populates="plantilla")
 
+# Predicates shared by every contract list/count; the partial indexes below only cover live rows
+CONTRATOS_ACTIVOS = text("es_biblioteca = false AND is_deleted = false")
+BIBLIOTECA_ACTIVA = text("es_biblioteca = true AND is_deleted = false")
+
+# Full-text document of a library item. Queries must use this exact expression
+# so PostgreSQL can answer them from ix_contrato_biblioteca_busqueda.
+DOCUMENTO_BUSQUEDA = literal_column(
+    "to_tsvector('spanish'::regconfig, coalesce(titulo, '') || ' ' || coalesce(texto_busqueda, ''))"
+)
+
 class Contrato(Base):
     __tablename__ = "contrato"
+    __table_args__ = (
+        # Admin listing: ORDER BY id DESC over live contracts
+        Index("ix_contrato_activos_id", "id", postgresql_where=CONTRATOS_ACTIVOS, sqlite_where=CONTRATOS_ACTIVOS),
+        # Lawyer listing: abogado_id = ? ORDER BY id DESC
+        Index("ix_contrato_abogado_id", "abogado_id", "id", postgresql_where=CONTRATOS_ACTIVOS, sqlite_where=CONTRATOS_ACTIVOS),
+        # Stats: counts per (abogado_id, estado)
+        Index("ix_contrato_abogado_estado", "abogado_id", "estado", postgresql_where=CONTRATOS_ACTIVOS, sqlite_where=CONTRATOS_ACTIVOS),
+        # Legal library: tipo = 'clausula' | 'plantilla' ORDER BY id DESC
+        Index("ix_contrato_biblioteca_tipo", "tipo", "id", postgresql_where=BIBLIOTECA_ACTIVA, sqlite_where=BIBLIOTECA_ACTIVA),
+        # Library search: DOCUMENTO_BUSQUEDA @@ query (SQLite uses the contrato_busqueda FTS5 table instead)
+        Index("ix_contrato_biblioteca_busqueda", DOCUMENTO_BUSQUEDA, postgresql_using="gin",
+              postgresql_where=BIBLIOTECA_ACTIVA).ddl_if(dialect="postgresql"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     id = Column(String(50), primary_key=True, index=True)
     titulo = Column(String(255))
     cliente_id = Column(Integer, ForeignKey("cliente.id"))
@@ -29,8 +55,29 @@ class Contrato(Base):
     clauses = Column(JSONB)
     variables_adicionales = Column(JSONB)
     is_deleted = Column(Boolean, default=False)
+    huella_pagos = Column(String(64)) # Fingerprint of the last synchronized payment schedule
+    texto_busqueda = Column(Text) # Library items only: clause titles and texts, for full-text search
+    fecha_actualizacion = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, server_default=func.now())
     
     cliente = relationship("Cliente", back_populates="contratos")
     abogado = relationship("Usuario", back_populates="contratos")
     plantilla = relationship("Plantilla", back_populates="contratos")
     pagos = relationship("Pago", back_populates="contrato")
+
+# SQLite stand-in for the GIN index: an FTS5 table kept in sync by triggers
+CONTRATO_BUSQUEDA_DDL = (
+    "CREATE VIRTUAL TABLE contrato_busqueda USING fts5("
+    "titulo, texto, contrato_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER contrato_busqueda_ai AFTER INSERT ON contrato "
+    "WHEN new.es_biblioteca AND NOT new.is_deleted BEGIN "
+    "INSERT INTO contrato_busqueda (contrato_id, titulo, texto) VALUES (new.id, new.titulo, new.texto_busqueda); END",
+    "CREATE TRIGGER contrato_busqueda_au AFTER UPDATE OF titulo, texto_busqueda, es_biblioteca, is_deleted ON contrato BEGIN "
+    "DELETE FROM contrato_busqueda WHERE contrato_id = old.id; "
+    "INSERT INTO contrato_busqueda (contrato_id, titulo, texto) "
+    "SELECT new.id, new.titulo, new.texto_busqueda WHERE new.es_biblioteca AND NOT new.is_deleted; END",
+    "CREATE TRIGGER contrato_busqueda_ad AFTER DELETE ON contrato BEGIN "
+    "DELETE FROM contrato_busqueda WHERE contrato_id = old.id; END",
+)
+for statement in CONTRATO_BUSQUEDA_DDL:
+    event.listen(Contrato.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(Contrato.__table__, "before_drop", DDL("DROP TABLE IF EXISTS contrato_busqueda").execute_if(dialect="sqlite"))
@@ -1,13 +1,25 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Numeric, Date, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
+PAGOS_PENDIENTES = text("estado = 'PENDIENTE'")
+PAGOS_VENCIDOS = text("estado = 'VENCIDO'")
+
 class Pago(Base):
     """
     Detailed Payment model to track contract installments or single payments.
     Includes context about the total process value and the payment type.
     """
     __tablename__ = "pago"
+    __table_args__ = (
+        # sync_payments reads a contract's installments in order
+        Index("ix_pago_contrato_id", "contrato_id", "id"),
+        # Overdue sweep: estado = 'PENDIENTE' AND fecha_vencimiento < today
+        Index("ix_pago_pendiente_vencimiento", "fecha_vencimiento",
+              postgresql_where=PAGOS_PENDIENTES, sqlite_where=PAGOS_PENDIENTES),
+        # Overdue sweep: contracts with at least one overdue installment
+        Index("ix_pago_vencido_contrato", "contrato_id", postgresql_where=PAGOS_VENCIDOS, sqlite_where=PAGOS_VENCIDOS),
+    )
     id = Column(Integer, primary_key=True, index=True)
     contrato_id = Column(String(50), ForeignKey("contrato.id"))
     tipo_pago = Column(String(20)) # UNICO, ABONO
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from app.db.base_class import Base
+
+class Secuencia(Base):
+    """
+    Per-prefix, per-year counter used to allocate human readable identifiers
+    (CNT-2026-001, PLT-2026-001, client ids...). `anio` is 0 for counters
+    that do not restart every year.
+    """
+    __tablename__ = "secuencia"
+    prefijo = Column(String(20), primary_key=True)
+    anio = Column(Integer, primary_key=True, default=0)
+    valor = Column(Integer, nullable=False, default=0)
@@ -1,9 +1,52 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.client import Cliente
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.client import Cliente, normalize_search_text
 
-def get_clients(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Cliente).filter(Cliente.usuario_id == user_id, Cliente.is_deleted == False).offset(skip).limit(limit).all()
+def _clients_query(user_id: int, skip: int, limit: int, after_id: int):
+    query = select(Cliente).where(Cliente.usuario_id == user_id, Cliente.is_deleted == False).order_by(Cliente.id)
+    # Keyset pagination: seek past the last id of the previous page instead of OFFSET
+    if after_id is not None:
+        return query.where(Cliente.id > after_id).limit(limit)
+    return query.offset(skip).limit(limit)
+
+def get_clients(db: Session, user_id: int, skip: int = 0, limit: int = 100, after_id: int = None):
+    return db.scalars(_clients_query(user_id, skip, limit, after_id)).all()
+
+async def get_clients_async(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100, after_id: int = None):
+    return (await db.scalars(_clients_query(user_id, skip, limit, after_id))).all()
+
+def _search_query(dialect: str, user_id: int, q: str, limit: int):
+    """
+    Typeahead over the owner's live clients. Digits are a cedula prefix; anything
+    else matches every word inside nombre_busqueda (accent and case insensitive),
+    plus trigram similarity on PostgreSQL so typos still find the client.
+    Returns None when there is nothing to search for.
+    """
+    query = select(Cliente).where(Cliente.usuario_id == user_id, Cliente.is_deleted == False)
+    compact = q.replace(".", "").replace(" ", "")
+    if compact.isdigit():
+        return query.where(Cliente.cedula.startswith(compact, autoescape=True)).order_by(Cliente.cedula).limit(limit)
+
+    normalized = normalize_search_text(q)
+    if not normalized:
+        return None
+    all_words = and_(*(Cliente.nombre_busqueda.contains(word, autoescape=True) for word in normalized.split()))
+    starts_first = Cliente.nombre_busqueda.startswith(normalized, autoescape=True).desc()
+    if dialect == "postgresql":
+        return (
+            query.where(or_(all_words, Cliente.nombre_busqueda.op("%")(normalized)))
+            .order_by(starts_first, func.similarity(Cliente.nombre_busqueda, normalized).desc(), Cliente.id)
+            .limit(limit)
+        )
+    return query.where(all_words).order_by(starts_first, Cliente.nombre_busqueda, Cliente.id).limit(limit)
+
+async def search_clients_async(db: AsyncSession, user_id: int, q: str, limit: int = 10):
+    query = _search_query(db.get_bind().dialect.name, user_id, q, limit)
+    if query is None:
+        return []
+    return (await db.scalars(query)).all()
 
 def get_client_by_cedula(db: Session, cedula: str):
     return db.query(Cliente).filter(Cliente.cedula == cedula, Cliente.is_deleted == False).first()
@@ -11,21 +54,71 @@ def get_client_by_cedula(db: Session, cedula: str):
 def get_client(db: Session, client_id: int, user_id: int):
     return db.query(Cliente).filter(Cliente.id == client_id, Cliente.usuario_id == user_id, Cliente.is_deleted == False).first()
 
+async def get_client_async(db: AsyncSession, client_id: int, user_id: int):
+    query = select(Cliente).where(Cliente.id == client_id, Cliente.usuario_id == user_id, Cliente.is_deleted == False)
+    return (await db.scalars(query.limit(1))).first()
+
+def get_active_client_ids(db: Session, client_ids):
+    """Subset of `client_ids` that exist and are not deleted, in one query."""
+    if not client_ids:
+        return set()
+    return set(db.scalars(select(Cliente.id).where(Cliente.id.in_(client_ids), Cliente.is_deleted == False)))
+
+def get_clients_by_cedulas(db: Session, cedulas):
+    """{cedula: (id, usuario_id, is_deleted)} for the given cedulas, deleted clients included, in one query."""
+    if not cedulas:
+        return {}
+    query = select(Cliente.cedula, Cliente.id, Cliente.usuario_id, Cliente.is_deleted).where(Cliente.cedula.in_(cedulas))
+    return {row.cedula: (row.id, row.usuario_id, row.is_deleted) for row in db.execute(query)}
+
+# Columns an import may update on a client the importer already owns
+IMPORT_UPDATABLE = ("nombre", "apellido", "celular", "correo", "direccion", "ciudad", "estado", "nombre_busqueda",
+                    "fecha_actualizacion")
+
+def upsert_clients(db: Session, rows: list, update_existing: bool = False):
+    """
+    INSERT ... ON CONFLICT (cedula) for `rows` (complete column dicts, nombre_busqueda
+    included: bulk inserts skip the mapper events). A conflicting cedula is skipped,
+    or with `update_existing` updated when it belongs to a live client of the same
+    owner; a NULL in an updatable column keeps the stored value. Returns the cedulas
+    actually written.
+    The rows go as executemany parameters: SQLAlchemy sends them as multi-row
+    VALUES batches ("insertmanyvalues") while the statement itself is compiled once
+    and cached, instead of compiling a new VALUES list for every call.
+    """
+    if not rows:
+        return set()
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        # No ON CONFLICT: callers have already filtered out known cedulas
+        db.execute(insert(Cliente), rows)
+        return {row["cedula"] for row in rows}
+
+    stmt = (postgresql.insert if dialect == "postgresql" else sqlite.insert)(Cliente)
+    if update_existing:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Cliente.cedula],
+            set_={column: func.coalesce(stmt.excluded[column], Cliente.__table__.c[column]) for column in IMPORT_UPDATABLE},
+            where=and_(Cliente.usuario_id == stmt.excluded.usuario_id, Cliente.is_deleted == False),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=[Cliente.cedula])
+    # render_nulls: the ORM bulk path would otherwise drop None values and apply column
+    # defaults (estado="Activo"), overwriting stored values the upload did not give
+    return set(db.scalars(stmt.returning(Cliente.cedula), rows, execution_options={"render_nulls": True}))
+
 def create_client(db: Session, db_client: Cliente):
     db.add(db_client)
-    db.commit()
-    db.refresh(db_client)
+    db.flush()
     return db_client
 
 def update_client(db: Session, db_client: Cliente):
     db.add(db_client)
-    db.commit()
-    db.refresh(db_client)
+    db.flush()
     return db_client
 
-def get_next_client_id(db: Session):
-    max_id = db.query(func.max(Cliente.id)).scalar()
-    return (max_id or 0) + 1
+def get_max_client_id(db: Session):
+    return db.query(func.max(Cliente.id)).scalar() or 0
 
 def count_clients(db: Session, user_id: int = None):
     query = db.query(Cliente).filter(Cliente.is_deleted == False)
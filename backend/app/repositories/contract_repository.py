@@ -1,33 +1,238 @@
-from sqlalchemy.orm import Session
-from app.models.contract import Contrato
+import re
+from sqlalchemy import column, func, literal_column, select, table, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.core import clause_store
+from app.models.auth import Usuario
+from app.models.client import Cliente
+from app.db.base_class import utcnow
+from app.models.contract import BIBLIOTECA_ACTIVA, DOCUMENTO_BUSQUEDA, Contrato
+from app.models.payment import Pago
 
-def get_contract_by_id(db: Session, contract_id: str):
-    return db.query(Contrato).filter(Contrato.id == contract_id).first()
+# Loader strategies for the relationships embedded in ContratoSchema (cliente, abogado and its roles).
+# Lists batch each relationship in one extra SELECT ... IN; single rows join them in the main query.
+LIST_LOAD_OPTIONS = (
+    selectinload(Contrato.cliente),
+    selectinload(Contrato.abogado).selectinload(Usuario.roles),
+)
+DETAIL_LOAD_OPTIONS = (
+    joinedload(Contrato.cliente),
+    joinedload(Contrato.abogado).selectinload(Usuario.roles),
+)
 
-def get_contracts(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, es_biblioteca: bool = False, tipo: str = None):
-    query = db.query(Contrato).filter(Contrato.es_biblioteca == es_biblioteca, Contrato.is_deleted == False)
+# Read queries are built once and executed by both the sync functions and their
+# *_async twins (AsyncSession, used by the async routes). Contracts are returned
+# with their clause references resolved (see app.core.clause_store).
+
+def _contract_by_id_query(contract_id: str, with_relations: bool):
+    query = select(Contrato).where(Contrato.id == contract_id)
+    if with_relations:
+        query = query.options(*DETAIL_LOAD_OPTIONS)
+    return query.limit(1)
+
+def get_contract_by_id(db: Session, contract_id: str, with_relations: bool = False):
+    contract = db.scalars(_contract_by_id_query(contract_id, with_relations)).first()
+    clause_store.resolve(db, [contract])
+    return contract
+
+async def get_contract_by_id_async(db: AsyncSession, contract_id: str, with_relations: bool = False):
+    contract = (await db.scalars(_contract_by_id_query(contract_id, with_relations))).first()
+    await clause_store.resolve_async(db, [contract])
+    return contract
+
+def _contracts_by_ids_query(contract_ids):
+    return select(Contrato).where(Contrato.id.in_(contract_ids), Contrato.is_deleted == False)
+
+async def get_contracts_by_ids_async(db: AsyncSession, contract_ids):
+    """Live contracts among `contract_ids`, in the order requested (unknown ids are skipped)."""
+    by_id = {contract.id: contract for contract in (await db.scalars(_contracts_by_ids_query(contract_ids))).all()}
+    contracts = [by_id[contract_id] for contract_id in dict.fromkeys(contract_ids) if contract_id in by_id]
+    return await clause_store.resolve_async(db, contracts)
+
+def _contracts_query(skip: int, limit: int, user_id: int, es_biblioteca: bool, tipo: str, before_id: str):
+    query = select(Contrato).where(Contrato.es_biblioteca == es_biblioteca, Contrato.is_deleted == False)
+    # Library items have no client or lawyer, so only real contracts need the eager loads
+    if not es_biblioteca:
+        query = query.options(*LIST_LOAD_OPTIONS)
     if user_id:
-        query = query.filter(Contrato.abogado_id == user_id)
+        query = query.where(Contrato.abogado_id == user_id)
     if tipo:
-        query = query.filter(Contrato.tipo == tipo)
-    return query.order_by(Contrato.id.desc()).offset(skip).limit(limit).all()
+        query = query.where(Contrato.tipo == tipo)
+    query = query.order_by(Contrato.id.desc())
+    # Keyset pagination: seek past the last id of the previous page instead of OFFSET
+    if before_id is not None:
+        return query.where(Contrato.id < before_id).limit(limit)
+    return query.offset(skip).limit(limit)
+
+def get_contracts(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, es_biblioteca: bool = False, tipo: str = None, before_id: str = None):
+    contracts = db.scalars(_contracts_query(skip, limit, user_id, es_biblioteca, tipo, before_id)).all()
+    return clause_store.resolve(db, contracts)
+
+async def get_contracts_async(db: AsyncSession, skip: int = 0, limit: int = 100, user_id: int = None, es_biblioteca: bool = False, tipo: str = None, before_id: str = None):
+    contracts = (await db.scalars(_contracts_query(skip, limit, user_id, es_biblioteca, tipo, before_id))).all()
+    return await clause_store.resolve_async(db, contracts)
+
+def _summaries_select(user_id: int):
+    """
+    Core projection of the columns the contracts table and dashboard display.
+    Never touches the clauses / variables_adicionales JSONB documents and builds
+    no ORM objects; client and lawyer names come from the same query.
+    """
+    query = (
+        select(
+            Contrato.id, Contrato.titulo, Contrato.tipo, Contrato.estado, Contrato.fecha, Contrato.total,
+            Contrato.cliente_id, Contrato.abogado_id,
+            Cliente.nombre.label("cliente_nombre"), Cliente.apellido.label("cliente_apellido"),
+            Cliente.cedula.label("cliente_cedula"),
+            Usuario.nombre.label("abogado_nombre"), Usuario.apellido.label("abogado_apellido"),
+        )
+        .outerjoin(Cliente, Contrato.cliente_id == Cliente.id)
+        .outerjoin(Usuario, Contrato.abogado_id == Usuario.id)
+        .where(Contrato.es_biblioteca == False, Contrato.is_deleted == False)
+        .order_by(Contrato.id.desc())
+    )
+    if user_id:
+        query = query.where(Contrato.abogado_id == user_id)
+    return query
+
+def _summaries_query(skip: int, limit: int, user_id: int, before_id: str):
+    query = _summaries_select(user_id)
+    if before_id is not None:
+        query = query.where(Contrato.id < before_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+def export_contracts_query(user_id: int = None):
+    """Every row of GET /contracts/resumen, unpaginated, for the streaming export."""
+    return _summaries_select(user_id)
+
+def get_contract_summaries(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, before_id: str = None):
+    rows = db.execute(_summaries_query(skip, limit, user_id, before_id)).mappings().all()
+    return [_summary_from_row(row) for row in rows]
+
+async def get_contract_summaries_async(db: AsyncSession, skip: int = 0, limit: int = 100, user_id: int = None, before_id: str = None):
+    rows = (await db.execute(_summaries_query(skip, limit, user_id, before_id))).mappings().all()
+    return [_summary_from_row(row) for row in rows]
+
+SPANISH = literal_column("'spanish'::regconfig")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=24, MinWords=8, FragmentDelimiter=\" … \""
+contrato_busqueda = table("contrato_busqueda", column("contrato_id"))
+
+def _fts5_match(q: str):
+    # Every word must appear (as a prefix, for search-as-you-type); quoting disables FTS5 operators
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+def _library_search_query(dialect: str, q: str, tipo: str, skip: int, limit: int):
+    """
+    Ranked library search over titles and clause texts, with highlighted fragments (<mark>).
+    PostgreSQL: Spanish tsvector + GIN index, ts_rank_cd, and ts_headline computed only
+    for the rows of the page. SQLite: the contrato_busqueda FTS5 table, bm25 and snippet.
+    """
+    if dialect == "postgresql":
+        tsquery = func.websearch_to_tsquery(SPANISH, q)
+        ranked = select(Contrato.id, func.ts_rank_cd(DOCUMENTO_BUSQUEDA, tsquery).label("rank")).where(
+            BIBLIOTECA_ACTIVA, DOCUMENTO_BUSQUEDA.op("@@")(tsquery)
+        )
+        if tipo:
+            ranked = ranked.where(Contrato.tipo == tipo)
+        ranked = ranked.order_by(literal_column("rank").desc(), Contrato.id).offset(skip).limit(limit).subquery()
+        fragment = func.ts_headline(SPANISH, func.coalesce(Contrato.texto_busqueda, ""), tsquery, HEADLINE_OPTIONS)
+        return (
+            select(Contrato.id, Contrato.titulo, Contrato.tipo, ranked.c.rank, fragment.label("fragmento"))
+            .join(ranked, ranked.c.id == Contrato.id)
+            .order_by(ranked.c.rank.desc(), Contrato.id)
+        )
+
+    # bm25 is lower-is-better; titles weigh more than clause text
+    bm25 = func.bm25(literal_column("contrato_busqueda"), 10.0, 1.0)
+    fragment = func.snippet(literal_column("contrato_busqueda"), 1, "<mark>", "</mark>", " … ", 24)
+    query = (
+        select(Contrato.id, Contrato.titulo, Contrato.tipo, (-bm25).label("rank"), fragment.label("fragmento"))
+        .select_from(contrato_busqueda)
+        .join(Contrato, Contrato.id == contrato_busqueda.c.contrato_id)
+        .where(text("contrato_busqueda MATCH :match").bindparams(match=_fts5_match(q)))
+    )
+    if tipo:
+        query = query.where(Contrato.tipo == tipo)
+    return query.order_by(bm25, Contrato.id).offset(skip).limit(limit)
+
+def _searchable(dialect: str, q: str):
+    return bool(q.strip()) if dialect == "postgresql" else _fts5_match(q) is not None
+
+def search_library(db: Session, q: str, tipo: str = None, skip: int = 0, limit: int = 20):
+    dialect = db.get_bind().dialect.name
+    if not _searchable(dialect, q):
+        return []
+    return db.execute(_library_search_query(dialect, q, tipo, skip, limit)).mappings().all()
+
+async def search_library_async(db: AsyncSession, q: str, tipo: str = None, skip: int = 0, limit: int = 20):
+    dialect = db.get_bind().dialect.name
+    if not _searchable(dialect, q):
+        return []
+    return (await db.execute(_library_search_query(dialect, q, tipo, skip, limit))).mappings().all()
+
+def _summary_from_row(row):
+    return {
+        "id": row["id"],
+        "titulo": row["titulo"],
+        "tipo": row["tipo"],
+        "estado": row["estado"],
+        "fecha": row["fecha"],
+        "total": row["total"],
+        "cliente_id": row["cliente_id"],
+        "abogado_id": row["abogado_id"],
+        "cliente": {
+            "id": row["cliente_id"],
+            "nombre": row["cliente_nombre"],
+            "apellido": row["cliente_apellido"],
+            "cedula": row["cliente_cedula"],
+        } if row["cliente_id"] is not None else None,
+        "abogado": {
+            "id": row["abogado_id"],
+            "nombre": row["abogado_nombre"],
+            "apellido": row["abogado_apellido"],
+        } if row["abogado_id"] is not None else None,
+    }
 
 def create_contract(db: Session, db_contract: Contrato):
     db.add(db_contract)
-    db.commit()
-    db.refresh(db_contract)
+    db.flush()
     return db_contract
 
+def create_contracts(db: Session, db_contracts: list):
+    # One flush: the unit of work batches the rows into a single multi-row INSERT
+    db.add_all(db_contracts)
+    db.flush()
+    return db_contracts
+
 def update_contract(db: Session, db_contract: Contrato):
     db.add(db_contract)
-    db.commit()
-    db.refresh(db_contract)
+    db.flush()
     return db_contract
 
 def delete_contract(db: Session, db_contract: Contrato):
     db_contract.is_deleted = True
     db.add(db_contract)
-    db.commit()
+    db.flush()
+
+def expire_contracts_with_overdue_payments(db: Session, excluded_states):
+    """
+    Live contracts with at least one VENCIDO installment become VENCIDO, in one UPDATE
+    driven by the overdue installments. Contracts in `excluded_states` keep their
+    state (upper case, compared case-insensitively). Returns the rows changed.
+    """
+    overdue = select(Pago.contrato_id).where(Pago.estado == "VENCIDO")
+    stmt = (
+        update(Contrato)
+        .where(
+            Contrato.es_biblioteca == False, Contrato.is_deleted == False,
+            func.upper(Contrato.estado).notin_(excluded_states), Contrato.id.in_(overdue),
+        )
+        .values(estado="VENCIDO", fecha_actualizacion=utcnow())
+    )
+    return db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
 
 def get_all_ids_by_prefix(db: Session, prefix: str):
     return db.query(Contrato.id).filter(Contrato.id.like(f"{prefix}%")).all()
@@ -0,0 +1,60 @@
+from sqlalchemy import insert, update, delete, func, select
+from sqlalchemy.orm import Session
+from app.models.contract import Contrato
+from app.models.payment import Pago
+
+def get_payments_by_contract(db: Session, contrato_id: str):
+    return db.query(Pago).filter(Pago.contrato_id == contrato_id).order_by(Pago.id).all()
+
+def bulk_insert_payments(db: Session, rows: list):
+    if rows:
+        db.execute(insert(Pago), rows)
+
+def bulk_update_payments(db: Session, rows: list):
+    # Each row must carry the primary key; SQLAlchemy groups them into one executemany UPDATE
+    if rows:
+        db.execute(update(Pago), rows)
+
+def delete_payments(db: Session, payment_ids: list):
+    if payment_ids:
+        db.execute(delete(Pago).where(Pago.id.in_(payment_ids)), execution_options={"synchronize_session": False})
+
+def export_payments_query(user_id: int = None, estado: str = None, contrato_id: str = None):
+    """
+    Installments of the contracts listed by GET /contracts/ (no library items, no
+    deleted contracts, only the lawyer's own unless admin), in id order.
+    """
+    query = (
+        select(
+            Pago.id, Pago.contrato_id, Contrato.titulo.label("contrato_titulo"), Contrato.cliente_id,
+            Contrato.abogado_id, Pago.tipo_pago, Pago.monto_total_contrato, Pago.monto_abono,
+            Pago.fecha_vencimiento, Pago.fecha_pago, Pago.estado,
+        )
+        .join(Contrato, Pago.contrato_id == Contrato.id)
+        .where(Contrato.es_biblioteca == False, Contrato.is_deleted == False)
+        .order_by(Pago.id)
+    )
+    if user_id:
+        query = query.where(Contrato.abogado_id == user_id)
+    if estado:
+        query = query.where(Pago.estado == estado)
+    if contrato_id:
+        query = query.where(Pago.contrato_id == contrato_id)
+    return query
+
+def mark_overdue(db: Session, today, excluded_contract_states=()):
+    """
+    PENDIENTE installments due before `today` become VENCIDO, in one UPDATE, unless
+    their contract is deleted, a library item, or in one of `excluded_contract_states`
+    (upper case, compared case-insensitively). Returns the rows changed.
+    """
+    live_contracts = select(Contrato.id).where(
+        Contrato.es_biblioteca == False, Contrato.is_deleted == False,
+        func.upper(Contrato.estado).notin_(excluded_contract_states),
+    )
+    stmt = (
+        update(Pago)
+        .where(Pago.estado == "PENDIENTE", Pago.fecha_vencimiento < today, Pago.contrato_id.in_(live_contracts))
+        .values(estado="VENCIDO")
+    )
+    return db.execute(stmt, execution_options={"synchronize_session": False}).rowcount
@@ -0,0 +1,42 @@
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.sequence import Secuencia
+
+def increment(db: Session, prefijo: str, anio: int, cantidad: int = 1):
+    """
+    Atomically advances the counter by `cantidad` and returns the new value,
+    or None when the counter row does not exist yet.
+    The UPDATE takes a row lock that is held until the caller commits, so
+    concurrent allocations on the same prefix are serialized by the database.
+    """
+    stmt = (
+        update(Secuencia)
+        .where(Secuencia.prefijo == prefijo, Secuencia.anio == anio)
+        .values(valor=Secuencia.valor + cantidad)
+    )
+    if db.get_bind().dialect.update_returning:
+        return db.execute(stmt.returning(Secuencia.valor)).scalar_one_or_none()
+
+    # Fallback for SQLite builds without RETURNING: the UPDATE already holds
+    # the database write lock, so reading the value back is still race free.
+    if db.execute(stmt).rowcount == 0:
+        return None
+    return get_value(db, prefijo, anio)
+
+def get_value(db: Session, prefijo: str, anio: int):
+    return db.query(Secuencia.valor).filter(Secuencia.prefijo == prefijo, Secuencia.anio == anio).scalar()
+
+def create_if_missing(db: Session, prefijo: str, anio: int, valor: int):
+    """Creates the counter row starting at `valor`; a no-op if another request created it first."""
+    values = {"prefijo": prefijo, "anio": anio, "valor": valor}
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(Secuencia).values(**values).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(Secuencia).values(**values).on_conflict_do_nothing()
+    else:
+        if get_value(db, prefijo, anio) is not None:
+            return
+        stmt = insert(Secuencia).values(**values)
+    db.execute(stmt)
@@ -0,0 +1,101 @@
+from sqlalchemy import Integer, cast, select, func, extract, true
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.client import Cliente
+from app.models.contract import Contrato
+
+def _active_contracts():
+    return (Contrato.es_biblioteca == False) & (Contrato.is_deleted == False)
+
+def dimension_column(dimension: str):
+    """SQL expression a contract breakdown can be grouped by."""
+    if dimension == "estado":
+        return Contrato.estado
+    if dimension == "area":
+        return Contrato.variables_adicionales["areaPractica"].as_string()
+    if dimension == "mes":
+        # YYYYMM as an integer works the same on PostgreSQL and SQLite
+        return cast(extract("year", Contrato.fecha) * 100 + extract("month", Contrato.fecha), Integer)
+    raise ValueError(f"Dimensión no soportada: {dimension}")
+
+def _counts_query(user_id: int, estados: dict):
+    """
+    Firm-wide and per-user counters in a single round trip: one conditional
+    aggregate (COUNT ... FILTER) per table, cross joined into one row.
+    `estados` maps each output key to the contract estado it counts.
+    """
+    mine = Contrato.abogado_id == user_id
+    contracts = (
+        select(
+            func.count().label("total_contracts"),
+            func.count().filter(mine).label("my_contracts"),
+            *[func.count().filter(mine & (Contrato.estado == estado)).label(key) for key, estado in estados.items()],
+        )
+        .where(_active_contracts())
+        .subquery()
+    )
+    clients = (
+        select(
+            func.count().label("total_clients"),
+            func.count().filter(Cliente.usuario_id == user_id).label("my_clients"),
+        )
+        .where(Cliente.is_deleted == False)
+        .subquery()
+    )
+    # ON TRUE: an explicit cross join of the two one-row aggregates (no cartesian product warning)
+    return select(contracts, clients).select_from(contracts.join(clients, true()))
+
+def get_counts(db: Session, user_id: int, estados: dict):
+    return db.execute(_counts_query(user_id, estados)).mappings().one()
+
+async def get_counts_async(db: AsyncSession, user_id: int, estados: dict):
+    return (await db.execute(_counts_query(user_id, estados))).mappings().one()
+
+def _breakdown_query(dimension: str, estados: dict, user_id: int):
+    """Contract counts grouped by `dimension`, with one FILTER column per estado, in one query."""
+    key = dimension_column(dimension).label("clave")
+    query = (
+        select(
+            key,
+            func.count().label("total"),
+            *[func.count().filter(Contrato.estado == estado).label(name) for name, estado in estados.items()],
+        )
+        .where(_active_contracts())
+        .group_by(key)
+        .order_by(key)
+    )
+    if user_id:
+        query = query.where(Contrato.abogado_id == user_id)
+    return query
+
+def get_breakdown(db: Session, dimension: str, estados: dict, user_id: int = None):
+    return db.execute(_breakdown_query(dimension, estados, user_id)).mappings().all()
+
+async def get_breakdown_async(db: AsyncSession, dimension: str, estados: dict, user_id: int = None):
+    return (await db.execute(_breakdown_query(dimension, estados, user_id))).mappings().all()
+
+# (abogado_id, estado, count) for every live contract group
+CONTRACT_COUNTS_BY_OWNER = (
+    select(Contrato.abogado_id, Contrato.estado, func.count())
+    .where(_active_contracts())
+    .group_by(Contrato.abogado_id, Contrato.estado)
+)
+
+# (usuario_id, count) for every owner with live clients
+CLIENT_COUNTS_BY_OWNER = (
+    select(Cliente.usuario_id, func.count())
+    .where(Cliente.is_deleted == False)
+    .group_by(Cliente.usuario_id)
+)
+
+def get_contract_counts_by_owner(db: Session):
+    return db.execute(CONTRACT_COUNTS_BY_OWNER).all()
+
+async def get_contract_counts_by_owner_async(db: AsyncSession):
+    return (await db.execute(CONTRACT_COUNTS_BY_OWNER)).all()
+
+def get_client_counts_by_owner(db: Session):
+    return db.execute(CLIENT_COUNTS_BY_OWNER).all()
+
+async def get_client_counts_by_owner_async(db: AsyncSession):
+    return (await db.execute(CLIENT_COUNTS_BY_OWNER)).all()
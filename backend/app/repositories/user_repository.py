@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.models.auth import Usuario, Rol
 
+def get_user_by_id(db: Session, user_id: int):
+    return db.query(Usuario).options(selectinload(Usuario.roles)).filter(Usuario.id == user_id).first()
+
 def get_user_by_email(db: Session, email: str):
     return db.query(Usuario).filter(Usuario.correo == email).first()
 
@@ -10,8 +13,18 @@ def get_user_by_cedula(db: Session, cedula: str):
 def get_user_by_celular(db: Session, celular: str):
     return db.query(Usuario).filter(Usuario.celular == celular).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Usuario).offset(skip).limit(limit).all()
+def get_users(db: Session, skip: int = 0, limit: int = 100, after_id: int = None):
+    # UsuarioSchema embeds roles; load them in one batch instead of once per user
+    query = db.query(Usuario).options(selectinload(Usuario.roles)).order_by(Usuario.id)
+    # Keyset pagination: seek past the last id of the previous page instead of OFFSET
+    if after_id is not None:
+        return query.filter(Usuario.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def get_existing_user_ids(db: Session, user_ids):
+    if not user_ids:
+        return set()
+    return {user_id for (user_id,) in db.query(Usuario.id).filter(Usuario.id.in_(user_ids))}
 
 def get_roles(db: Session):
     return db.query(Rol).all()
@@ -21,18 +34,15 @@ def get_role_by_id(db: Session, role_id: int):
 
 def create_user(db: Session, db_user: Usuario):
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 def update_user(db: Session, db_user: Usuario):
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     return db_user
 
 def create_role(db: Session, db_role: Rol):
     db.add(db_role)
-    db.commit()
-    db.refresh(db_role)
+    db.flush()
     return db_role
@@ -2,24 +2,26 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
 from jose import JWTError, jwt
 
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, get_password_hash, validate_password_strength
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.security import verify_password_async, create_access_token, validate_password_strength
 from app.core.config import SECRET_KEY, ALGORITHM
 from app.core.email import send_password_reset_email
 from app.schemas.auth import Token, ForgotPasswordRequest, ResetPasswordRequest
 from app.repositories import user_repository
 from app.services import auth_service
-from app.models.auth import Usuario
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = user_repository.get_user_by_email(db, email=form_data.username)
+    # Sync SQLAlchemy goes to the threadpool and bcrypt to its own bounded pool,
+    # so a login never blocks the event loop
+    user = await run_in_threadpool(user_repository.get_user_by_email, db, email=form_data.username)
     
     if not user:
         raise HTTPException(status_code=401, detail="Correo o contraseña incorrectos")
@@ -30,23 +32,12 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     if user.estado == "Inactivo":
         raise HTTPException(status_code=403, detail="Su cuenta ha sido desactivada. Contacte al administrador.")
 
-    if not verify_password(form_data.password, user.password):
-        user.intentos_fallidos += 1
-        if user.intentos_fallidos >= 3:
-            user.estado = "Bloqueado"
-            db.add(user)
-            db.commit()
+    if not await verify_password_async(form_data.password, user.password):
+        if await run_in_threadpool(auth_service.register_failed_login, db, user):
             raise HTTPException(status_code=403, detail="Cuenta bloqueada temporalmente")
-        
-        db.add(user)
-        db.commit()
         raise HTTPException(status_code=401, detail="Correo o contraseña incorrectos")
 
-    user.intentos_fallidos = 0
-    user.ultima_conexion = func.now()
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    user = await run_in_threadpool(auth_service.register_successful_login, db, user)
 
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
@@ -57,7 +48,7 @@ async def forgot_password(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    user = user_repository.get_user_by_email(db, email=request.correo)
+    user = await run_in_threadpool(user_repository.get_user_by_email, db, email=request.correo)
     if not user:
         return {"message": "Si el correo está registrado, recibirás instrucciones brevemente"}
     
@@ -85,12 +76,12 @@ async def reset_password(
             raise HTTPException(status_code=400, detail="Token inválido o expirado")
             
         validate_password_strength(request.new_password)
-        user = db.query(Usuario).filter(Usuario.id == int(user_id)).first()
+        user = await run_in_threadpool(user_repository.get_user_by_id, db, user_id=int(user_id))
         if not user:
             raise HTTPException(status_code=404, detail="Usuario no encontrado")
             
-        # Use service for updates
-        auth_service.update_user(db, db_user=user, user_update={
+        # Use service for updates (the new hash is computed on the bounded bcrypt pool)
+        await run_in_threadpool(auth_service.update_user, db, db_user=user, user_update={
             "password": request.new_password, 
             "estado": "Activo"
         })
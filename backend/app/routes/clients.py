@@ -1,13 +1,19 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.client import ClienteSchema, ClienteCreate, ClienteUpdate
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.replica import get_async_read_db
+from app.core.security import get_current_user, get_current_user_async
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.http_cache import ConditionalGet
+from app.schemas.client import ClienteSchema, ClienteCreate, ClienteUpdate, ClienteImportacionResultado
 from app.repositories import client_repository
+from app.services import sequence_service, client_import
 from app.models.client import Cliente
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.post("/", response_model=ClienteSchema)
 def create_client(
@@ -19,36 +25,73 @@ def create_client(
     existing = client_repository.get_client_by_cedula(db, cedula=client.cedula)
     if existing:
         raise HTTPException(status_code=400, detail="Ya existe un cliente con esta cédula")
-    db_client = Cliente(**client.model_dump(exclude={"usuario_id"}), usuario_id=current_user.id)
+    db_client = Cliente(
+        **client.model_dump(exclude={"usuario_id"}),
+        id=sequence_service.next_client_id(db),
+        usuario_id=current_user.id
+    )
     return client_repository.create_client(db=db, db_client=db_client)
 
+@router.post("/import", response_model=ClienteImportacionResultado)
+def import_clients(
+    archivo: UploadFile = File(...),
+    formato: str = "csv",
+    actualizar: bool = False,
+    db: Session = Depends(get_db),
+    current_user: Any = Depends(get_current_user)
+):
+    """Creates the uploaded clients in batches; rows that cannot be imported are reported, not fatal."""
+    if formato not in client_import.IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Formato de importación inválido")
+    try:
+        return client_import.import_upload(db, archivo.file, formato, current_user.id, actualizar=actualizar)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/next-id")
 def get_next_client_id(
     db: Session = Depends(get_db),
     current_user: Any = Depends(get_current_user)
 ):
-    next_id = client_repository.get_next_client_id(db)
+    next_id = sequence_service.peek_client_id(db)
     return {"next_id": next_id}
 
 @router.get("/", response_model=List[ClienteSchema])
-def read_clients(
+async def read_clients(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
-    current_user: Any = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    conditional: ConditionalGet = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
 ):
-    return client_repository.get_clients(db, user_id=current_user.id, skip=skip, limit=limit)
+    clients = await client_repository.get_clients_async(
+        db, user_id=current_user.id, skip=skip, limit=limit, after_id=decode_cursor(cursor)
+    )
+    set_next_cursor(response, clients, limit)
+    return conditional.check(*clients) or clients
+
+@router.get("/search", response_model=List[ClienteSchema])
+async def search_clients(
+    q: str,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    return await client_repository.search_clients_async(db, user_id=current_user.id, q=q, limit=min(limit, 50))
 
 @router.get("/{client_id}", response_model=ClienteSchema)
-def get_client(
+async def get_client(
     client_id: int,
-    db: Session = Depends(get_db),
-    current_user: Any = Depends(get_current_user)
+    conditional: ConditionalGet = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
 ):
-    db_client = client_repository.get_client(db, client_id=client_id, user_id=current_user.id)
+    db_client = await client_repository.get_client_async(db, client_id=client_id, user_id=current_user.id)
     if not db_client:
         raise HTTPException(status_code=404, detail="Cliente no encontrado")
-    return db_client
+    return conditional.check(db_client, last_modified=True) or db_client
 
 @router.put("/{client_id}", response_model=ClienteSchema)
 def update_client(
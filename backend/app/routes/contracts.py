@@ -1,28 +1,89 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core.config import BULK_GENERATE_MAX_ITEMS, RENDER_MAX_ITEMS
+from app.core.documents import DOCUMENT_FORMATS
 from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.contract import ContratoSchema, ContratoCreate, ContratoUpdate, ClausulaCreate, ClausulaUpdate, PlantillaCreate, PlantillaUpdate, ContratoFromPlantilla
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.replica import get_async_read_db, get_read_session_factory
+from app.core.security import get_current_user, get_current_user_async
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.http_cache import ConditionalGet, conditional_json
+from app.schemas.contract import ContratoSchema, ContratoResumenSchema, ContratoCreate, ContratoUpdate, ClausulaCreate, ClausulaUpdate, PlantillaCreate, PlantillaUpdate, ContratoFromPlantilla, ContratoLoteResultado, ContratoRenderizado, ContratosRenderizar, ResultadoBusquedaBiblioteca
 from app.repositories import contract_repository
-from app.services import contract_service
+from app.services import contract_service, contract_renderer, contract_documents, export_service
+from app.services.library_cache import library_cache
 from app.models.contract import Contrato
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/clausulas", response_model=List[ContratoSchema])
 def list_clausulas(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Any = Depends(get_current_user)
 ):
-    return contract_repository.get_contracts(db, es_biblioteca=True, tipo="clausula")
+    # Primary on purpose: the cache is refilled right after a library write bumps it,
+    # and a lagging replica would pin the old items for the whole TTL
+    body, etag = library_cache.get(db, "clausula")
+    return conditional_json(request, body, etag)
 
 @router.get("/plantillas", response_model=List[ContratoSchema])
 def list_plantillas(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: Any = Depends(get_current_user)
 ):
-    return contract_repository.get_contracts(db, es_biblioteca=True, tipo="plantilla")
+    body, etag = library_cache.get(db, "plantilla")
+    return conditional_json(request, body, etag)
+
+@router.get("/biblioteca/buscar", response_model=List[ResultadoBusquedaBiblioteca])
+async def search_library(
+    q: str,
+    tipo: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    if tipo not in (None, "clausula", "plantilla"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Tipo de búsqueda inválido")
+    return await contract_repository.search_library_async(db, q, tipo=tipo, skip=skip, limit=min(limit, 100))
+
+@router.get("/resumen", response_model=List[ContratoResumenSchema])
+async def list_contract_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    conditional: ConditionalGet = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    """Same rows and pagination as GET /contracts/, without the clause and variable documents."""
+    filter_user_id = None if current_user.is_admin else current_user.id
+    summaries = await contract_repository.get_contract_summaries_async(
+        db, skip=skip, limit=limit, user_id=filter_user_id, before_id=decode_cursor(cursor, str)
+    )
+    set_next_cursor(response, summaries, limit)
+    return conditional.check(*summaries) or summaries
+
+@router.get("/export")
+def export_contracts(
+    formato: str = "csv",
+    gzip: bool = False,
+    session_factory: Any = Depends(get_read_session_factory),
+    current_user: Any = Depends(get_current_user)
+):
+    """Streams every row of GET /contracts/resumen as CSV or NDJSON, optionally gzip-compressed."""
+    if formato not in export_service.EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Formato de exportación inválido")
+    filter_user_id = None if current_user.is_admin else current_user.id
+    query = contract_repository.export_contracts_query(user_id=filter_user_id)
+    return export_service.streaming_export(session_factory, query, "contratos", formato, comprimir=gzip)
 
 @router.post("/clausula", response_model=ContratoSchema)
 def create_clausula(
@@ -73,7 +134,7 @@ def delete_clausula(
     item = db.query(Contrato).filter(Contrato.id == id, Contrato.es_biblioteca == True).first()
     if not item:
         raise HTTPException(status_code=404, detail="Cláusula no encontrada")
-    contract_repository.delete_contract(db, item)
+    contract_service.delete_contract(db, item)
     return None
 
 @router.delete("/plantilla/{id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -85,7 +146,7 @@ def delete_plantilla(
     item = db.query(Contrato).filter(Contrato.id == id, Contrato.es_biblioteca == True).first()
     if not item:
         raise HTTPException(status_code=404, detail="Plantilla no encontrada")
-    contract_repository.delete_contract(db, item)
+    contract_service.delete_contract(db, item)
     return None
 
 @router.post("/generar-desde-plantilla/{id}", response_model=ContratoSchema)
@@ -100,16 +161,75 @@ def generate_contract(
         raise HTTPException(status_code=404, detail="Plantilla no encontrada")
     return contract
 
-@router.get("/{id}", response_model=ContratoSchema)
-def get_contract(
+@router.post("/generar-desde-plantilla/{id}/lote", response_model=ContratoLoteResultado)
+def generate_contracts(
     id: str,
+    items: List[ContratoFromPlantilla],
     db: Session = Depends(get_db),
     current_user: Any = Depends(get_current_user)
 ):
-    contract = contract_repository.get_contract_by_id(db, id)
+    if not items or len(items) > BULK_GENERATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El lote debe tener entre 1 y {BULK_GENERATE_MAX_ITEMS} contratos"
+        )
+    result = contract_service.generate_contracts_from_template(db, id, [item.model_dump() for item in items])
+    if result is None:
+        raise HTTPException(status_code=404, detail="Plantilla no encontrada")
+    return result
+
+@router.post("/renderizar", response_model=List[ContratoRenderizado])
+async def render_contracts(
+    body: ContratosRenderizar,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    if not body.ids or len(body.ids) > RENDER_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Debe indicar entre 1 y {RENDER_MAX_ITEMS} contratos"
+        )
+    contracts = await contract_repository.get_contracts_by_ids_async(db, body.ids)
+    # Rendering is CPU bound; keep it off the event loop
+    return await run_in_threadpool(contract_renderer.render_contracts, contracts)
+
+@router.get("/{id}/renderizar", response_model=ContratoRenderizado)
+async def render_contract(
+    id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    contract = await contract_repository.get_contract_by_id_async(db, id)
+    if not contract or contract.is_deleted:
+        raise HTTPException(status_code=404, detail="Contrato no encontrado")
+    return await run_in_threadpool(contract_renderer.render_contract, contract)
+
+@router.get("/{id}/document")
+async def download_contract_document(
+    id: str,
+    formato: str = Query("pdf", alias="format"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    if formato not in DOCUMENT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Formato de documento inválido")
+    contract = await contract_repository.get_contract_by_id_async(db, id, with_relations=True)
+    if not contract or contract.is_deleted:
+        raise HTTPException(status_code=404, detail="Contrato no encontrado")
+    path = await contract_documents.get_document(contract, formato)
+    return FileResponse(path, media_type=DOCUMENT_FORMATS[formato], filename=f"{contract.id}.{formato}")
+
+@router.get("/{id}", response_model=ContratoSchema)
+async def get_contract(
+    id: str,
+    conditional: ConditionalGet = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    contract = await contract_repository.get_contract_by_id_async(db, id, with_relations=True)
     if not contract:
         raise HTTPException(status_code=404, detail="Contrato no encontrado")
-    return contract
+    return conditional.check(contract, contract.cliente, contract.abogado, last_modified=True) or contract
 
 @router.put("/{id}", response_model=ContratoSchema)
 def update_contract(
@@ -132,15 +252,22 @@ def create_contract(
     return contract_service.create_contract(db=db, contract_data=contract.model_dump())
 
 @router.get("/", response_model=List[ContratoSchema])
-def read_contracts(
+async def read_contracts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: Any = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    conditional: ConditionalGet = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
 ):
-    is_admin = any(role.nombre.lower() == "administrador" for role in current_user.roles)
-    filter_user_id = None if is_admin else current_user.id
-    return contract_repository.get_contracts(db, skip=skip, limit=limit, user_id=filter_user_id)
+    filter_user_id = None if current_user.is_admin else current_user.id
+    contracts = await contract_repository.get_contracts_async(
+        db, skip=skip, limit=limit, user_id=filter_user_id, before_id=decode_cursor(cursor, str)
+    )
+    set_next_cursor(response, contracts, limit)
+    related = [row for contract in contracts for row in (contract.cliente, contract.abogado)]
+    return conditional.check(*contracts, *related) or contracts
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_contract(
@@ -151,5 +278,5 @@ def delete_contract(
     contract = contract_repository.get_contract_by_id(db, id)
     if not contract:
         raise HTTPException(status_code=404, detail="Registro no encontrado")
-    contract_repository.delete_contract(db, contract)
+    contract_service.delete_contract(db, contract)
     return None
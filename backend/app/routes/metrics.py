@@ -0,0 +1,26 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from app.core.config import METRICS_TOKEN
+from app.core.metrics import registry
+
+router = APIRouter()
+bearer_scheme = HTTPBearer(auto_error=False)
+
+def check_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)):
+    if METRICS_TOKEN is None:
+        return
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudo validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False,
+            dependencies=[Depends(check_metrics_token)])
+async def read_metrics():
+    """Prometheus text exposition of this worker's metrics."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
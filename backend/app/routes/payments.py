@@ -0,0 +1,24 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.replica import get_read_session_factory
+from app.core.security import get_current_user
+from app.repositories import payment_repository
+from app.services import export_service
+
+router = APIRouter()
+
+@router.get("/export")
+def export_payments(
+    formato: str = "csv",
+    gzip: bool = False,
+    estado: Optional[str] = None,
+    contrato_id: Optional[str] = None,
+    session_factory: Any = Depends(get_read_session_factory),
+    current_user: Any = Depends(get_current_user)
+):
+    """Streams the installments of the caller's contracts (every contract for admins)."""
+    if formato not in export_service.EXPORT_FORMATS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Formato de exportación inválido")
+    filter_user_id = None if current_user.is_admin else current_user.id
+    query = payment_repository.export_payments_query(user_id=filter_user_id, estado=estado, contrato_id=contrato_id)
+    return export_service.streaming_export(session_factory, query, "pagos", formato, comprimir=gzip)
@@ -2,11 +2,12 @@ from typing import List, Any
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
 from app.core.security import check_admin_role
 from app.schemas.auth import RolSchema
 from app.repositories import user_repository
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/", response_model=List[RolSchema])
 def read_roles(
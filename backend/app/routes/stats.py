@@ -1,18 +1,30 @@
-from typing import Any
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import get_current_user
-from app.schemas.stats import StatsSchema
+from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.replica import get_async_read_db
+from app.core.security import get_current_user_async
+from app.schemas.stats import StatsSchema, BreakdownSchema
 from app.services import stats_service
 
 router = APIRouter()
 
 @router.get("/", response_model=StatsSchema)
-def get_stats(
-    db: Session = Depends(get_db),
-    current_user: Any = Depends(get_current_user)
+async def get_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Any = Depends(get_current_user_async)
 ):
-    firm_stats = stats_service.get_firm_stats(db)
-    user_stats = stats_service.get_user_stats(db, user_id=current_user.id)
-    return {"firmStats": firm_stats, "userStats": user_stats}
+    # Primary: the session is only used to (re)load the counters, which must start exact
+    return await stats_service.get_stats_async(db, user_id=current_user.id)
+
+@router.get("/desglose", response_model=List[BreakdownSchema])
+async def get_breakdown(
+    por: str = Query("estado", description="estado | area | mes"),
+    solo_mios: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: Any = Depends(get_current_user_async)
+):
+    try:
+        return await stats_service.get_breakdown_async(db, por, user_id=current_user.id if solo_mios else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
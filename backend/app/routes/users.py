@@ -1,19 +1,31 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.unit_of_work import UnitOfWorkRoute
+from app.core.replica import get_read_db
 from app.core.security import get_current_user, check_admin_role, verify_password, validate_password_strength
 from app.core.email import send_welcome_email
+from app.core.pagination import decode_cursor, set_next_cursor
+from app.core.http_cache import ConditionalGet
 from app.schemas.auth import UsuarioSchema, UsuarioCreate, UsuarioUpdate, ChangePasswordRequest, RolSchema, RolCreate
 from app.repositories import user_repository
 from app.services import auth_service
 from app.models.auth import Usuario
 
-router = APIRouter()
+router = APIRouter(route_class=UnitOfWorkRoute)
 
 @router.get("/me", response_model=UsuarioSchema)
-def read_user_me(current_user: Any = Depends(get_current_user)):
-    return current_user
+def read_user_me(
+    conditional: ConditionalGet = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: Any = Depends(get_current_user)
+):
+    # The principal only carries identity; the profile itself comes from the row
+    db_user = user_repository.get_user_by_id(db, user_id=current_user.id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="Usuario no encontrado")
+    return conditional.check(db_user, last_modified=True) or db_user
 
 @router.put("/me", response_model=UsuarioSchema)
 def update_user_me(
@@ -62,12 +74,13 @@ def change_password(
 
 @router.get("/abogados", response_model=List[UsuarioSchema])
 def get_abogados(
-    db: Session = Depends(get_db),
+    conditional: ConditionalGet = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: Any = Depends(get_current_user)
 ):
     users = user_repository.get_users(db, limit=1000)
     abogados = [u for u in users if any(r.nombre.lower() == "abogado" for r in u.roles)]
-    return abogados
+    return conditional.check(*abogados) or abogados
 
 @router.post("/", response_model=UsuarioSchema, status_code=201)
 def create_user(
@@ -92,12 +105,17 @@ def create_user(
 
 @router.get("/", response_model=List[UsuarioSchema])
 def read_users(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    conditional: ConditionalGet = Depends(),
+    db: Session = Depends(get_read_db),
     current_user: Any = Depends(check_admin_role)
 ):
-    return user_repository.get_users(db, skip=skip, limit=limit)
+    users = user_repository.get_users(db, skip=skip, limit=limit, after_id=decode_cursor(cursor))
+    set_next_cursor(response, users, limit)
+    return conditional.check(*users) or users
 
 @router.put("/{user_id}", response_model=UsuarioSchema)
 def update_user(
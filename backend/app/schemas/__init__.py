@@ -1,5 +1,5 @@
 from .auth import Token, RolSchema, UsuarioSchema, UsuarioCreate, UsuarioUpdate, ChangePasswordRequest, ForgotPasswordRequest, ResetPasswordRequest
 from .client import ClienteSchema, ClienteCreate, ClienteUpdate
-from .contract import ContratoSchema, ContratoCreate, ContratoUpdate, ClausulaCreate, PlantillaCreate, ContratoFromPlantilla
+from .contract import ContratoSchema, ContratoResumenSchema, ContratoCreate, ContratoUpdate, ClausulaCreate, PlantillaCreate, ContratoFromPlantilla
 from .payment import PagoSchema, AbonoSchema
-from .stats import StatsSchema
+from .stats import StatsSchema, BreakdownSchema
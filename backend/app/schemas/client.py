@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, field_validator
 import re
 
@@ -45,6 +45,17 @@ class ClienteSchema(ClienteBase):
     class Config:
         from_attributes = True
 
+class ClienteImportacionError(BaseModel):
+    fila: int
+    cedula: Optional[str] = None
+    detalle: str
+
+class ClienteImportacionResultado(BaseModel):
+    """Outcome of a bulk import; `fila` is the line of the row in the uploaded file."""
+    creados: int
+    actualizados: int
+    errores: List[ClienteImportacionError]
+
 class ClienteUpdate(BaseModel):
     nombre: Optional[str] = None
     apellido: Optional[str] = None
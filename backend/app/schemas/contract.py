@@ -42,6 +42,30 @@ class ContratoSchema(ContratoBase):
     class Config:
         from_attributes = True
 
+class ClienteResumenSchema(BaseModel):
+    id: int
+    nombre: Optional[str] = None
+    apellido: Optional[str] = None
+    cedula: Optional[str] = None
+
+class AbogadoResumenSchema(BaseModel):
+    id: int
+    nombre: Optional[str] = None
+    apellido: Optional[str] = None
+
+class ContratoResumenSchema(BaseModel):
+    """Slim row for the contracts table and dashboard (no clauses or variables)."""
+    id: str
+    titulo: Optional[str] = None
+    tipo: Optional[str] = None
+    estado: Optional[str] = None
+    fecha: Optional[date] = None
+    total: Optional[Decimal] = None
+    cliente_id: Optional[int] = None
+    abogado_id: Optional[int] = None
+    cliente: Optional[ClienteResumenSchema] = None
+    abogado: Optional[AbogadoResumenSchema] = None
+
 class ClausulaCreate(BaseModel):
     titulo: str
     texto: str
@@ -67,3 +91,38 @@ class ContratoFromPlantilla(BaseModel):
     abogado_id: int
     total: Optional[Decimal] = None
     variables_adicionales: Optional[Dict[str, Any]] = None
+
+class ResultadoBusquedaBiblioteca(BaseModel):
+    """A library search hit; `fragmento` marks the matched words with <mark></mark>."""
+    id: str
+    titulo: Optional[str] = None
+    tipo: Optional[str] = None
+    rank: float
+    fragmento: Optional[str] = None
+
+class ClausulaRenderizada(BaseModel):
+    titulo: Optional[str] = None
+    texto: str
+
+class ContratoRenderizado(BaseModel):
+    """Clauses with their [Variable] placeholders filled from variables_adicionales."""
+    id: str
+    titulo: Optional[str] = None
+    clausulas: List[ClausulaRenderizada]
+    variables_faltantes: List[str]
+
+class ContratosRenderizar(BaseModel):
+    ids: List[str]
+
+class ContratoLoteCreado(BaseModel):
+    indice: int
+    id: str
+
+class ContratoLoteError(BaseModel):
+    indice: int
+    detalle: str
+
+class ContratoLoteResultado(BaseModel):
+    """Outcome of a batch generation; `indice` is the position of the item in the request."""
+    creados: List[ContratoLoteCreado]
+    errores: List[ContratoLoteError]
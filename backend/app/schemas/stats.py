@@ -1,5 +1,11 @@
+from typing import Optional, Union
 from pydantic import BaseModel
 
 class StatsSchema(BaseModel):
     firmStats: dict
     userStats: dict
+
+class BreakdownSchema(BaseModel):
+    clave: Optional[Union[int, str]] = None
+    total: int
+    contractStatus: dict
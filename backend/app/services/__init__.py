@@ -1,3 +1,3 @@
 from .auth_service import create_user, update_user
-from .contract_service import create_contract, update_contract, create_library_item, generate_contract_from_template
-from .stats_service import get_firm_stats, get_user_stats
+from .contract_service import create_contract, update_contract, delete_contract, create_library_item, generate_contract_from_template
+from .stats_service import get_stats, get_firm_stats, get_user_stats
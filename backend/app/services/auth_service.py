@@ -1,6 +1,8 @@
 from datetime import date
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from app.models.auth import Usuario, Rol
+from app.db.base_class import utcnow
 from app.repositories import user_repository
 from app.core.security import get_password_hash
 
@@ -17,6 +19,21 @@ def create_user(db: Session, user_data: dict, roles_ids: list):
     db_user.roles = roles
     return user_repository.create_user(db, db_user)
 
+def register_failed_login(db: Session, db_user: Usuario) -> bool:
+    """Counts a wrong password; returns True when the account got locked."""
+    db_user.intentos_fallidos += 1
+    locked = db_user.intentos_fallidos >= 3
+    if locked:
+        db_user.estado = "Bloqueado"
+    db.add(db_user)
+    db.commit()
+    return locked
+
+def register_successful_login(db: Session, db_user: Usuario):
+    db_user.intentos_fallidos = 0
+    db_user.ultima_conexion = func.now()
+    return user_repository.update_user(db, db_user)
+
 def update_user(db: Session, db_user: Usuario, user_update: dict):
     for key, value in user_update.items():
         if key == "cedula": continue
@@ -30,6 +47,8 @@ def update_user(db: Session, db_user: Usuario, user_update: dict):
             if len(roles) != len(value):
                 raise ValueError("Uno o más roles no existen")
             db_user.roles = roles
+            # Role membership lives in usuario_rol; bump the row so cached copies revalidate
+            db_user.fecha_actualizacion = utcnow()
         elif value is not None:
             setattr(db_user, key, value)
     return user_repository.update_user(db, db_user)
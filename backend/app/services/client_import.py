@@ -0,0 +1,147 @@
+"""
+Bulk client import (POST /clients/import) from a CSV or NDJSON upload.
+
+The upload is parsed as a stream and handled IMPORT_BATCH_SIZE rows at a time:
+every row goes through the ClienteCreate validators, the batch's cedulas are
+checked against the database with one query, ids for the new clients are
+reserved as one block, and the batch is written with a single multi-row
+INSERT ... ON CONFLICT. Rows that cannot be imported are reported with their
+line number instead of failing the upload; the whole import is one transaction,
+and an upload over IMPORT_MAX_ROWS is rejected before any row is processed.
+"""
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.core.config import IMPORT_BATCH_SIZE, IMPORT_MAX_ROWS
+from app.db.base_class import utcnow
+from app.models.client import normalize_search_text
+from app.repositories import client_repository
+from app.schemas.client import ClienteCreate
+from app.services import sequence_service
+from app.services.stats_counters import invalidate_on_commit
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+Row = Tuple[int, Optional[dict], Optional[str]]  # (line, data, parse error)
+
+def read_rows(upload: BinaryIO, formato: str) -> Iterator[Row]:
+    """Yields the upload's rows one at a time; CSV needs a header with the ClienteCreate field names."""
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    try:
+        if formato == "csv":
+            reader = csv.DictReader(text)
+            for data in reader:
+                yield reader.line_num, data, None
+            return
+        for line_num, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_num, None, "JSON inválido"
+                continue
+            yield (line_num, data, None) if isinstance(data, dict) else (line_num, None, "Se esperaba un objeto JSON")
+    except UnicodeDecodeError:
+        raise ValueError("El archivo debe estar codificado en UTF-8")
+    finally:
+        text.detach()
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg'].removeprefix('Value error, ')}" for e in error.errors()
+    )
+
+def _clean(data: dict) -> dict:
+    # Empty cells mean "not given", so the schema defaults apply
+    return {key: value for key, value in data.items() if key is not None and value not in ("", None)}
+
+def _column_values(client: ClienteCreate, update: bool) -> dict:
+    values = client.model_dump(exclude={"usuario_id", "is_deleted"})
+    if update:
+        # NULL keeps the stored value (upsert_clients coalesces): only the fields the row gives are overwritten
+        values = {key: value if key in client.model_fields_set else None for key, value in values.items()}
+    return values
+
+def _import_batch(db: Session, batch: list, usuario_id: int, actualizar: bool, seen: set, result: dict):
+    errores = result["errores"]
+    valid = []
+    for fila, data, error in batch:
+        if error:
+            errores.append({"fila": fila, "cedula": None, "detalle": error})
+            continue
+        try:
+            client = ClienteCreate.model_validate(_clean(data))
+        except ValidationError as e:
+            errores.append({"fila": fila, "cedula": data.get("cedula") or None, "detalle": _validation_detail(e)})
+            continue
+        if client.cedula in seen:
+            errores.append({"fila": fila, "cedula": client.cedula, "detalle": "Cédula repetida en el archivo"})
+            continue
+        seen.add(client.cedula)
+        valid.append((fila, client))
+
+    existing = client_repository.get_clients_by_cedulas(db, [client.cedula for _, client in valid])
+    pending = []
+    for fila, client in valid:
+        found = existing.get(client.cedula)
+        if found and not (actualizar and found[1] == usuario_id and not found[2]):
+            errores.append({"fila": fila, "cedula": client.cedula, "detalle": "Ya existe un cliente con esta cédula"})
+            continue
+        pending.append((fila, client, found[0] if found else None))
+
+    new_count = sum(1 for _, _, client_id in pending if client_id is None)
+    new_ids = iter(sequence_service.reserve_client_ids(db, new_count) if new_count else ())
+    now = utcnow()
+    rows = [
+        {
+            **_column_values(client, update=client_id is not None),
+            "id": client_id if client_id is not None else next(new_ids),
+            "usuario_id": usuario_id,
+            "is_deleted": False,
+            "nombre_busqueda": normalize_search_text(f"{client.nombre} {client.apellido}"),
+            "fecha_actualizacion": now,
+        }
+        for _, client, client_id in pending
+    ]
+    written = client_repository.upsert_clients(db, rows, update_existing=actualizar)
+    for fila, client, client_id in pending:
+        if client.cedula not in written:
+            # Created or taken over by a concurrent request since the lookup above
+            errores.append({"fila": fila, "cedula": client.cedula, "detalle": "Ya existe un cliente con esta cédula"})
+        elif client_id is None:
+            result["creados"] += 1
+        else:
+            result["actualizados"] += 1
+
+def import_clients(db: Session, rows: Iterable[Row], usuario_id: int, actualizar: bool = False,
+                   batch_size: int = IMPORT_BATCH_SIZE):
+    """
+    Imports the rows as clients of `usuario_id`. With `actualizar`, a cedula that
+    already belongs to one of the user's live clients updates that client instead
+    of being reported.
+    """
+    result = {"creados": 0, "actualizados": 0, "errores": []}
+    seen = set()
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        _import_batch(db, batch, usuario_id, actualizar, seen, result)
+    if result["creados"] or result["actualizados"]:
+        invalidate_on_commit(db)
+    result["errores"].sort(key=lambda error: error["fila"])
+    return result
+
+def import_upload(db: Session, upload: BinaryIO, formato: str, usuario_id: int, actualizar: bool = False):
+    """
+    Imports a seekable upload. A first parse-only pass counts the rows (and finds
+    encoding errors), so an upload over IMPORT_MAX_ROWS is rejected with ValueError
+    before anything is validated or written.
+    """
+    if sum(1 for _ in read_rows(upload, formato)) > IMPORT_MAX_ROWS:
+        raise ValueError(f"El archivo supera el máximo de {IMPORT_MAX_ROWS} filas")
+    upload.seek(0)
+    return import_clients(db, read_rows(upload, formato), usuario_id, actualizar=actualizar)
@@ -0,0 +1,131 @@
+"""
+Contract documents (GET /contracts/{id}/document): PDF or DOCX built from the
+rendered clauses (contract_renderer) and the client and lawyer data.
+
+Layout runs in a bounded process pool (app.core.documents), so building a long
+document neither blocks the event loop nor competes for the GIL with the API
+threads; beyond workers + queue limit requests are turned away with 503.
+
+Output is cached on local disk under the SHA-256 of everything that goes into it
+(payload, format and layout version): a repeat download is served straight from
+the file, and an edit changes the key instead of needing an invalidation. Files
+not downloaded for DOCUMENT_CACHE_MAX_AGE_DAYS are removed by `prune_cache`.
+"""
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.core import documents
+from app.core.config import (
+    DOCUMENT_CACHE_DIR, DOCUMENT_CACHE_MAX_AGE_DAYS, DOCUMENT_RENDER_WORKERS, DOCUMENT_RENDER_QUEUE_LIMIT,
+)
+from app.models.contract import Contrato
+from app.services import contract_renderer
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(DOCUMENT_RENDER_WORKERS + DOCUMENT_RENDER_QUEUE_LIMIT)
+_in_flight = {}  # cache path -> future of the render producing it, shared by concurrent downloads
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn, not fork: the API process runs an event loop and pool threads
+            _executor = ProcessPoolExecutor(DOCUMENT_RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def _submit(payload: dict, formato: str, path: str) -> Future:
+    if not _slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="El servicio está ocupado, intente nuevamente en unos segundos",
+            headers={"Retry-After": "2"},
+        )
+    try:
+        future = _get_executor().submit(documents.render_to_file, payload, formato, path)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+def _person(person, *fields):
+    return {field: getattr(person, field) for field in fields} if person is not None else None
+
+def document_payload(contract: Contrato) -> dict:
+    """Everything the layout needs, as plain data that can be pickled to a worker and hashed."""
+    rendered = contract_renderer.render_contract(contract)
+    return {
+        "id": contract.id,
+        "titulo": contract.titulo,
+        "fecha": contract.fecha.isoformat() if contract.fecha else None,
+        "total": str(contract.total) if contract.total is not None else None,
+        "estado": contract.estado,
+        "cliente": _person(contract.cliente, "nombre", "apellido", "cedula", "celular", "correo", "direccion", "ciudad"),
+        "abogado": _person(contract.abogado, "nombre", "apellido", "cedula", "correo"),
+        "clausulas": rendered["clausulas"],
+    }
+
+def cache_path(payload: dict, formato: str) -> str:
+    key_source = json.dumps([documents.LAYOUT_VERSION, formato, payload], sort_keys=True, ensure_ascii=False)
+    key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    return os.path.join(DOCUMENT_CACHE_DIR, key[:2], f"{key}.{formato}")
+
+def _cached(path: str) -> bool:
+    try:
+        # Touched on every hit: prune_cache removes the files nobody downloads
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+def _prepare(contract: Contrato, formato: str):
+    payload = document_payload(contract)
+    path = cache_path(payload, formato)
+    return payload, path, _cached(path)
+
+async def get_document(contract: Contrato, formato: str) -> str:
+    """Path of the contract's document, rendering it in the process pool on a cache miss."""
+    payload, path, cached = await run_in_threadpool(_prepare, contract, formato)
+    if cached:
+        return path
+    pending = _in_flight.get(path)
+    if pending is None:
+        pending = asyncio.wrap_future(_submit(payload, formato, path))
+        _in_flight[path] = pending
+        pending.add_done_callback(lambda _: _in_flight.pop(path, None))
+    try:
+        # Shielded: a client that disconnects must not cancel the render other downloads wait for
+        await asyncio.shield(pending)
+    except BrokenProcessPool:
+        # A worker died (killed or out of memory); start a fresh pool for the next request
+        shutdown()
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="No se pudo generar el documento")
+    return path
+
+def prune_cache():
+    """Periodic job: deletes cached documents not downloaded in DOCUMENT_CACHE_MAX_AGE_DAYS."""
+    cutoff = time.time() - DOCUMENT_CACHE_MAX_AGE_DAYS * 86400
+    for directory, _, files in os.walk(DOCUMENT_CACHE_DIR):
+        for name in files:
+            path = os.path.join(directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+            except FileNotFoundError:
+                continue
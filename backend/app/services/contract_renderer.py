@@ -0,0 +1,97 @@
+"""
+Server-side contract rendering: fills the [Variable Name] placeholders of every
+clause with the contract's variables_adicionales, the same way the contract
+editor previews them (renderLiveContent in RegisterContract.jsx).
+
+Each distinct clause text is parsed once into a CompiledTemplate (literal
+chunks and variable names) and cached; rendering is then a join over the
+chunks. Clause bodies are shared between contracts (app.core.clause_store),
+so a template compiled for one contract serves every contract using that clause.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+from app.core.cache import TTLCache
+from app.core.config import RENDER_CACHE_SIZE, RENDER_CACHE_TTL_SECONDS
+from app.models.contract import Contrato
+
+PLACEHOLDER = re.compile(r"\[(.*?)\]")
+
+# Catalog variables the editor fills from its own form fields (variables_adicionales keys)
+STANDARD_VARIABLES = {
+    "Nombre Cliente": "cliente",
+    "DNI Cliente": "dniCliente",
+    "Área de Práctica": "areaPractica",
+    "Representante Legal": "representanteLegal",
+    "Ciudad Firma": "ciudadFirma",
+    "Valor Honorarios": "valorHonorarios",
+    "Valor Penalidad": "valorPenalidad",
+    "Fecha Inicio": "fechaInicio",
+    "Fecha Fin": "fechaFin",
+    "Ciudad Notificación": "ciudadNotificacion",
+}
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """`literals` has one more item than `names`: text before, between and after the placeholders."""
+    literals: Tuple[str, ...]
+    names: Tuple[str, ...]
+
+    def render(self, values: Dict[str, str]) -> Tuple[str, List[str]]:
+        """Returns the rendered text and the placeholders left unfilled (in order, without repeats)."""
+        parts = [self.literals[0]]
+        missing = []
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = values.get(name)
+            if value is None:
+                parts.append(f"[{name}]")
+                if name not in missing:
+                    missing.append(name)
+            else:
+                parts.append(value)
+            parts.append(literal)
+        return "".join(parts), missing
+
+def compile_template(texto: str) -> CompiledTemplate:
+    chunks = PLACEHOLDER.split(texto)
+    return CompiledTemplate(literals=tuple(chunks[0::2]), names=tuple(chunks[1::2]))
+
+# Keyed by the clause text itself: shared bodies are the same str object in every
+# contract, so the lookup reuses its cached hash instead of rescanning the text
+compiled_templates = TTLCache(RENDER_CACHE_SIZE, RENDER_CACHE_TTL_SECONDS)
+
+def get_compiled(texto: str) -> CompiledTemplate:
+    compiled = compiled_templates.get(texto)
+    if compiled is None:
+        compiled = compile_template(texto)
+        compiled_templates.set(texto, compiled)
+    return compiled
+
+def _is_filled(value):
+    # Same test as the editor: empty strings, zero amounts and null leave the placeholder visible
+    return value not in (None, "", "0.00", 0, False)
+
+def variable_values(variables_adicionales: dict) -> Dict[str, str]:
+    variables = variables_adicionales or {}
+    values = {name: variables.get(key) for name, key in STANDARD_VARIABLES.items()}
+    values["Modalidad Pago"] = "Pago Único" if variables.get("modalidadPago", "unico") == "unico" else "Abonos"
+    # Custom placeholders are stored under their own name and win over the catalog
+    values.update(variables)
+    return {name: str(value) for name, value in values.items() if _is_filled(value)}
+
+def _clause_entries(clauses):
+    if isinstance(clauses, dict):
+        return [clauses]
+    return [entry for entry in clauses or [] if isinstance(entry, dict)]
+
+def render_contract(contract: Contrato) -> dict:
+    values = variable_values(contract.variables_adicionales)
+    rendered, missing = [], []
+    for entry in _clause_entries(contract.clauses):
+        texto, unfilled = get_compiled(entry.get("texto") or "").render(values)
+        rendered.append({"titulo": entry.get("titulo"), "texto": texto})
+        missing.extend(name for name in unfilled if name not in missing)
+    return {"id": contract.id, "titulo": contract.titulo, "clausulas": rendered, "variables_faltantes": missing}
+
+def render_contracts(contracts: List[Contrato]) -> List[dict]:
+    return [render_contract(contract) for contract in contracts]
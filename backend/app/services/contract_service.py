@@ -1,90 +1,157 @@
+import hashlib
+import json
 from datetime import date
+from decimal import Decimal, InvalidOperation
 from sqlalchemy.orm import Session
 from app.models.contract import Contrato
-from app.models.payment import Pago
-from app.repositories import contract_repository
+from app.repositories import client_repository, contract_repository, payment_repository, user_repository
+from app.services import sequence_service
+from app.services.library_cache import mark_changed as mark_library_changed
+
+CENTS = Decimal("0.01")
 
 def generate_id(db: Session, prefix_base: str):
-    year = date.today().year
-    prefix = f"{prefix_base}-{year}-"
-    existing_ids = contract_repository.get_all_ids_by_prefix(db, prefix)
-    
-    max_num = 0
-    for (eid,) in existing_ids:
-        try:
-            num = int(eid.replace(prefix, ""))
-            if num > max_num: max_num = num
-        except ValueError: continue
-    
-    next_num = max_num + 1
-    return f"{prefix}{str(next_num).zfill(3)}"
+    return sequence_service.reserve_contract_ids(db, prefix_base)[0]
 
-def sync_payments(db: Session, db_contract: Contrato):
+def generate_ids(db: Session, prefix_base: str, count: int):
+    """Allocates a block of consecutive ids for bulk inserts."""
+    return sequence_service.reserve_contract_ids(db, prefix_base, count)
+
+def _to_amount(value):
+    try:
+        return Decimal(str(value if value is not None else 0).replace(",", "")).quantize(CENTS)
+    except (InvalidOperation, ValueError):
+        return Decimal("0.00")
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+def build_payment_schedule(db_contract: Contrato):
     """
-    Synchronizes installments from variables_adicionales into the Pago table.
-    Now includes tipo_pago, monto_total_contrato, and monto_abono.
+    Builds the expected Pago rows (without ids) from variables_adicionales.
+    Includes tipo_pago, monto_total_contrato, monto_abono and fecha_vencimiento.
     """
-    if db_contract.es_biblioteca:
-        return
-    
     vars_adicionales = db_contract.variables_adicionales or {}
     modalidad = vars_adicionales.get("modalidadPago")
-    installments = vars_adicionales.get("installments", [])
+    installments = vars_adicionales.get("installments") or []
 
     # Auto-calculate total from installments if not set on the contract
-    contrato_total = db_contract.total or 0
+    contrato_total = _to_amount(db_contract.total)
     if not contrato_total and installments:
-        try:
-            contrato_total = sum(
-                float(str(inst.get("monto", 0)).replace(",", ""))
-                for inst in installments
-            )
-        except Exception:
-            contrato_total = 0
-    
-    # Clean existing payments for this contract to refresh
-    db.query(Pago).filter(Pago.contrato_id == db_contract.id).delete()
-    
+        contrato_total = sum((_to_amount(inst.get("monto", 0)) for inst in installments), Decimal("0.00"))
+
     # If it's single payment, create one record
     if (modalidad == "unico" or not installments) and contrato_total > 0:
-        pago_unico = Pago(
-            contrato_id=db_contract.id,
-            tipo_pago="UNICO",
-            monto_total_contrato=contrato_total,
-            monto_abono=contrato_total,
-            fecha_vencimiento=db_contract.fecha,
-            estado="PENDIENTE"
-        )
-        db.add(pago_unico)
-    elif installments:
-        # Multiple installments
-        for inst in installments:
-            monto = inst.get("monto", 0)
-            if isinstance(monto, str):
-                try:
-                    monto = float(monto.replace(",", ""))
-                except:
-                    monto = 0
-            
-            pago = Pago(
-                contrato_id=db_contract.id,
-                tipo_pago="ABONO",
-                monto_total_contrato=contrato_total,
-                monto_abono=monto,
-                fecha_vencimiento=inst.get("fecha") if inst.get("fecha") else None,
-                estado="PENDIENTE"
-            )
-            db.add(pago)
-    
-    db.commit()
+        return [{
+            "tipo_pago": "UNICO",
+            "monto_total_contrato": contrato_total,
+            "monto_abono": contrato_total,
+            "fecha_vencimiento": _to_date(db_contract.fecha),
+        }]
+
+    # Multiple installments
+    return [{
+        "tipo_pago": "ABONO",
+        "monto_total_contrato": contrato_total,
+        "monto_abono": _to_amount(inst.get("monto", 0)),
+        "fecha_vencimiento": _to_date(inst.get("fecha")),
+    } for inst in installments]
+
+def payment_schedule_fingerprint(schedule: list):
+    canonical = json.dumps(schedule, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def _match_paid(paid: list, schedule: list):
+    """Schedule entries left once each paid row has taken the entry with its due date and amount."""
+    remaining = list(schedule)
+    for payment in paid:
+        for index, expected in enumerate(remaining):
+            if (expected["fecha_vencimiento"], expected["monto_abono"]) == (payment.fecha_vencimiento, payment.monto_abono):
+                del remaining[index]
+                break
+    return remaining
+
+def sync_payments(db: Session, db_contract: Contrato):
+    """
+    Synchronizes installments from variables_adicionales into the Pago table.
+    The schedule fingerprint is stored on the contract, so saves that do not touch
+    the installments cost nothing.
+
+    Paid rows are never updated or deleted: each one is matched to the schedule
+    entry with its due date and amount, and one without a match stays as it is.
+    The remaining entries are diffed against the unpaid rows by position, and only
+    the rows that differ are updated, inserted or deleted.
+
+    Call it before flushing the contract, so the new fingerprint is written by the
+    contract's own UPDATE instead of a second one.
+    """
+    if db_contract.es_biblioteca:
+        return
+
+    schedule = build_payment_schedule(db_contract)
+    fingerprint = payment_schedule_fingerprint(schedule)
+    if db_contract.huella_pagos == fingerprint:
+        return
+
+    existing = payment_repository.get_payments_by_contract(db, db_contract.id)
+    unpaid = [payment for payment in existing if payment.estado != "PAGADO"]
+    schedule = _match_paid([payment for payment in existing if payment.estado == "PAGADO"], schedule)
+    to_update, to_insert, to_delete = [], [], []
+    for position in range(max(len(unpaid), len(schedule))):
+        current = unpaid[position] if position < len(unpaid) else None
+        expected = schedule[position] if position < len(schedule) else None
+
+        if current is None:
+            to_insert.append(_new_payment(db_contract, expected))
+        elif expected is None:
+            to_delete.append(current.id)
+        elif any(getattr(current, key) != value for key, value in expected.items()):
+            to_update.append({**expected, "id": current.id})
+
+    payment_repository.bulk_update_payments(db, to_update)
+    payment_repository.bulk_insert_payments(db, to_insert)
+    payment_repository.delete_payments(db, to_delete)
+
+    db_contract.huella_pagos = fingerprint
+
+def _new_payment(db_contract: Contrato, expected: dict):
+    return {**expected, "contrato_id": db_contract.id, "estado": "PENDIENTE"}
+
+def _initial_payments(db_contract: Contrato):
+    """Payment rows of a contract that is not inserted yet; also sets its fingerprint."""
+    if db_contract.es_biblioteca:
+        return []
+    schedule = build_payment_schedule(db_contract)
+    db_contract.huella_pagos = payment_schedule_fingerprint(schedule)
+    return [_new_payment(db_contract, expected) for expected in schedule]
+
+def insert_with_payments(db: Session, db_contract: Contrato):
+    """
+    Inserts a new contract and its payment schedule. There is nothing to diff yet:
+    the fingerprint goes into the contract INSERT and every installment is inserted.
+    """
+    payments = _initial_payments(db_contract)
+    created_contract = contract_repository.create_contract(db, db_contract)
+    payment_repository.bulk_insert_payments(db, payments)
+    return created_contract
 
 def create_contract(db: Session, contract_data: dict):
     if not contract_data.get("id"):
         contract_data["id"] = generate_id(db, "CNT")
-    db_contract = Contrato(**contract_data)
-    created_contract = contract_repository.create_contract(db, db_contract)
-    sync_payments(db, created_contract)
-    return created_contract
+    return insert_with_payments(db, Contrato(**contract_data))
+
+def library_search_text(clauses):
+    """Plain text indexed by the library search: every clause title and body."""
+    entries = [clauses] if isinstance(clauses, dict) else [entry for entry in clauses or [] if isinstance(entry, dict)]
+    parts = [part for entry in entries for part in (entry.get("titulo"), entry.get("texto")) if part]
+    return "\n".join(parts)
 
 def create_library_item(db: Session, item_data: dict, tipo: str):
     prefix_str = "PLT" if tipo == "plantilla" else "LIB"
@@ -99,6 +166,7 @@ def create_library_item(db: Session, item_data: dict, tipo: str):
         id=item_id,
         titulo=item_data.get("titulo"),
         clauses=clauses_content,
+        texto_busqueda=library_search_text(clauses_content),
         tipo=tipo,
         es_biblioteca=True,
         estado="ACTIVO",
@@ -108,30 +176,66 @@ def create_library_item(db: Session, item_data: dict, tipo: str):
         abogado_id=None,
         variables_adicionales={"areaPractica": item_data.get("tipo", "Insolvencia Económica")}
     )
+    mark_library_changed(db)
     return contract_repository.create_contract(db, db_item)
 
-def generate_contract_from_template(db: Session, plantilla_id: str, contract_data: dict):
+def _get_template(db: Session, plantilla_id: str):
     template = contract_repository.get_contract_by_id(db, plantilla_id)
     if not template or not template.es_biblioteca or template.tipo != "plantilla":
         return None
+    return template
 
-    new_id = generate_id(db, "CNT")
-    new_contract_data = {
-        "id": new_id,
-        "titulo": f"Contrato basado en {template.titulo}",
-        "cliente_id": contract_data.get("cliente_id"),
-        "abogado_id": contract_data.get("abogado_id"),
-        "tipo": "contrato",
-        "es_biblioteca": False,
-        "estado": "Borrador",
-        "clauses": template.clauses,
-        "total": contract_data.get("total"),
-        "variables_adicionales": contract_data.get("variables_adicionales")
-    }
-    db_contract = Contrato(**new_contract_data)
-    created_contract = contract_repository.create_contract(db, db_contract)
-    sync_payments(db, created_contract)
-    return created_contract
+def _contract_from_template(template: Contrato, new_id: str, contract_data: dict):
+    return Contrato(
+        id=new_id,
+        titulo=f"Contrato basado en {template.titulo}",
+        cliente_id=contract_data.get("cliente_id"),
+        abogado_id=contract_data.get("abogado_id"),
+        tipo="contrato",
+        es_biblioteca=False,
+        estado="Borrador",
+        clauses=template.clauses,
+        total=contract_data.get("total"),
+        variables_adicionales=contract_data.get("variables_adicionales")
+    )
+
+def generate_contract_from_template(db: Session, plantilla_id: str, contract_data: dict):
+    template = _get_template(db, plantilla_id)
+    if not template:
+        return None
+    return insert_with_payments(db, _contract_from_template(template, generate_id(db, "CNT"), contract_data))
+
+def generate_contracts_from_template(db: Session, plantilla_id: str, items: list):
+    """
+    Batch version of generate_contract_from_template. Items whose client or lawyer
+    does not exist are reported in `errores` and skipped; the rest get one block of
+    ids and are inserted with their payments in two statements (contracts, payments).
+    Returns None when the template does not exist.
+    """
+    template = _get_template(db, plantilla_id)
+    if not template:
+        return None
+
+    client_ids = client_repository.get_active_client_ids(db, {item.get("cliente_id") for item in items})
+    lawyer_ids = user_repository.get_existing_user_ids(db, {item.get("abogado_id") for item in items})
+    accepted, errors = [], []
+    for index, item in enumerate(items):
+        if item.get("cliente_id") not in client_ids:
+            errors.append({"indice": index, "detalle": "Cliente no encontrado"})
+        elif item.get("abogado_id") not in lawyer_ids:
+            errors.append({"indice": index, "detalle": "Abogado no encontrado"})
+        else:
+            accepted.append((index, item))
+
+    created = []
+    if accepted:
+        new_ids = generate_ids(db, "CNT", len(accepted))
+        contracts = [_contract_from_template(template, new_id, item) for new_id, (_, item) in zip(new_ids, accepted)]
+        payments = [row for db_contract in contracts for row in _initial_payments(db_contract)]
+        contract_repository.create_contracts(db, contracts)
+        payment_repository.bulk_insert_payments(db, payments)
+        created = [{"indice": index, "id": new_id} for new_id, (index, _) in zip(new_ids, accepted)]
+    return {"creados": created, "errores": errors}
 
 def update_contract(db: Session, contract_id: str, contract_update: dict):
     db_contract = contract_repository.get_contract_by_id(db, contract_id)
@@ -139,6 +243,7 @@ def update_contract(db: Session, contract_id: str, contract_update: dict):
     
     # Handle specific mapping for Legal Library items
     if db_contract.es_biblioteca:
+        mark_library_changed(db)
         # For clauses, map 'texto' to the JSONB 'clauses' structure
         if db_contract.tipo == "clausula" and "texto" in contract_update:
             db_contract.clauses = {
@@ -159,7 +264,13 @@ def update_contract(db: Session, contract_id: str, contract_update: dict):
             continue
         if value is not None and hasattr(db_contract, key):
             setattr(db_contract, key, value)
-            
-    updated_contract = contract_repository.update_contract(db, db_contract)
-    sync_payments(db, updated_contract)
-    return updated_contract
+
+    if db_contract.es_biblioteca:
+        db_contract.texto_busqueda = library_search_text(db_contract.clauses)
+    sync_payments(db, db_contract)
+    return contract_repository.update_contract(db, db_contract)
+
+def delete_contract(db: Session, db_contract: Contrato):
+    if db_contract.es_biblioteca:
+        mark_library_changed(db)
+    contract_repository.delete_contract(db, db_contract)
@@ -0,0 +1,82 @@
+"""
+Streaming CSV / NDJSON exports (GET /contracts/export and /payments/export).
+
+Rows come from a server-side cursor (`yield_per`: a named cursor on PostgreSQL)
+EXPORT_BATCH_SIZE at a time; each batch is encoded, optionally gzip-compressed
+and handed to the StreamingResponse before the next one is fetched, so memory
+stays flat however many rows are exported.
+
+The generator opens its own session: the request's dependency sessions are
+closed as soon as the handler returns, before the body is streamed.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Iterator
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+from app.core.config import EXPORT_BATCH_SIZE
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+def _json_value(value):
+    # Amounts keep their exact decimal representation
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _csv_lines(rows, header=None) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def _ndjson_lines(keys, rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(keys, row)), default=_json_value, ensure_ascii=False) + "\n" for row in rows
+    )
+
+def export_rows(session_factory: Callable[[], Session], query: Select, formato: str,
+                comprimir: bool = False, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Yields the encoded export one batch of rows at a time."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if comprimir else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    db = session_factory()
+    try:
+        result = db.execute(query, execution_options={"yield_per": batch_size})
+        keys = list(result.keys())
+        if formato == "csv":
+            yield encode(_csv_lines([], header=keys))
+        for rows in result.partitions():
+            chunk = encode(_csv_lines(rows) if formato == "csv" else _ndjson_lines(keys, rows))
+            if chunk:
+                yield chunk
+        result.close()
+    finally:
+        db.close()
+    if compressor:
+        yield compressor.flush()
+
+def streaming_export(session_factory: Callable[[], Session], query: Select, nombre: str,
+                     formato: str, comprimir: bool = False) -> StreamingResponse:
+    filename = f"{nombre}.{formato}" + (".gz" if comprimir else "")
+    return StreamingResponse(
+        export_rows(session_factory, query, formato, comprimir),
+        media_type="application/gzip" if comprimir else EXPORT_FORMATS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,65 @@
+"""
+Process-local cache of the serialized legal library (GET /contracts/clausulas
+and /contracts/plantillas). Entries are stamped with the cache version; any
+write to a library item marks the session, and the version is bumped once
+that transaction commits, so the next read re-serializes.
+"""
+import threading
+import time
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.config import LIBRARY_CACHE_TTL_SECONDS
+from app.core.http_cache import make_etag
+from app.repositories import contract_repository
+from app.schemas.contract import ContratoSchema
+
+_CHANGED_KEY = "library_changed"
+_serializer = TypeAdapter(List[ContratoSchema])
+
+class LibraryCache:
+    def __init__(self, ttl_seconds: int):
+        self._lock = threading.Lock()
+        self._ttl_seconds = ttl_seconds
+        self._version = 0
+        self._entries = {}  # tipo -> (version, loaded_at, body, etag)
+
+    @property
+    def version(self):
+        return self._version
+
+    def get(self, db: Session, tipo: str):
+        """Returns (json_body, etag) for the library items of the given tipo."""
+        entry = self._entries.get(tipo)
+        if entry and entry[0] == self._version and time.monotonic() - entry[1] < self._ttl_seconds:
+            return entry[2], entry[3]
+
+        # Read the version first: a bump that lands while we serialize makes this entry stale
+        version = self._version
+        items = contract_repository.get_contracts(db, es_biblioteca=True, tipo=tipo)
+        body = _serializer.dump_json(items)
+        etag = make_etag(body)
+        with self._lock:
+            self._entries[tipo] = (version, time.monotonic(), body, etag)
+        return body, etag
+
+    def bump(self):
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+library_cache = LibraryCache(LIBRARY_CACHE_TTL_SECONDS)
+
+def mark_changed(db: Session):
+    """Call from any write to a library item; the cache is invalidated when `db` commits."""
+    db.info[_CHANGED_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    if session.info.pop(_CHANGED_KEY, False):
+        library_cache.bump()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop(_CHANGED_KEY, None)
@@ -0,0 +1,80 @@
+"""
+Overdue sweep: PENDIENTE installments of live, non-draft contracts past their
+due date become VENCIDO, and so do the contracts that have one (finished
+contracts keep their state). Each step is one set-based UPDATE over a partial index of pago, so a run
+costs the same two statements however many rows it changes.
+
+Every API worker schedules the job. On PostgreSQL a transaction-level advisory
+lock lets one sweep run at a time and the others skip; SQLite already serializes
+writers. The UPDATEs are idempotent, so a sweep right after another finds nothing.
+"""
+import logging
+import time
+from datetime import date
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.core.metrics import registry
+from app.repositories import contract_repository, payment_repository
+from app.services.stats_counters import invalidate_on_commit
+
+logger = logging.getLogger(__name__)
+
+# Application-chosen key of the advisory lock; any bigint not used by another lock
+SWEEP_LOCK_KEY = 7_420_250_001
+# Compared case-insensitively: contracts generated from a template start as "Borrador".
+# A draft is not signed yet, so its installments are not due and it never expires;
+# a finished contract is closed (and VENCIDO is already there)
+DRAFT_STATES = ("BORRADOR",)
+NOT_EXPIRABLE_STATES = (*DRAFT_STATES, "TERMINADO", "VENCIDO")
+
+sweep_runs = registry.counter("overdue_sweep_runs_total", "Overdue sweeps by outcome", ("outcome",))
+sweep_marked = registry.counter("overdue_sweep_marked_total", "Rows moved to VENCIDO by the overdue sweep", ("entidad",))
+sweep_seconds = registry.histogram("overdue_sweep_duration_seconds", "Duration of completed overdue sweeps")
+sweep_last_success = registry.gauge("overdue_sweep_last_success_timestamp_seconds", "Unix time of the last completed overdue sweep")
+
+def _try_lock(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    # Released when the transaction ends, also if the worker dies mid-sweep
+    return db.execute(select(func.pg_try_advisory_xact_lock(SWEEP_LOCK_KEY))).scalar()
+
+def sweep_overdue(db: Session, today: Optional[date] = None):
+    """
+    Runs the sweep in the caller's transaction. Returns the rows changed per table,
+    or None when another sweep holds the lock.
+    """
+    if not _try_lock(db):
+        return None
+    pagos = payment_repository.mark_overdue(db, today or date.today(), DRAFT_STATES)
+    contratos = contract_repository.expire_contracts_with_overdue_payments(db, NOT_EXPIRABLE_STATES)
+    if contratos:
+        # Core UPDATE: the stats counters never saw these state changes
+        invalidate_on_commit(db)
+    return {"pagos": pagos, "contratos": contratos}
+
+def run_overdue_sweep(today: Optional[date] = None):
+    """Periodic job and scripts/sweep_overdue.py: one sweep in its own transaction, with metrics."""
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        result = sweep_overdue(db, today)
+        db.commit()
+    except Exception:
+        sweep_runs.inc(outcome="error")
+        raise
+    finally:
+        db.close()
+
+    if result is None:
+        sweep_runs.inc(outcome="skipped")
+        return None
+    sweep_runs.inc(outcome="ok")
+    sweep_marked.inc(result["pagos"], entidad="pago")
+    sweep_marked.inc(result["contratos"], entidad="contrato")
+    sweep_seconds.observe(time.perf_counter() - start)
+    sweep_last_success.set(time.time())
+    if result["pagos"] or result["contratos"]:
+        logger.info(f"Overdue sweep: {result['pagos']} pagos y {result['contratos']} contratos vencidos")
+    return result
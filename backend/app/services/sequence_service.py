@@ -0,0 +1,61 @@
+from datetime import date
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+from app.repositories import sequence_repository, client_repository, contract_repository
+
+CLIENT_PREFIX = "CLI"
+
+def reserve(db: Session, prefijo: str, cantidad: int = 1, anio: int = 0, seed: Optional[Callable[[], int]] = None):
+    """
+    Reserves `cantidad` consecutive values for the given prefix/year and returns them as a range.
+    `seed` is only called the first time a counter is used, to start it after the
+    highest value already present in the data (ids created before the counter existed).
+    The reservation becomes permanent when the caller's transaction commits.
+    """
+    if cantidad < 1:
+        raise ValueError("La cantidad a reservar debe ser mayor que cero")
+
+    last = sequence_repository.increment(db, prefijo, anio, cantidad)
+    if last is None:
+        sequence_repository.create_if_missing(db, prefijo, anio, seed() if seed else 0)
+        last = sequence_repository.increment(db, prefijo, anio, cantidad)
+    return range(last - cantidad + 1, last + 1)
+
+def next_value(db: Session, prefijo: str, anio: int = 0, seed: Optional[Callable[[], int]] = None):
+    return reserve(db, prefijo, 1, anio, seed)[0]
+
+def peek(db: Session, prefijo: str, anio: int = 0, seed: Optional[Callable[[], int]] = None):
+    """Returns the value the next allocation would get, without consuming it."""
+    current = sequence_repository.get_value(db, prefijo, anio)
+    if current is None:
+        current = seed() if seed else 0
+    return current + 1
+
+def format_contract_id(prefix_base: str, year: int, number: int):
+    return f"{prefix_base}-{year}-{str(number).zfill(3)}"
+
+def reserve_contract_ids(db: Session, prefix_base: str, cantidad: int = 1):
+    year = date.today().year
+    prefix = f"{prefix_base}-{year}-"
+
+    def seed():
+        # One-time scan, only when the yearly counter does not exist yet
+        max_num = 0
+        for (eid,) in contract_repository.get_all_ids_by_prefix(db, prefix):
+            try:
+                max_num = max(max_num, int(eid.replace(prefix, "")))
+            except ValueError:
+                continue
+        return max_num
+
+    numbers = reserve(db, prefix_base, cantidad, anio=year, seed=seed)
+    return [format_contract_id(prefix_base, year, n) for n in numbers]
+
+def next_client_id(db: Session):
+    return next_value(db, CLIENT_PREFIX, seed=lambda: client_repository.get_max_client_id(db))
+
+def reserve_client_ids(db: Session, cantidad: int):
+    return reserve(db, CLIENT_PREFIX, cantidad, seed=lambda: client_repository.get_max_client_id(db))
+
+def peek_client_id(db: Session):
+    return peek(db, CLIENT_PREFIX, seed=lambda: client_repository.get_max_client_id(db))
@@ -0,0 +1,190 @@
+"""
+In-process stats counters keyed by (abogado_id, estado) for contracts and by
+usuario_id for clients, so GET /stats is a dictionary read.
+
+Every ORM flush that creates, changes or deletes a Contrato/Cliente records
+the counter deltas on the session; they are applied when the transaction
+commits and dropped on rollback. Writes that bypass the ORM (Core bulk
+INSERT/UPDATE) must call `invalidate_on_commit(session)` (or
+`counters.invalidate()` once committed).
+
+Counters are per worker process: other workers' writes (and any drift) are
+picked up by the periodic reconciliation, which reloads them from the database.
+"""
+import threading
+from collections import Counter
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from app.repositories import stats_repository
+
+_PENDING_KEY = "stats_counter_deltas"
+_INVALIDATE_KEY = "stats_counters_invalidate"
+
+class StatsCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contracts = Counter()
+        self._contracts_by_owner = Counter()
+        self._clients = Counter()
+        self._total_contracts = 0
+        self._total_clients = 0
+        self._loaded = False
+        # Bumped by every apply/invalidate: a reload whose queries raced a commit is not installed
+        self._generation = 0
+
+    def reconcile(self, db: Session):
+        """Reloads every counter from the database (two GROUP BY queries)."""
+        generation = self._generation
+        return self._load(
+            generation,
+            stats_repository.get_contract_counts_by_owner(db),
+            stats_repository.get_client_counts_by_owner(db),
+        )
+
+    async def reconcile_async(self, db: AsyncSession):
+        generation = self._generation
+        return self._load(
+            generation,
+            await stats_repository.get_contract_counts_by_owner_async(db),
+            await stats_repository.get_client_counts_by_owner_async(db),
+        )
+
+    def _load(self, generation: int, contract_rows, client_rows):
+        """
+        Installs the reloaded counters unless a commit was applied (or the counters
+        invalidated) since `generation` was read: the rows may predate that commit, so
+        they are dropped and the next read reloads. Returns the counters either way,
+        which are exact as of the queries.
+        """
+        contracts = Counter({(owner, estado): n for owner, estado, n in contract_rows})
+        clients = Counter({owner: n for owner, n in client_rows})
+        by_owner = Counter()
+        for (owner, _), n in contracts.items():
+            by_owner[owner] += n
+        loaded = (contracts, by_owner, clients, sum(contracts.values()), sum(clients.values()))
+        with self._lock:
+            if self._generation == generation:
+                (self._contracts, self._contracts_by_owner, self._clients,
+                 self._total_contracts, self._total_clients) = loaded
+                self._loaded = True
+        return loaded
+
+    def invalidate(self):
+        """Forces a reload on the next read."""
+        with self._lock:
+            self._generation += 1
+            self._loaded = False
+
+    def apply(self, contract_deltas: Counter, client_deltas: Counter):
+        with self._lock:
+            # Also when not loaded: a reload in flight may have missed this commit
+            self._generation += 1
+            if not self._loaded:
+                return
+            for key, delta in contract_deltas.items():
+                self._contracts[key] += delta
+                self._contracts_by_owner[key[0]] += delta
+                self._total_contracts += delta
+            for key, delta in client_deltas.items():
+                self._clients[key] += delta
+                self._total_clients += delta
+
+    def read(self, db: Session, user_id: int, estados: dict):
+        if not self._loaded:
+            return self._snapshot(user_id, estados, *self.reconcile(db))
+        with self._lock:
+            return self._snapshot(user_id, estados, *self._current())
+
+    async def read_async(self, db: AsyncSession, user_id: int, estados: dict):
+        if not self._loaded:
+            return self._snapshot(user_id, estados, *await self.reconcile_async(db))
+        with self._lock:
+            return self._snapshot(user_id, estados, *self._current())
+
+    def _current(self):
+        return self._contracts, self._contracts_by_owner, self._clients, self._total_contracts, self._total_clients
+
+    @staticmethod
+    def _snapshot(user_id: int, estados: dict, contracts, by_owner, clients, total_contracts, total_clients):
+        return {
+            "total_contracts": total_contracts,
+            "total_clients": total_clients,
+            "my_contracts": by_owner[user_id],
+            "my_clients": clients[user_id],
+            **{key: contracts[(user_id, estado)] for key, estado in estados.items()},
+        }
+
+counters = StatsCounters()
+
+_UNKNOWN = object()
+
+def _previous(state, attr):
+    """Value of `attr` before this flush; _UNKNOWN if it was overwritten while expired."""
+    if attr not in state.committed_state:
+        return state.dict.get(attr)
+    original = state.committed_state[attr]
+    return _UNKNOWN if original is NO_VALUE else original
+
+def _contract_key(values):
+    if values["es_biblioteca"] or values["is_deleted"]:
+        return None
+    return (values["abogado_id"], values["estado"])
+
+def _client_key(values):
+    if values["is_deleted"]:
+        return None
+    return values["usuario_id"]
+
+_TRACKED = {
+    Contrato: (("abogado_id", "estado", "es_biblioteca", "is_deleted"), _contract_key),
+    Cliente: (("usuario_id", "is_deleted"), _client_key),
+}
+
+@event.listens_for(Session, "after_flush")
+def _collect_deltas(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, {Contrato: Counter(), Cliente: Counter()})
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tracked = _TRACKED.get(type(obj))
+        if tracked is None:
+            continue
+        attrs, key_for = tracked
+        state = inspect(obj)
+        current = {attr: getattr(obj, attr) for attr in attrs}
+
+        if obj in session.new:
+            old_key, new_key = None, key_for(current)
+        else:
+            previous = {attr: _previous(state, attr) for attr in attrs}
+            if any(value is _UNKNOWN for value in previous.values()):
+                # The old value was expired before being overwritten; let the next read reload
+                counters.invalidate()
+                continue
+            old_key = key_for(previous)
+            new_key = None if obj in session.deleted else key_for(current)
+
+        if old_key != new_key:
+            if old_key is not None:
+                pending[type(obj)][old_key] -= 1
+            if new_key is not None:
+                pending[type(obj)][new_key] += 1
+
+def invalidate_on_commit(session: Session):
+    """For Core bulk writes: the counters are reloaded once this transaction commits."""
+    session.info[_INVALIDATE_KEY] = True
+
+@event.listens_for(Session, "after_commit")
+def _apply_deltas(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_INVALIDATE_KEY, False):
+        counters.invalidate()
+    elif pending:
+        counters.apply(pending[Contrato], pending[Cliente])
+
+@event.listens_for(Session, "after_rollback")
+def _discard_deltas(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_INVALIDATE_KEY, None)
@@ -1,19 +1,83 @@
 from sqlalchemy.orm import Session
-from app.repositories import contract_repository, client_repository
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import STATS_COUNTERS_ENABLED
+from app.core.database import SessionLocal
+from app.repositories import stats_repository
+from app.services.stats_counters import counters
 
-def get_firm_stats(db: Session):
+# Output key -> Contrato.estado. Adding a state here adds a FILTER column to the
+# same aggregate query, not another round trip.
+CONTRACT_STATES = {
+    "expired": "VENCIDO",
+    "drafts": "BORRADOR",
+    "completed": "TERMINADO",
+}
+
+BREAKDOWN_DIMENSIONS = ("estado", "area", "mes")
+
+def get_stats(db: Session, user_id: int):
+    if STATS_COUNTERS_ENABLED:
+        counts = counters.read(db, user_id=user_id, estados=CONTRACT_STATES)
+    else:
+        counts = stats_repository.get_counts(db, user_id=user_id, estados=CONTRACT_STATES)
+    return _stats_payload(counts)
+
+async def get_stats_async(db: AsyncSession, user_id: int):
+    if STATS_COUNTERS_ENABLED:
+        counts = await counters.read_async(db, user_id=user_id, estados=CONTRACT_STATES)
+    else:
+        counts = await stats_repository.get_counts_async(db, user_id=user_id, estados=CONTRACT_STATES)
+    return _stats_payload(counts)
+
+def _stats_payload(counts):
     return {
-        "totalContracts": contract_repository.count_contracts(db),
-        "totalClients": client_repository.count_clients(db)
+        "firmStats": {
+            "totalContracts": counts["total_contracts"],
+            "totalClients": counts["total_clients"]
+        },
+        "userStats": {
+            "myContracts": counts["my_contracts"],
+            "myClients": counts["my_clients"],
+            "contractStatus": {key: counts[key] for key in CONTRACT_STATES}
+        }
     }
 
+def reconcile_counters():
+    """Periodic job: rebuilds the in-process counters from the database."""
+    db = SessionLocal()
+    try:
+        counters.reconcile(db)
+    finally:
+        db.close()
+
+def get_firm_stats(db: Session):
+    return get_stats(db, user_id=None)["firmStats"]
+
 def get_user_stats(db: Session, user_id: int):
-    return {
-        "myContracts": contract_repository.count_contracts(db, user_id=user_id),
-        "myClients": client_repository.count_clients(db, user_id=user_id),
-        "contractStatus": {
-            "expired": contract_repository.count_contracts(db, user_id=user_id, estado="VENCIDO"),
-            "drafts": contract_repository.count_contracts(db, user_id=user_id, estado="BORRADOR"),
-            "completed": contract_repository.count_contracts(db, user_id=user_id, estado="TERMINADO")
+    return get_stats(db, user_id=user_id)["userStats"]
+
+def get_breakdown(db: Session, dimension: str, user_id: int = None):
+    """
+    Contract counts per area de práctica, per month (YYYYMM) or per estado,
+    each entry carrying the same per-state counters as /stats.
+    """
+    if dimension not in BREAKDOWN_DIMENSIONS:
+        raise ValueError(f"Dimensión no soportada: {dimension}")
+    rows = stats_repository.get_breakdown(db, dimension, estados=CONTRACT_STATES, user_id=user_id)
+    return _breakdown_payload(rows)
+
+async def get_breakdown_async(db: AsyncSession, dimension: str, user_id: int = None):
+    if dimension not in BREAKDOWN_DIMENSIONS:
+        raise ValueError(f"Dimensión no soportada: {dimension}")
+    rows = await stats_repository.get_breakdown_async(db, dimension, estados=CONTRACT_STATES, user_id=user_id)
+    return _breakdown_payload(rows)
+
+def _breakdown_payload(rows):
+    return [
+        {
+            "clave": row["clave"],
+            "total": row["total"],
+            "contractStatus": {key: row[key] for key in CONTRACT_STATES}
         }
-    }
+        for row in rows
+    ]
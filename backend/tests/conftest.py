@@ -0,0 +1,150 @@
+import sys
+import os
+
+# Ensure the backend package is importable when running pytest from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core.database import async_database_url
+from app.db.base_class import Base
+import app.models  # noqa: F401  (registers every model on Base.metadata)
+
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Each test gets a fresh database, so in-process caches must start empty."""
+    from app.services.stats_counters import counters
+    from app.services.library_cache import library_cache
+    from app.core.principals import principal_cache
+    from app.core.clause_store import clause_bodies
+    counters.invalidate()
+    library_cache.bump()
+    principal_cache.clear()
+    clause_bodies.clear()
+    yield
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file, not :memory:, so the async engine used by the async routes sees the same data
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def async_engine(engine):
+    # NullPool: aiosqlite connections are tied to the event loop that opened them,
+    # and TestClient runs every request on a fresh one
+    return create_async_engine(async_database_url(str(engine.url)), poolclass=NullPool)
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+class QueryCounter:
+    """
+    Counts the SQL statements run against the engine's database while the context
+    is active, including those issued through the async engine on the same file.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if conn.engine.url.database == self.engine.url.database:
+            self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(Engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+@contextmanager
+def assert_max_queries(engine, maximum):
+    """Fails the test if the wrapped block runs more than `maximum` SQL statements."""
+    with QueryCounter(engine) as counter:
+        yield counter
+    assert counter.count <= maximum, (
+        f"Expected at most {maximum} queries, got {counter.count}:\n" + "\n".join(counter.statements)
+    )
+
+@pytest.fixture
+def api(engine, async_engine):
+    """FastAPI app with every router mounted on the in-memory database (app.main needs Postgres)."""
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+    from app.core.database import get_db, get_async_db
+    from app.core.replica import get_read_db, get_async_read_db, get_read_session_factory
+    from app.core.unit_of_work import track
+    from app.routes import auth, clients, contracts, payments, users, stats, roles
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(users.router, prefix="/users")
+    app.include_router(clients.router, prefix="/clients")
+    app.include_router(contracts.router, prefix="/contracts")
+    app.include_router(payments.router, prefix="/payments")
+    app.include_router(stats.router, prefix="/stats")
+    app.include_router(roles.router, prefix="/roles")
+
+    testing_session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db(request: Request):
+        session = testing_session()
+        track(request, session)
+        try:
+            yield session
+        finally:
+            session.close()
+
+    testing_async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with testing_async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # One test database: replica routing is covered by test_replica_routing
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    app.dependency_overrides[get_read_session_factory] = lambda: testing_session
+    return TestClient(app)
+
+@pytest.fixture
+def admin(db):
+    from app.models.auth import Rol, Usuario
+    user = Usuario(
+        nombre="Admin", apellido="Pruebas", cedula="900000001", celular="3000000001",
+        correo="admin@pruebas.com", password="x", estado="Activo",
+    )
+    user.roles = [Rol(nombre="Administrador"), Rol(nombre="Abogado")]
+    db.add(user)
+    db.commit()
+    return user
+
+@pytest.fixture
+def auth_headers(admin):
+    from app.core.security import create_access_token
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': str(admin.id)})}"}
@@ -0,0 +1,84 @@
+import asyncio
+import inspect
+import os
+import subprocess
+import sys
+import pytest
+import httpx
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from conftest import QueryCounter
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+def test_hot_routes_are_coroutines():
+    from app.routes import clients, contracts, stats
+    hot = [
+        contracts.read_contracts, contracts.list_contract_summaries, contracts.get_contract,
+        clients.read_clients, clients.get_client, stats.get_stats, stats.get_breakdown,
+    ]
+    assert all(inspect.iscoroutinefunction(endpoint) for endpoint in hot)
+
+@pytest.mark.anyio
+async def test_concurrent_reads_on_one_event_loop(api, db, admin, auth_headers):
+    from app.models.client import Cliente
+    from app.models.contract import Contrato
+    db.add(Cliente(id=1, cedula="1000001", nombre="Rosa", apellido="Luna", usuario_id=admin.id))
+    db.add_all([Contrato(id=f"CNT-2026-{i:03d}", titulo="Contrato", cliente_id=1, abogado_id=admin.id) for i in range(5)])
+    db.commit()
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=auth_headers) as client:
+        responses = await asyncio.gather(*[
+            client.get(path) for path in ["/contracts/", "/clients/", "/stats/", "/contracts/CNT-2026-003"] * 5
+        ])
+    assert all(response.status_code == 200 for response in responses)
+    assert len(responses[0].json()) == 5
+    assert responses[3].json()["cliente"]["nombre"] == "Rosa"
+
+def test_sync_routes_authenticate_on_the_sync_pool(api, engine, async_engine, auth_headers):
+    async_statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: async_statements.append(args[2]))
+    # Principal cache miss: looked up on the route's own session
+    with QueryCounter(engine) as counter:
+        assert api.get("/users/me", headers=auth_headers).status_code == 200
+    assert any("rol" in statement.lower() for statement in counter.statements)
+    assert async_statements == []
+
+def test_async_routes_fall_back_to_the_sync_pool(api, engine, db, admin, auth_headers):
+    from app.core.database import ThreadedSession, get_async_db
+    from app.core.replica import get_async_read_db
+    from app.models.client import Cliente
+    from app.models.contract import Contrato
+    db.add(Cliente(id=1, cedula="1000001", nombre="Rosa", apellido="Luna", usuario_id=admin.id))
+    db.add(Contrato(id="CNT-2026-001", titulo="Contrato", cliente_id=1, abogado_id=admin.id))
+    db.commit()
+
+    sync_session = sessionmaker(autoflush=False, bind=engine)
+    async def threaded_db():
+        async with ThreadedSession(sync_session()) as session:
+            yield session
+    api.app.dependency_overrides[get_async_db] = threaded_db
+    api.app.dependency_overrides[get_async_read_db] = threaded_db
+
+    assert [c["id"] for c in api.get("/contracts/", headers=auth_headers).json()] == ["CNT-2026-001"]
+    assert api.get("/contracts/CNT-2026-001", headers=auth_headers).json()["cliente"]["nombre"] == "Rosa"
+    assert [c["id"] for c in api.get("/clients/", headers=auth_headers).json()] == [1]
+    assert api.get("/clients/search", headers=auth_headers, params={"q": "rosa"}).json()[0]["id"] == 1
+    assert api.get("/stats/", headers=auth_headers).status_code == 200
+
+def test_disabled_async_engine_needs_no_async_driver(tmp_path):
+    script = (
+        "import sys; sys.modules.update(asyncpg=None, aiosqlite=None)\n"
+        "from app.core import database\n"
+        "assert database.async_engine is None\n"
+    )
+    env = {**os.environ, "ASYNC_DB_ENABLED": "false", "DATABASE_URL": f"sqlite:///{tmp_path / 'app.db'}"}
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", script], cwd=backend, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,88 @@
+from datetime import date
+
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from app.models.payment import Pago
+from app.services.stats_counters import counters
+from conftest import QueryCounter
+
+def _template(db):
+    template = Contrato(
+        id="PLT-2026-001", titulo="Arrendamiento", tipo="plantilla", es_biblioteca=True,
+        clauses=[{"titulo": "Objeto", "texto": "..."}],
+    )
+    db.add(template)
+    db.commit()
+    return template
+
+def _clients(db, admin, count):
+    db.add_all([
+        Cliente(id=i, cedula=f"{1000000 + i}", nombre="Cliente", apellido=str(i), usuario_id=admin.id)
+        for i in range(1, count + 1)
+    ])
+    db.commit()
+
+def test_batch_inserts_contracts_and_payments_in_bulk(api, db, engine, admin, auth_headers):
+    _template(db)
+    _clients(db, admin, 50)
+    items = [{
+        "cliente_id": i, "abogado_id": admin.id, "total": 300,
+        "variables_adicionales": {"modalidadPago": "cuotas", "installments": [
+            {"fecha": "2026-11-01", "monto": 100}, {"fecha": "2026-12-01", "monto": 200},
+        ]},
+    } for i in range(1, 51)]
+
+    with QueryCounter(engine) as counter:
+        response = api.post("/contracts/generar-desde-plantilla/PLT-2026-001/lote", headers=auth_headers, json=items)
+
+    assert response.status_code == 200
+    body = response.json()
+    year = date.today().year
+    assert body["errores"] == []
+    assert [c["id"] for c in body["creados"]] == [f"CNT-{year}-{str(n).zfill(3)}" for n in range(1, 51)]
+    # the statement count does not grow with the batch size
+    assert sum(sql.startswith("INSERT INTO contrato") for sql in counter.statements) == 1
+    assert sum(sql.startswith("INSERT INTO pago") for sql in counter.statements) == 1
+    assert counter.count < 15, "\n".join(counter.statements)
+    assert db.query(Pago).count() == 100
+    assert db.get(Contrato, f"CNT-{year}-050").huella_pagos
+
+def test_invalid_items_are_reported_and_skipped(api, db, admin, auth_headers):
+    _template(db)
+    _clients(db, admin, 2)
+    db.get(Cliente, 2).is_deleted = True
+    db.commit()
+    response = api.post("/contracts/generar-desde-plantilla/PLT-2026-001/lote", headers=auth_headers, json=[
+        {"cliente_id": 1, "abogado_id": admin.id},
+        {"cliente_id": 2, "abogado_id": admin.id},
+        {"cliente_id": 1, "abogado_id": 999},
+    ])
+    body = response.json()
+    assert [c["indice"] for c in body["creados"]] == [0]
+    assert body["errores"] == [
+        {"indice": 1, "detalle": "Cliente no encontrado"},
+        {"indice": 2, "detalle": "Abogado no encontrado"},
+    ]
+    assert db.query(Contrato).filter(Contrato.es_biblioteca == False).count() == 1
+
+def test_batch_keeps_stats_counters_in_step(api, db, admin, auth_headers):
+    _template(db)
+    _clients(db, admin, 3)
+    before = api.get("/stats/", headers=auth_headers).json()
+    api.post("/contracts/generar-desde-plantilla/PLT-2026-001/lote", headers=auth_headers, json=[
+        {"cliente_id": i, "abogado_id": admin.id} for i in (1, 2, 3)
+    ])
+    # applied as deltas on commit, no reload needed
+    assert counters._loaded
+    after = api.get("/stats/", headers=auth_headers).json()
+    assert after["firmStats"]["totalContracts"] == before["firmStats"]["totalContracts"] + 3
+
+def test_unknown_template_and_empty_batch(api, db, admin, auth_headers):
+    assert api.post("/contracts/generar-desde-plantilla/PLT-2026-404/lote", headers=auth_headers, json=[
+        {"cliente_id": 1, "abogado_id": admin.id},
+    ]).status_code == 404
+    assert api.post("/contracts/generar-desde-plantilla/PLT-2026-404/lote", headers=auth_headers, json=[]).status_code == 400
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,74 @@
+from app.core.clause_store import REF_KEY, clause_bodies, content_hash
+from app.models.clause import ClausulaContenido
+from app.models.contract import Contrato
+from conftest import QueryCounter
+
+BODY = "El arrendador entrega al arrendatario el inmueble descrito. " * 40
+
+def _template(api, auth_headers):
+    return api.post("/contracts/plantilla", headers=auth_headers, json={
+        "titulo": "Arrendamiento",
+        "clauses": [{"titulo": "Objeto", "texto": BODY, "variables": ["Nombre"]}, {"titulo": "Plazo", "texto": "Doce meses."}],
+    }).json()
+
+def _stored_clauses(engine, contract_id):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT clauses FROM contrato WHERE id = ?", (contract_id,)).scalar()
+
+def test_bodies_are_stored_once(api, db, engine, admin, auth_headers):
+    template = _template(api, auth_headers)
+    client = api.post("/clients/", headers=auth_headers, json={"cedula": "1000001", "nombre": "Rosa", "apellido": "Luna"}).json()
+    api.post(f"/contracts/generar-desde-plantilla/{template['id']}/lote", headers=auth_headers, json=[
+        {"cliente_id": client["id"], "abogado_id": admin.id} for _ in range(20)
+    ])
+
+    assert db.query(ClausulaContenido).count() == 2
+    stored = _stored_clauses(engine, template["id"])
+    assert BODY not in stored and content_hash(BODY) in stored
+    generated = db.query(Contrato.id).filter(Contrato.tipo == "contrato").all()
+    assert len(generated) == 20
+    assert all(BODY not in _stored_clauses(engine, contract_id) for (contract_id,) in generated)
+
+def test_reads_return_the_text(api, db, engine, admin, auth_headers):
+    template = _template(api, auth_headers)
+    expected = [{"titulo": "Objeto", "variables": ["Nombre"], "texto": BODY}, {"titulo": "Plazo", "texto": "Doce meses."}]
+    assert api.get(f"/contracts/{template['id']}", headers=auth_headers).json()["clauses"] == expected
+
+    # Cold cache: every reference of the page is fetched in one query
+    clause_bodies.clear()
+    db.expire_all()
+    with QueryCounter(engine) as counter:
+        body = api.get("/contracts/plantillas", headers=auth_headers).json()
+    assert body[0]["clauses"] == expected
+    assert sum("FROM clausula_contenido" in sql for sql in counter.statements) == 1
+
+def test_inline_keys_are_kept_per_contract(db):
+    db.add(ClausulaContenido(huella=content_hash(BODY), texto=BODY))
+    db.add(Contrato(id="CNT-2026-900", clauses=[
+        {"titulo": "Objeto", REF_KEY: content_hash(BODY)},
+        {"titulo": "Objeto", REF_KEY: content_hash(BODY), "variables": ["Ciudad"]},
+    ]))
+    db.commit()
+    db.expunge_all()
+
+    from app.repositories import contract_repository
+    contract = contract_repository.get_contract_by_id(db, "CNT-2026-900")
+    assert [c["texto"] for c in contract.clauses] == [BODY, BODY]
+    assert contract.clauses[1]["variables"] == ["Ciudad"]
+    assert not db.dirty  # resolving is not a change
+
+def test_edited_clause_gets_a_new_body(api, db, auth_headers):
+    item = api.post("/contracts/clausula", headers=auth_headers, json={"titulo": "Objeto", "texto": BODY}).json()
+    updated = api.put(f"/contracts/clausula/{item['id']}", headers=auth_headers, json={"texto": "Texto nuevo"}).json()
+    assert updated["clauses"]["texto"] == "Texto nuevo"
+    assert {row.huella for row in db.query(ClausulaContenido)} == {content_hash(BODY), content_hash("Texto nuevo")}
+
+def test_rolled_back_bodies_are_not_cached(db):
+    db.add(Contrato(id="CNT-2026-901", clauses=[{"titulo": "Objeto", "texto": "Solo en esta transacción"}]))
+    db.flush()
+    db.rollback()
+    assert clause_bodies.get(content_hash("Solo en esta transacción")) is None
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,105 @@
+import io
+import json
+
+from app.models.client import Cliente
+from app.services import client_import
+from tests.conftest import QueryCounter
+
+CSV = (
+    "cedula,nombre,apellido,celular,correo,ciudad\n"
+    "1002003,José,Peña,3001234567,jose@correo.com,Bogotá\n"
+    "1002004,María,Gómez,,,\n"
+    "12ab,Ana,Ruiz,,,\n"
+    "1002003,José,Repetido,,,\n"
+    "5550001,Pedro,Martínez,123,,\n"
+    "7770001,Existente,Cliente,,,\n"
+)
+
+def _upload(api, auth_headers, content, filename="clientes.csv", **params):
+    response = api.post("/clients/import", headers=auth_headers, params=params,
+                        files={"archivo": (filename, content.encode("utf-8"))})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_csv_import_reports_rows_that_cannot_be_imported(api, db, admin, auth_headers):
+    db.add(Cliente(id=50, cedula="7770001", nombre="Otro", apellido="Dueño", usuario_id=admin.id))
+    db.commit()
+    result = _upload(api, auth_headers, CSV)
+    assert (result["creados"], result["actualizados"]) == (2, 0)
+    assert [(e["fila"], e["cedula"]) for e in result["errores"]] == [
+        (4, "12ab"), (5, "1002003"), (6, "5550001"), (7, "7770001"),
+    ]
+    assert "solo números" in result["errores"][0]["detalle"]
+    assert result["errores"][1]["detalle"] == "Cédula repetida en el archivo"
+
+    db.expire_all()
+    clients = {c.cedula: c for c in db.query(Cliente).filter(Cliente.id != 50)}
+    assert sorted(c.id for c in clients.values()) == [51, 52]
+    assert clients["1002003"].nombre_busqueda == "jose pena" and clients["1002003"].usuario_id == admin.id
+    assert clients["1002004"].estado == "Activo" and clients["1002004"].correo is None
+    # Ids continue after the reserved block
+    assert api.get("/clients/next-id", headers=auth_headers).json() == {"next_id": 53}
+
+def test_ndjson_update_of_own_clients(api, db, admin, auth_headers):
+    db.add(Cliente(id=1, cedula="1002003", nombre="Jose", apellido="Vieja", usuario_id=admin.id))
+    db.commit()
+    lines = [
+        json.dumps({"cedula": "1002003", "nombre": "José", "apellido": "Nueva"}),
+        "",
+        "{no es json",
+        json.dumps({"cedula": "1002005", "nombre": "Luis", "apellido": "Díaz"}),
+    ]
+    result = _upload(api, auth_headers, "\n".join(lines), "clientes.ndjson", formato="ndjson", actualizar=True)
+    assert (result["creados"], result["actualizados"]) == (1, 1)
+    assert result["errores"] == [{"fila": 3, "cedula": None, "detalle": "JSON inválido"}]
+    db.expire_all()
+    assert db.get(Cliente, 1).apellido == "Nueva" and db.get(Cliente, 1).nombre_busqueda == "jose nueva"
+
+def test_update_only_overwrites_the_given_fields(api, db, admin, auth_headers):
+    db.add(Cliente(id=1, cedula="1002003", nombre="Jose", apellido="Vieja", celular="3001234567", correo="jose@correo.com",
+                   direccion="Calle 1", ciudad="Cali", estado="Inactivo", usuario_id=admin.id))
+    db.commit()
+    result = _upload(api, auth_headers, "cedula,nombre,apellido,ciudad\n1002003,José,Nueva,\n", actualizar=True)
+    assert result["actualizados"] == 1
+    db.expire_all()
+    client = db.get(Cliente, 1)
+    assert (client.nombre, client.apellido) == ("José", "Nueva")
+    assert (client.celular, client.correo, client.direccion, client.ciudad, client.estado) == (
+        "3001234567", "jose@correo.com", "Calle 1", "Cali", "Inactivo",
+    )
+
+def test_statements_per_batch_do_not_grow_with_rows(engine, db, admin):
+    content = "cedula,nombre,apellido\n" + "".join(f"{2000000 + n},Cliente,Numero\n" for n in range(120))
+    rows = client_import.read_rows(io.BytesIO(content.encode()), "csv")
+    admin_id = admin.id
+    with QueryCounter(engine) as counter:
+        result = client_import.import_clients(db, rows, admin_id, batch_size=50)
+    assert result["creados"] == 120
+    inserts = [s for s in counter.statements if s.startswith("INSERT INTO cliente")]
+    # Lookup, id reservation and one multi-row INSERT per batch, plus creating the id counter once
+    assert len(inserts) == 3 and counter.count == 3 * 3 + 3
+
+def test_stats_see_the_imported_clients(api, auth_headers):
+    before = api.get("/stats/", headers=auth_headers).json()
+    _upload(api, auth_headers, "cedula,nombre,apellido\n3000001,Ana,Ruiz\n3000002,Eva,Sosa\n")
+    after = api.get("/stats/", headers=auth_headers).json()
+    assert after["firmStats"]["totalClients"] == before["firmStats"]["totalClients"] + 2
+
+def test_oversized_upload_is_rejected_before_any_work(api, engine, auth_headers, monkeypatch):
+    monkeypatch.setattr(client_import, "IMPORT_MAX_ROWS", 2)
+    with QueryCounter(engine) as counter:
+        response = api.post("/clients/import", headers=auth_headers, files={"archivo": (
+            "c.csv", b"cedula,nombre,apellido\n3000001,Ana,Ruiz\n3000002,Eva,Sosa\n3000003,Luz,Mora\n",
+        )})
+    assert response.status_code == 400 and "máximo de 2 filas" in response.json()["detail"]
+    assert not any("cliente" in s or "secuencia" in s for s in counter.statements)
+
+def test_invalid_format_and_encoding_are_rejected(api, auth_headers):
+    assert api.post("/clients/import", headers=auth_headers, params={"formato": "xlsx"},
+                    files={"archivo": ("c.xlsx", b"x")}).status_code == 400
+    response = api.post("/clients/import", headers=auth_headers, files={"archivo": ("c.csv", "cedula\n1002003\n".encode("latin-1") + b"\xe9\n")})
+    assert response.status_code == 400
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
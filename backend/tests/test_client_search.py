@@ -0,0 +1,56 @@
+from sqlalchemy.dialects import postgresql
+
+from app.models.client import Cliente, normalize_search_text
+from app.repositories.client_repository import _search_query
+
+def _seed(db, admin):
+    db.add_all([
+        Cliente(id=1, cedula="1002003", nombre="José", apellido="Peña Ruiz", usuario_id=admin.id),
+        Cliente(id=2, cedula="1002999", nombre="María José", apellido="Gómez", usuario_id=admin.id),
+        Cliente(id=3, cedula="5550001", nombre="Pedro", apellido="Martínez", usuario_id=admin.id),
+        Cliente(id=4, cedula="1002004", nombre="José", apellido="Otro Dueño", usuario_id=None),
+        Cliente(id=5, cedula="1002005", nombre="José", apellido="Borrado", usuario_id=admin.id, is_deleted=True),
+    ])
+    db.commit()
+
+def _search(api, auth_headers, q, **params):
+    response = api.get("/clients/search", headers=auth_headers, params={"q": q, **params})
+    assert response.status_code == 200
+    return [c["id"] for c in response.json()]
+
+def test_normalized_name_is_kept_up_to_date(db, admin):
+    _seed(db, admin)
+    client = db.get(Cliente, 1)
+    assert client.nombre_busqueda == "jose pena ruiz"
+    client.apellido = "Núñez"
+    db.commit()
+    assert client.nombre_busqueda == "jose nunez"
+    assert normalize_search_text("  ÁNGEL   Ñ ") == "angel n"
+
+def test_cedula_prefix(api, db, admin, auth_headers):
+    _seed(db, admin)
+    assert _search(api, auth_headers, "1002") == [1, 2]
+    assert _search(api, auth_headers, "1.002.9") == [2]
+
+def test_accent_insensitive_words_in_any_order(api, db, admin, auth_headers):
+    _seed(db, admin)
+    # Names starting with the query come first
+    assert _search(api, auth_headers, "jose") == [1, 2]
+    assert _search(api, auth_headers, "pena jos") == [1]
+    assert _search(api, auth_headers, "MARTÍNEZ") == [3]
+    assert _search(api, auth_headers, "jose", limit=1) == [1]
+
+def test_results_are_scoped_to_the_owner(api, db, admin, auth_headers):
+    _seed(db, admin)
+    assert 4 not in _search(api, auth_headers, "jose")
+    assert 5 not in _search(api, auth_headers, "1002")
+    assert _search(api, auth_headers, "%") == []
+
+def test_postgres_query_uses_trigram_similarity():
+    query = _search_query("postgresql", 7, "Jose Pena", 10)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "cliente.nombre_busqueda %% " in sql and "similarity(cliente.nombre_busqueda" in sql
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
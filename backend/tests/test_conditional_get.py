@@ -0,0 +1,58 @@
+def create_contract(api, auth_headers, client_id, lawyer_id):
+    return api.post("/contracts/", headers=auth_headers, json={
+        "titulo": "Arrendamiento", "cliente_id": client_id, "abogado_id": lawyer_id, "clauses": [],
+    }).json()
+
+def create_client(api, auth_headers, cedula="1000001"):
+    return api.post("/clients/", headers=auth_headers, json={"cedula": cedula, "nombre": "Rosa", "apellido": "Luna"}).json()
+
+def test_contract_detail_revalidates_with_etag(api, admin, auth_headers):
+    client = create_client(api, auth_headers)
+    contract = create_contract(api, auth_headers, client["id"], admin.id)
+
+    first = api.get(f"/contracts/{contract['id']}", headers=auth_headers)
+    etag = first.headers["etag"]
+    assert "last-modified" in first.headers
+
+    revalidated = api.get(f"/contracts/{contract['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    api.put(f"/contracts/{contract['id']}", headers=auth_headers, json={"titulo": "Comodato"})
+    changed = api.get(f"/contracts/{contract['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["titulo"] == "Comodato"
+
+def test_embedded_client_changes_the_contract_version(api, admin, auth_headers):
+    client = create_client(api, auth_headers)
+    contract = create_contract(api, auth_headers, client["id"], admin.id)
+    etag = api.get(f"/contracts/{contract['id']}", headers=auth_headers).headers["etag"]
+
+    api.put(f"/clients/{client['id']}", headers=auth_headers, json={"nombre": "Rosalba"})
+    changed = api.get(f"/contracts/{contract['id']}", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["cliente"]["nombre"] == "Rosalba"
+
+def test_list_etag_follows_membership(api, admin, auth_headers):
+    client = create_client(api, auth_headers)
+    first = api.get("/clients/", headers=auth_headers)
+    etag = first.headers["etag"]
+    assert "last-modified" not in first.headers
+    assert api.get("/clients/", headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    api.delete(f"/clients/{client['id']}", headers=auth_headers)
+    emptied = api.get("/clients/", headers={**auth_headers, "If-None-Match": etag})
+    assert emptied.status_code == 200
+    assert emptied.json() == []
+
+def test_user_me_honours_if_modified_since(api, auth_headers):
+    first = api.get("/users/me", headers=auth_headers)
+    last_modified = first.headers["last-modified"]
+    assert api.get("/users/me", headers={**auth_headers, "If-Modified-Since": last_modified}).status_code == 304
+    # A non-matching ETag wins over a matching date
+    stale = api.get("/users/me", headers={**auth_headers, "If-Modified-Since": last_modified, "If-None-Match": '"old"'})
+    assert stale.status_code == 200
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
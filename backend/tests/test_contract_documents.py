@@ -0,0 +1,77 @@
+import io
+import os
+import time
+
+import pytest
+from docx import Document
+
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from app.services import contract_documents
+
+@pytest.fixture(autouse=True)
+def document_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(contract_documents, "DOCUMENT_CACHE_DIR", str(tmp_path / "documentos"))
+    return tmp_path / "documentos"
+
+def _seed(db, admin):
+    db.add(Cliente(id=1, cedula="1002003", nombre="José", apellido="Peña", ciudad="Bogotá", usuario_id=admin.id))
+    db.add(Contrato(
+        id="CNT-2026-001", titulo="Prestación de servicios", cliente_id=1, abogado_id=admin.id,
+        clauses=[{"titulo": "Objeto", "texto": "Representar a [Nombre Cliente] en [Ciudad Firma].\nSegundo párrafo <con> & símbolos."}],
+        variables_adicionales={"cliente": "José Peña", "ciudadFirma": "Medellín"},
+    ))
+    db.commit()
+
+def _download(api, auth_headers, formato):
+    response = api.get("/contracts/CNT-2026-001/document", headers=auth_headers, params={"format": formato})
+    assert response.status_code == 200, response.text
+    return response
+
+def test_docx_has_the_rendered_clauses_and_parties(api, db, admin, auth_headers):
+    _seed(db, admin)
+    response = _download(api, auth_headers, "docx")
+    assert 'filename="CNT-2026-001.docx"' in response.headers["content-disposition"]
+    text = "\n".join(p.text for p in Document(io.BytesIO(response.content)).paragraphs)
+    assert "Representar a José Peña en Medellín." in text
+    assert "Segundo párrafo <con> & símbolos." in text
+    assert "Cliente: José Peña — C.C. 1002003" in text and "Abogado: Admin Pruebas" in text
+
+def test_repeat_downloads_are_served_from_the_disk_cache(api, db, admin, auth_headers, document_cache, monkeypatch):
+    _seed(db, admin)
+    first = _download(api, auth_headers, "pdf")
+    assert first.content.startswith(b"%PDF") and first.headers["content-type"] == "application/pdf"
+    assert len(list(document_cache.rglob("*.pdf"))) == 1
+
+    def no_render(*args):
+        raise AssertionError("a cached document was rendered again")
+    monkeypatch.setattr(contract_documents, "_submit", no_render)
+    assert _download(api, auth_headers, "pdf").content == first.content
+
+def test_edits_change_the_cache_key(api, db, admin, auth_headers, document_cache):
+    _seed(db, admin)
+    _download(api, auth_headers, "pdf")
+    contract = db.get(Contrato, "CNT-2026-001")
+    contract.variables_adicionales = {"cliente": "José Peña", "ciudadFirma": "Cali"}
+    db.commit()
+    _download(api, auth_headers, "pdf")
+    assert len(list(document_cache.rglob("*.pdf"))) == 2
+
+def test_unknown_format_and_missing_contract(api, db, admin, auth_headers):
+    _seed(db, admin)
+    assert api.get("/contracts/CNT-2026-001/document", headers=auth_headers, params={"format": "odt"}).status_code == 400
+    assert api.get("/contracts/CNT-0000-000/document", headers=auth_headers).status_code == 404
+
+def test_prune_removes_documents_nobody_downloads(document_cache):
+    os.makedirs(document_cache / "ab")
+    old, recent = document_cache / "ab" / "old.pdf", document_cache / "ab" / "recent.pdf"
+    old.write_bytes(b"x")
+    recent.write_bytes(b"x")
+    stale = time.time() - (contract_documents.DOCUMENT_CACHE_MAX_AGE_DAYS + 1) * 86400
+    os.utime(old, (stale, stale))
+    contract_documents.prune_cache()
+    assert not old.exists() and recent.exists()
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
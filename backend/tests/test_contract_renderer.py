@@ -0,0 +1,59 @@
+from app.models.contract import Contrato
+from app.services import contract_renderer
+from app.services.contract_renderer import compile_template, compiled_templates, variable_values
+
+def test_compiled_template_renders_like_the_editor():
+    template = compile_template("[Nombre Cliente], identificado con [DNI Cliente], firma en [Ciudad Firma].")
+    assert template.names == ("Nombre Cliente", "DNI Cliente", "Ciudad Firma")
+    values = variable_values({"cliente": "Rosa Luna", "dniCliente": "", "ciudadFirma": "Bogotá D.C."})
+    text, missing = template.render(values)
+    # Empty values keep the placeholder visible, as renderLiveContent does
+    assert text == "Rosa Luna, identificado con [DNI Cliente], firma en Bogotá D.C.."
+    assert missing == ["DNI Cliente"]
+
+def test_variable_values_mapping():
+    values = variable_values({
+        "modalidadPago": "cuotas", "valorHonorarios": "0.00", "valorPenalidad": "150000",
+        "Plazo Meses": 12, "Nombre Cliente": "Nombre propio",
+    })
+    assert values["Modalidad Pago"] == "Abonos"
+    assert "Valor Honorarios" not in values
+    assert values["Valor Penalidad"] == "150000"
+    assert values["Plazo Meses"] == "12"
+    # A custom field named like a catalog variable wins, like ...formData in the editor
+    assert values["Nombre Cliente"] == "Nombre propio"
+
+def test_clause_text_is_compiled_once():
+    compiled_templates.clear()
+    body = "Entre [Nombre Cliente] y [Representante Legal]."
+    contracts = [
+        Contrato(id=f"CNT-2026-{n}", clauses=[{"titulo": "Partes", "texto": body}], variables_adicionales={"cliente": f"Cliente {n}"})
+        for n in range(3)
+    ]
+    rendered = contract_renderer.render_contracts(contracts)
+    assert len(compiled_templates) == 1
+    assert [r["clausulas"][0]["texto"] for r in rendered] == [f"Entre Cliente {n} y [Representante Legal]." for n in range(3)]
+    assert rendered[0]["variables_faltantes"] == ["Representante Legal"]
+
+def test_render_endpoints(api, db, admin, auth_headers):
+    db.add_all([
+        Contrato(id="CNT-2026-001", titulo="Uno", clauses=[{"titulo": "Objeto", "texto": "Cliente: [Nombre Cliente]"}],
+                 variables_adicionales={"cliente": "Rosa"}),
+        Contrato(id="CNT-2026-002", titulo="Dos", clauses={"titulo": "Única", "texto": "Firma en [Ciudad Firma]"},
+                 variables_adicionales={"ciudadFirma": "Cali"}),
+    ])
+    db.commit()
+
+    single = api.get("/contracts/CNT-2026-001/renderizar", headers=auth_headers).json()
+    assert single["clausulas"] == [{"titulo": "Objeto", "texto": "Cliente: Rosa"}]
+
+    many = api.post("/contracts/renderizar", headers=auth_headers, json={"ids": ["CNT-2026-002", "CNT-2026-404", "CNT-2026-001"]}).json()
+    assert [r["id"] for r in many] == ["CNT-2026-002", "CNT-2026-001"]
+    assert many[0]["clausulas"][0]["texto"] == "Firma en Cali"
+
+    assert api.get("/contracts/CNT-2026-404/renderizar", headers=auth_headers).status_code == 404
+    assert api.post("/contracts/renderizar", headers=auth_headers, json={"ids": []}).status_code == 400
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
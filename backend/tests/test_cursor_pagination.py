@@ -0,0 +1,69 @@
+import base64
+
+import pytest
+
+from app.core.pagination import NEXT_CURSOR_HEADER, encode_cursor
+from app.models.auth import Usuario
+from app.models.client import Cliente
+from app.models.contract import Contrato
+
+LISTS = ["/contracts/", "/clients/", "/users/"]
+
+@pytest.fixture
+def seeded(db, admin):
+    db.add_all([Cliente(id=n, cedula=f"100{n:04d}", nombre="Rosa", apellido="Luna", usuario_id=admin.id) for n in range(1, 8)])
+    db.add_all([Contrato(id=f"CNT-2026-{n:03d}", titulo="Arrendamiento", abogado_id=admin.id) for n in range(1, 8)])
+    db.add_all([
+        Usuario(nombre="Laura", apellido="Abogada", cedula=f"9100{n:05d}", celular=f"310{n:07d}",
+                correo=f"laura{n}@pruebas.com", password="x", estado="Activo")
+        for n in range(1, 7)
+    ])
+    db.commit()
+
+def _walk(api, auth_headers, path, limit):
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = api.get(path, headers=auth_headers, params=params)
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        assert len(pages) < 10, "the cursor does not advance"
+
+@pytest.mark.parametrize("path", LISTS)
+def test_walking_the_cursor_visits_every_row_once(api, auth_headers, seeded, path):
+    everything = [item["id"] for item in api.get(path, headers=auth_headers).json()]
+    assert len(everything) == 7
+
+    pages = _walk(api, auth_headers, path, limit=3)
+    # Full pages carry the cursor; the short last page has no header
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [item for page in pages for item in page] == everything
+
+@pytest.mark.parametrize("path", LISTS)
+def test_an_exact_last_page_ends_with_an_empty_page(api, auth_headers, seeded, path):
+    pages = _walk(api, auth_headers, path, limit=7)
+    assert [len(page) for page in pages] == [7, 0]
+
+@pytest.mark.parametrize("path, wrong_key", [("/contracts/", 3), ("/clients/", "CNT-2026-003"), ("/users/", "3")])
+def test_malformed_or_mistyped_cursors_are_rejected(api, auth_headers, seeded, path, wrong_key):
+    not_json = base64.urlsafe_b64encode(b"not json").decode("ascii")
+    for cursor in ["@@@", not_json, encode_cursor(True), encode_cursor(wrong_key)]:
+        response = api.get(path, headers=auth_headers, params={"cursor": cursor})
+        assert response.status_code == 400, cursor
+        assert response.json()["detail"] == "Cursor de paginación inválido"
+
+@pytest.mark.parametrize("path", LISTS)
+def test_skip_and_limit_still_work(api, auth_headers, seeded, path):
+    everything = [item["id"] for item in api.get(path, headers=auth_headers).json()]
+    response = api.get(path, headers=auth_headers, params={"skip": 2, "limit": 3})
+    assert [item["id"] for item in response.json()] == everything[2:5]
+    # The header works from an offset page too: it continues after the page's last row
+    following = api.get(path, headers=auth_headers, params={"limit": 3, "cursor": response.headers[NEXT_CURSOR_HEADER]})
+    assert [item["id"] for item in following.json()] == everything[5:8]
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,77 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+from app.core.security import create_access_token
+from app.models.auth import Rol, Usuario
+from app.models.contract import Contrato
+from app.models.payment import Pago
+from app.repositories import contract_repository
+from app.services.export_service import export_rows
+
+def _lawyer(db):
+    user = Usuario(
+        nombre="Laura", apellido="Abogada", cedula="900000002", celular="3000000002",
+        correo="laura@pruebas.com", password="x", estado="Activo",
+    )
+    user.roles = [db.query(Rol).filter(Rol.nombre == "Abogado").one()]
+    db.add(user)
+    db.commit()
+    return user
+
+def _seed(db, admin, lawyer):
+    db.add_all([
+        Contrato(id="CNT-1", titulo="Poder, general", abogado_id=admin.id, total=Decimal("1500.50"), fecha=date(2026, 3, 1)),
+        Contrato(id="CNT-2", titulo="Arrendamiento", abogado_id=lawyer.id, total=Decimal("800"), fecha=date(2026, 3, 2)),
+        Contrato(id="CNT-3", titulo="Borrado", abogado_id=lawyer.id, is_deleted=True),
+        Contrato(id="CLA-1", titulo="Cláusula", es_biblioteca=True),
+    ])
+    db.add_all([
+        Pago(contrato_id="CNT-1", tipo_pago="UNICO", monto_abono=Decimal("1500.50"), fecha_vencimiento=date(2026, 4, 1)),
+        Pago(contrato_id="CNT-2", tipo_pago="ABONO", monto_abono=Decimal("400"), fecha_vencimiento=date(2026, 4, 1), estado="PAGADO"),
+        Pago(contrato_id="CNT-2", tipo_pago="ABONO", monto_abono=Decimal("400"), fecha_vencimiento=date(2026, 5, 1)),
+        Pago(contrato_id="CNT-3", tipo_pago="UNICO", monto_abono=Decimal("1"), fecha_vencimiento=date(2026, 4, 1)),
+    ])
+    db.commit()
+
+def test_contracts_csv_matches_the_list_endpoint(api, db, admin, auth_headers):
+    _seed(db, admin, _lawyer(db))
+    response = api.get("/contracts/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="contratos.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    summaries = api.get("/contracts/resumen", headers=auth_headers).json()
+    assert [r["id"] for r in rows] == [s["id"] for s in summaries] == ["CNT-2", "CNT-1"]
+    assert rows[1]["titulo"] == "Poder, general" and rows[1]["total"] == "1500.50"
+
+def test_payments_ndjson_gzip_scoped_to_the_lawyer(api, db, admin):
+    lawyer = _lawyer(db)
+    _seed(db, admin, lawyer)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(lawyer.id)})}"}
+    response = api.get("/payments/export", headers=headers, params={"formato": "ndjson", "gzip": True})
+    assert response.status_code == 200
+    assert 'filename="pagos.ndjson.gz"' in response.headers["content-disposition"]
+    lines = gzip.decompress(response.content).decode().splitlines()
+    payments = [json.loads(line) for line in lines]
+    assert [p["contrato_id"] for p in payments] == ["CNT-2", "CNT-2"]
+    assert payments[0]["monto_abono"] == "400.00" and payments[0]["fecha_vencimiento"] == "2026-04-01"
+    pending = api.get("/payments/export", headers=headers, params={"formato": "ndjson", "estado": "PENDIENTE"})
+    assert [json.loads(line)["fecha_vencimiento"] for line in pending.text.splitlines()] == ["2026-05-01"]
+
+def test_unknown_format_is_rejected(api, auth_headers):
+    assert api.get("/contracts/export", headers=auth_headers, params={"formato": "xlsx"}).status_code == 400
+
+def test_rows_are_encoded_one_batch_at_a_time(engine, db, admin):
+    from sqlalchemy.orm import sessionmaker
+    db.add_all([Contrato(id=f"CNT-{n:03d}", titulo=f"Contrato {n}", abogado_id=admin.id) for n in range(25)])
+    db.commit()
+    chunks = list(export_rows(sessionmaker(bind=engine), contract_repository.export_contracts_query(), "ndjson", batch_size=10))
+    assert [chunk.count(b"\n") for chunk in chunks] == [10, 10, 5]
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
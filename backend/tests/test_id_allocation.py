@@ -0,0 +1,44 @@
+from datetime import date
+
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from app.services import contract_service, sequence_service
+
+def test_contract_ids_are_consecutive(db):
+    first = contract_service.generate_id(db, "CNT")
+    second = contract_service.generate_id(db, "CNT")
+    year = date.today().year
+    assert first == f"CNT-{year}-001"
+    assert second == f"CNT-{year}-002"
+
+def test_counter_is_seeded_from_existing_ids(db):
+    year = date.today().year
+    db.add_all([
+        Contrato(id=f"PLT-{year}-007", es_biblioteca=True),
+        Contrato(id=f"PLT-{year}-legacy", es_biblioteca=True),
+    ])
+    db.commit()
+    assert contract_service.generate_id(db, "PLT") == f"PLT-{year}-008"
+
+def test_block_reservation(db):
+    year = date.today().year
+    ids = contract_service.generate_ids(db, "LIB", 3)
+    assert ids == [f"LIB-{year}-001", f"LIB-{year}-002", f"LIB-{year}-003"]
+    assert contract_service.generate_id(db, "LIB") == f"LIB-{year}-004"
+
+def test_client_peek_does_not_consume(db):
+    db.add(Cliente(id=41, cedula="1234567", nombre="Ana", apellido="Perez"))
+    db.commit()
+    assert sequence_service.peek_client_id(db) == 42
+    assert sequence_service.peek_client_id(db) == 42
+    assert sequence_service.next_client_id(db) == 42
+    assert sequence_service.peek_client_id(db) == 43
+
+def test_rollback_releases_reservation(db):
+    sequence_service.reserve(db, "TST", 5)
+    db.rollback()
+    assert sequence_service.next_value(db, "TST") == 1
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
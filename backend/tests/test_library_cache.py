@@ -0,0 +1,44 @@
+from conftest import assert_max_queries
+
+def test_library_is_served_from_cache_with_etag(api, engine, auth_headers):
+    api.post("/contracts/clausula", headers=auth_headers, json={"titulo": "Objeto", "texto": "El contratista..."})
+
+    first = api.get("/contracts/clausulas", headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert [item["titulo"] for item in first.json()] == ["Objeto"]
+
+    # principal and library both come from process caches
+    with assert_max_queries(engine, 0):
+        cached = api.get("/contracts/clausulas", headers=auth_headers)
+    assert cached.content == first.content
+
+    revalidated = api.get("/contracts/clausulas", headers={**auth_headers, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+def test_library_writes_invalidate_the_cache(api, auth_headers):
+    created = api.post("/contracts/clausula", headers=auth_headers, json={"titulo": "Objeto", "texto": "v1"}).json()
+    etag = api.get("/contracts/clausulas", headers=auth_headers).headers["etag"]
+
+    api.put(f"/contracts/clausula/{created['id']}", headers=auth_headers, json={"texto": "v2"})
+    updated = api.get("/contracts/clausulas", headers={**auth_headers, "If-None-Match": etag})
+    assert updated.status_code == 200
+    assert updated.json()[0]["clauses"]["texto"] == "v2"
+
+    api.delete(f"/contracts/clausula/{created['id']}", headers=auth_headers)
+    assert api.get("/contracts/clausulas", headers=auth_headers).json() == []
+
+def test_templates_have_their_own_entry(api, auth_headers):
+    api.post("/contracts/plantilla", headers=auth_headers, json={
+        "titulo": "Servicios", "clauses": [{"titulo": "Objeto", "texto": "..."}],
+    })
+    clausulas = api.get("/contracts/clausulas", headers=auth_headers)
+    plantillas = api.get("/contracts/plantillas", headers=auth_headers)
+    assert clausulas.json() == []
+    assert [item["titulo"] for item in plantillas.json()] == ["Servicios"]
+    assert clausulas.headers["etag"] != plantillas.headers["etag"]
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,46 @@
+def _seed(api, auth_headers):
+    api.post("/contracts/clausula", headers=auth_headers, json={
+        "titulo": "Cláusula penal", "texto": "En caso de incumplimiento el deudor pagará una penalidad equivalente al diez por ciento.",
+    })
+    api.post("/contracts/clausula", headers=auth_headers, json={
+        "titulo": "Confidencialidad", "texto": "Las partes guardarán reserva sobre la información del proceso de insolvencia.",
+    })
+    api.post("/contracts/plantilla", headers=auth_headers, json={
+        "titulo": "Insolvencia persona natural",
+        "clauses": [{"titulo": "Objeto", "texto": "Representación en el trámite de insolvencia económica."},
+                    {"titulo": "Honorarios", "texto": "El incumplimiento en los pagos suspende la representación."}],
+    })
+
+def test_search_ranks_and_highlights(api, auth_headers):
+    _seed(api, auth_headers)
+    results = api.get("/contracts/biblioteca/buscar", headers=auth_headers, params={"q": "insolvencia"}).json()
+    # The title match ranks first
+    assert [r["titulo"] for r in results] == ["Insolvencia persona natural", "Confidencialidad"]
+    assert "<mark>insolvencia</mark>" in results[1]["fragmento"]
+    assert results[0]["rank"] >= results[1]["rank"]
+
+def test_search_filters_by_tipo_and_paginates(api, auth_headers):
+    _seed(api, auth_headers)
+    clauses = api.get("/contracts/biblioteca/buscar", headers=auth_headers, params={"q": "incumplimiento", "tipo": "clausula"}).json()
+    assert [r["titulo"] for r in clauses] == ["Cláusula penal"]
+    page = api.get("/contracts/biblioteca/buscar", headers=auth_headers, params={"q": "incumplimiento", "limit": 1, "skip": 1}).json()
+    assert len(page) == 1
+
+def test_search_follows_edits_and_deletes(api, auth_headers):
+    item = api.post("/contracts/clausula", headers=auth_headers, json={"titulo": "Arras", "texto": "Se entregan arras confirmatorias."}).json()
+    api.put(f"/contracts/clausula/{item['id']}", headers=auth_headers, json={"texto": "Se pacta una prenda sin tenencia."})
+    search = lambda q: api.get("/contracts/biblioteca/buscar", headers=auth_headers, params={"q": q}).json()
+    assert search("confirmatorias") == []
+    assert [r["id"] for r in search("prenda")] == [item["id"]]
+    api.delete(f"/contracts/clausula/{item['id']}", headers=auth_headers)
+    assert search("prenda") == []
+
+def test_operators_in_the_query_are_plain_words(api, auth_headers):
+    _seed(api, auth_headers)
+    response = api.get("/contracts/biblioteca/buscar", headers=auth_headers, params={"q": 'penal" OR NEAR(*'})
+    assert response.status_code == 200
+    assert api.get("/contracts/biblioteca/buscar", headers=auth_headers, params={"q": "  "}).json() == []
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from app.models.payment import Pago
+from app.services import overdue_service
+from tests.conftest import QueryCounter
+
+TODAY = date(2026, 6, 1)
+
+def _seed(db, admin):
+    db.add_all([
+        Contrato(id="CNT-1", abogado_id=admin.id, estado="ACTIVO"),
+        Contrato(id="CNT-2", abogado_id=admin.id, estado="ACTIVO"),
+        Contrato(id="CNT-3", abogado_id=admin.id, estado="BORRADOR"),
+        Contrato(id="CNT-4", abogado_id=admin.id, estado="ACTIVO", is_deleted=True),
+    ])
+    db.add_all([
+        # Due yesterday and due today: only the first is overdue
+        Pago(id=1, contrato_id="CNT-1", monto_abono=Decimal("10"), fecha_vencimiento=date(2026, 5, 31)),
+        Pago(id=2, contrato_id="CNT-1", monto_abono=Decimal("10"), fecha_vencimiento=TODAY),
+        # Paid late is not overdue
+        Pago(id=3, contrato_id="CNT-2", monto_abono=Decimal("10"), fecha_vencimiento=date(2026, 1, 1),
+             estado="PAGADO", fecha_pago=date(2026, 2, 1)),
+        Pago(id=4, contrato_id="CNT-3", monto_abono=Decimal("10"), fecha_vencimiento=date(2026, 1, 1)),
+        Pago(id=5, contrato_id="CNT-4", monto_abono=Decimal("10"), fecha_vencimiento=date(2026, 1, 1)),
+    ])
+    db.commit()
+
+def test_marks_overdue_payments_and_their_contracts(db, admin):
+    _seed(db, admin)
+    assert overdue_service.sweep_overdue(db, TODAY) == {"pagos": 1, "contratos": 1}
+    db.commit()
+    db.expire_all()
+    # Installments of drafts and deleted contracts are not swept
+    assert {p.id: p.estado for p in db.query(Pago)} == {
+        1: "VENCIDO", 2: "PENDIENTE", 3: "PAGADO", 4: "PENDIENTE", 5: "PENDIENTE",
+    }
+    assert {c.id: c.estado for c in db.query(Contrato)} == {
+        "CNT-1": "VENCIDO", "CNT-2": "ACTIVO", "CNT-3": "BORRADOR", "CNT-4": "ACTIVO",
+    }
+    # A second run finds nothing to do
+    assert overdue_service.sweep_overdue(db, TODAY) == {"pagos": 0, "contratos": 0}
+
+def test_template_generated_drafts_are_not_swept(api, db, admin, auth_headers):
+    db.add(Cliente(id=1, cedula="1002003", nombre="José", apellido="Peña", usuario_id=admin.id))
+    db.add(Contrato(id="PLT-2026-001", titulo="Arrendamiento", tipo="plantilla", es_biblioteca=True,
+                    clauses=[{"titulo": "Objeto", "texto": "..."}]))
+    db.commit()
+    response = api.post("/contracts/generar-desde-plantilla/PLT-2026-001", headers=auth_headers, json={
+        "cliente_id": 1, "abogado_id": admin.id, "total": 100,
+        "variables_adicionales": {"modalidadPago": "cuotas", "installments": [{"fecha": "2026-01-01", "monto": 100}]},
+    })
+    assert response.status_code == 200 and response.json()["estado"] == "Borrador"
+    contract_id = response.json()["id"]
+
+    assert overdue_service.sweep_overdue(db, TODAY) == {"pagos": 0, "contratos": 0}
+    db.commit()
+    assert db.get(Contrato, contract_id).estado == "Borrador"
+    assert [p.estado for p in db.query(Pago).filter(Pago.contrato_id == contract_id)] == ["PENDIENTE"]
+
+def test_two_statements_whatever_the_volume(engine, db, admin):
+    _seed(db, admin)
+    db.add_all([Contrato(id=f"CNT-X{n}", abogado_id=admin.id, estado="ACTIVO") for n in range(50)])
+    db.add_all([Pago(contrato_id=f"CNT-X{n}", fecha_vencimiento=date(2026, 1, 1)) for n in range(50)])
+    db.commit()
+    with QueryCounter(engine) as counter:
+        result = overdue_service.sweep_overdue(db, TODAY)
+    assert result == {"pagos": 51, "contratos": 51}
+    assert [s.split()[0] for s in counter.statements] == ["UPDATE", "UPDATE"]
+
+def test_job_records_metrics_and_refreshes_stats(api, engine, db, admin, auth_headers, monkeypatch):
+    _seed(db, admin)
+    monkeypatch.setattr(overdue_service, "SessionLocal", sessionmaker(bind=engine))
+    expired_before = api.get("/stats/", headers=auth_headers).json()["userStats"]["contractStatus"]["expired"]
+    runs, contracts = overdue_service.sweep_runs.value(outcome="ok"), overdue_service.sweep_marked.value(entidad="contrato")
+
+    assert overdue_service.run_overdue_sweep(TODAY) == {"pagos": 1, "contratos": 1}
+    assert overdue_service.sweep_runs.value(outcome="ok") == runs + 1
+    assert overdue_service.sweep_marked.value(entidad="contrato") == contracts + 1
+    assert api.get("/stats/", headers=auth_headers).json()["userStats"]["contractStatus"]["expired"] == expired_before + 1
+
+def test_a_sweep_that_cannot_take_the_lock_skips(engine, db, admin, monkeypatch):
+    _seed(db, admin)
+    monkeypatch.setattr(overdue_service, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(overdue_service, "_try_lock", lambda db: False)
+    skipped = overdue_service.sweep_runs.value(outcome="skipped")
+    assert overdue_service.run_overdue_sweep(TODAY) is None
+    assert overdue_service.sweep_runs.value(outcome="skipped") == skipped + 1
+    db.expire_all()
+    assert db.get(Pago, 1).estado == "PENDIENTE"
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
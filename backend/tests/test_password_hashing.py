@@ -0,0 +1,45 @@
+import threading
+from unittest import mock
+import pytest
+
+@pytest.fixture
+def lawyer(db):
+    from app.models.auth import Usuario
+    from app.core.security import get_password_hash
+    user = Usuario(
+        nombre="Luis", apellido="Paz", cedula="900000002", celular="3000000002",
+        correo="luis@pruebas.com", password=get_password_hash("Secreta#2026"), estado="Activo",
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+def login(api, password):
+    return api.post("/token", data={"username": "luis@pruebas.com", "password": password})
+
+def test_login_verifies_off_the_event_loop(api, lawyer, monkeypatch):
+    from app.core import security
+    executor = mock.Mock(wraps=security._hash_executor)
+    monkeypatch.setattr(security, "_hash_executor", executor)
+    assert login(api, "Secreta#2026").json()["token_type"] == "bearer"
+    # The bcrypt check was handed to the dedicated hash pool
+    executor.submit.assert_called_once_with(security.pwd_context.verify, "Secreta#2026", lawyer.password)
+
+def test_failed_logins_lock_the_account(api, db, lawyer):
+    assert login(api, "mala").status_code == 401
+    assert login(api, "mala").status_code == 401
+    assert login(api, "mala").status_code == 403
+    db.refresh(lawyer)
+    assert lawyer.estado == "Bloqueado"
+    assert login(api, "Secreta#2026").status_code == 403
+
+def test_saturated_hash_pool_sheds_load(api, lawyer, monkeypatch):
+    from app.core import security
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    security._hash_slots.acquire()
+    response = login(api, "Secreta#2026")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core.metrics import registry
+from app.core.pool import InstrumentedQueuePool, checkout_seconds, checkout_timeouts, in_use, instrument
+
+@pytest.fixture
+def small_pool(tmp_path):
+    engine = instrument(create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_logging_name="test",
+        pool_size=1, max_overflow=0, pool_timeout=0.05,
+    ))
+    yield engine
+    engine.dispose()
+
+def test_checkouts_are_timed_and_tracked(small_pool):
+    before = checkout_seconds.count(pool="test")
+    with small_pool.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert in_use.value(pool="test") == 1
+    assert in_use.value(pool="test") == 0
+    assert checkout_seconds.count(pool="test") == before + 1
+
+def test_saturation_counts_timeouts(small_pool):
+    timeouts = checkout_timeouts.value(pool="test")
+    with small_pool.connect():
+        with pytest.raises(exc.TimeoutError):
+            small_pool.connect()
+    assert checkout_timeouts.value(pool="test") == timeouts + 1
+
+def test_metrics_render_prometheus_text(small_pool):
+    with small_pool.connect():
+        body = registry.render()
+    assert 'db_pool_checked_out{pool="test"} 1' in body
+    assert 'db_pool_size{pool="test"} 1' in body
+    assert '# TYPE db_pool_checkout_seconds histogram' in body
+    assert 'db_pool_checkout_seconds_bucket{pool="test",le="+Inf"}' in body
+
+@pytest.fixture
+def metrics_api():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routes import metrics
+    app = FastAPI()
+    app.include_router(metrics.router)
+    return TestClient(app)
+
+def test_metrics_token_is_required_when_configured(metrics_api, monkeypatch):
+    from app.routes import metrics
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "s3creto")
+    assert metrics_api.get("/metrics").status_code == 401
+    assert metrics_api.get("/metrics", headers={"Authorization": "Bearer otro"}).status_code == 401
+    response = metrics_api.get("/metrics", headers={"Authorization": "Bearer s3creto"})
+    assert response.status_code == 200 and "# TYPE" in response.text
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,41 @@
+from conftest import assert_max_queries
+
+def test_identity_is_resolved_without_queries(api, engine, auth_headers):
+    assert api.get("/stats/", headers=auth_headers).status_code == 200
+    with assert_max_queries(engine, 0):
+        assert api.get("/stats/", headers=auth_headers).status_code == 200
+    # check_admin_role reads the cached role names: only the roles listing itself runs
+    with assert_max_queries(engine, 1):
+        assert api.get("/roles/", headers=auth_headers).status_code == 200
+
+def test_profile_update_is_visible_immediately(api, admin, auth_headers):
+    assert api.get("/users/me", headers=auth_headers).json()["nombre"] == "Admin"
+    api.put("/users/me", headers=auth_headers, json={"nombre": "Ana"})
+    assert api.get("/users/me", headers=auth_headers).json()["nombre"] == "Ana"
+
+def test_deactivation_evicts_the_principal(api, db, admin, auth_headers):
+    from app.models.auth import Usuario
+    from app.core.security import create_access_token
+    lawyer = Usuario(
+        nombre="Luis", apellido="Paz", cedula="900000002", celular="3000000002",
+        correo="luis@pruebas.com", password="x", estado="Activo",
+    )
+    db.add(lawyer)
+    db.commit()
+    lawyer_headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(lawyer.id)})}"}
+    assert api.get("/stats/", headers=lawyer_headers).status_code == 200
+
+    api.put(f"/users/{lawyer.id}", headers=auth_headers, json={"estado": "Inactivo"})
+    assert api.get("/stats/", headers=lawyer_headers).status_code == 403
+
+def test_role_change_takes_effect_on_next_request(api, db, admin, auth_headers):
+    from app.models.auth import Rol
+    abogado = db.query(Rol).filter(Rol.nombre == "Abogado").one()
+    assert api.get("/users/", headers=auth_headers).status_code == 200
+
+    api.put(f"/users/{admin.id}", headers=auth_headers, json={"roles_ids": [abogado.id]})
+    assert api.get("/users/", headers=auth_headers).status_code == 403
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
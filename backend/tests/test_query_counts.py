@@ -0,0 +1,56 @@
+from app.models.auth import Rol, Usuario
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from conftest import assert_max_queries
+
+def _seed_contracts(db, total=20):
+    role = db.query(Rol).filter(Rol.nombre == "Abogado").first()
+    for i in range(total):
+        lawyer = Usuario(
+            nombre="Abogado", apellido="Prueba", cedula=f"80000{i:04d}", celular=f"31000{i:05d}",
+            correo=f"abogado{i}@pruebas.com", password="x",
+        )
+        lawyer.roles = [role]
+        client = Cliente(id=i + 1, cedula=f"70000{i:04d}", nombre="Cliente", apellido="Prueba")
+        db.add_all([lawyer, client])
+        db.flush()
+        db.add(Contrato(id=f"CNT-2026-{i:03d}", titulo="Contrato", cliente_id=client.id, abogado_id=lawyer.id))
+    db.commit()
+
+def test_contract_list_does_not_issue_n_plus_one(api, db, engine, auth_headers):
+    _seed_contracts(db)
+    # principal, contracts, clients, lawyers, lawyer roles
+    with assert_max_queries(engine, 5):
+        response = api.get("/contracts/?limit=100", headers=auth_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body) == 20
+    assert all(item["cliente"] and item["abogado"]["roles"] for item in body)
+
+def test_contract_detail_loads_relations_eagerly(api, db, engine, auth_headers):
+    _seed_contracts(db, total=1)
+    with assert_max_queries(engine, 4):
+        response = api.get("/contracts/CNT-2026-000", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["abogado"]["roles"][0]["nombre"] == "Abogado"
+
+def test_contract_summary_is_a_single_projection(api, db, engine, auth_headers):
+    _seed_contracts(db)
+    # principal, then one SELECT with both outer joins
+    with assert_max_queries(engine, 2) as counter:
+        response = api.get("/contracts/resumen?limit=100", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+    assert "clauses" not in counter.statements[-1]
+    assert response.json()[0]["cliente"]["cedula"]
+
+def test_user_list_batches_roles(api, db, engine, auth_headers):
+    _seed_contracts(db, total=10)
+    with assert_max_queries(engine, 4):
+        response = api.get("/users/", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 11
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,50 @@
+import pytest
+from app.core import replica
+from app.core.principals import current_user_id
+
+@pytest.fixture
+def healthy_replica(monkeypatch):
+    monkeypatch.setattr(replica, "REPLICA_ENABLED", True)
+    monkeypatch.setattr(replica, "_lag_seconds", 0.2)
+    replica._recent_writers.clear()
+    yield
+    replica._recent_writers.clear()
+
+def test_reads_stay_on_primary_without_replica():
+    assert not replica.use_replica(user_id=1)
+
+def test_unknown_or_excessive_lag_falls_back_to_primary(healthy_replica, monkeypatch):
+    assert replica.use_replica(user_id=1)
+    monkeypatch.setattr(replica, "_lag_seconds", replica.REPLICA_MAX_LAG_SECONDS + 1)
+    assert not replica.use_replica(user_id=1)
+    monkeypatch.setattr(replica, "_lag_seconds", None)
+    assert not replica.use_replica(user_id=1)
+
+def test_writers_read_their_writes_from_primary(healthy_replica, db, admin):
+    token = current_user_id.set(admin.id)
+    try:
+        admin.biografia = "Socia fundadora"
+        db.commit()
+    finally:
+        current_user_id.reset(token)
+    assert not replica.use_replica(user_id=admin.id)
+    assert replica.use_replica(user_id=admin.id + 1)
+
+def test_rolled_back_writes_are_not_recorded(healthy_replica, db, admin):
+    token = current_user_id.set(admin.id)
+    try:
+        admin.biografia = "Borrador"
+        db.flush()
+        db.rollback()
+    finally:
+        current_user_id.reset(token)
+    assert replica.use_replica(user_id=admin.id)
+
+def test_lag_probe_on_sqlite_reports_no_lag(monkeypatch, engine):
+    monkeypatch.setattr(replica, "replica_engine", engine)
+    monkeypatch.setattr(replica, "_lag_seconds", None)
+    replica.measure_replica_lag()
+    assert replica._lag_seconds == 0.0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,120 @@
+import warnings
+
+from sqlalchemy.exc import SAWarning
+
+from app.models.client import Cliente
+from app.models.contract import Contrato
+from conftest import assert_max_queries
+
+def _seed(db, admin):
+    db.add_all([
+        Cliente(id=1, cedula="1000001", nombre="Ana", apellido="Gil", usuario_id=admin.id),
+        Cliente(id=2, cedula="1000002", nombre="Luis", apellido="Paz", usuario_id=None),
+        Cliente(id=3, cedula="1000003", nombre="Eva", apellido="Rey", usuario_id=admin.id, is_deleted=True),
+        Contrato(id="CNT-2026-001", abogado_id=admin.id, estado="BORRADOR",
+                 variables_adicionales={"areaPractica": "Civil"}),
+        Contrato(id="CNT-2026-002", abogado_id=admin.id, estado="VENCIDO",
+                 variables_adicionales={"areaPractica": "Laboral"}),
+        Contrato(id="CNT-2026-003", abogado_id=None, estado="TERMINADO",
+                 variables_adicionales={"areaPractica": "Civil"}),
+        Contrato(id="CNT-2026-004", abogado_id=admin.id, estado="BORRADOR", is_deleted=True),
+        Contrato(id="LIB-2026-001", es_biblioteca=True, estado="ACTIVO"),
+    ])
+    db.commit()
+
+def test_stats_cold_read(api, db, engine, admin, auth_headers):
+    _seed(db, admin)
+    # principal lookup + one GROUP BY per table to load the counters
+    with assert_max_queries(engine, 3):
+        response = api.get("/stats/", headers=auth_headers)
+    assert response.json() == {
+        "firmStats": {"totalContracts": 3, "totalClients": 2},
+        "userStats": {
+            "myContracts": 2,
+            "myClients": 1,
+            "contractStatus": {"expired": 1, "drafts": 1, "completed": 0},
+        },
+    }
+
+def test_single_aggregate_when_counters_disabled(db, engine, admin, monkeypatch):
+    from app.services import stats_service
+    _seed(db, admin)
+    monkeypatch.setattr(stats_service, "STATS_COUNTERS_ENABLED", False)
+    user_id = admin.id
+    with assert_max_queries(engine, 1), warnings.catch_warnings():
+        # The two one-row aggregates are joined explicitly, not as a cartesian product
+        warnings.simplefilter("error", SAWarning)
+        stats = stats_service.get_stats(db, user_id)
+    assert stats["userStats"]["contractStatus"] == {"expired": 1, "drafts": 1, "completed": 0}
+
+def test_breakdown_by_area(api, db, admin, auth_headers):
+    _seed(db, admin)
+    response = api.get("/stats/desglose?por=area", headers=auth_headers)
+    assert response.status_code == 200
+    by_area = {row["clave"]: row for row in response.json()}
+    assert by_area["Civil"]["total"] == 2
+    assert by_area["Civil"]["contractStatus"]["completed"] == 1
+    assert by_area["Laboral"]["contractStatus"]["expired"] == 1
+
+def test_breakdown_rejects_unknown_dimension(api, auth_headers):
+    assert api.get("/stats/desglose?por=ciudad", headers=auth_headers).status_code == 400
+
+def test_counters_follow_writes_without_rescanning(api, db, engine, admin, auth_headers):
+    _seed(db, admin)
+    api.get("/stats/", headers=auth_headers)
+
+    created = api.post("/contracts/", headers=auth_headers, json={
+        "cliente_id": 1, "abogado_id": admin.id, "estado": "TERMINADO",
+    }).json()
+    api.post("/clients/", headers=auth_headers, json={"cedula": "1000009", "nombre": "Rosa", "apellido": "Luna"})
+    api.delete("/clients/1", headers=auth_headers)
+    api.put(f"/contracts/CNT-2026-001", headers=auth_headers, json={"estado": "VENCIDO"})
+
+    # principal is cached and the counters are already up to date
+    with assert_max_queries(engine, 0):
+        stats = api.get("/stats/", headers=auth_headers).json()
+    assert stats["firmStats"] == {"totalContracts": 4, "totalClients": 2}
+    assert stats["userStats"]["myContracts"] == 3
+    assert stats["userStats"]["myClients"] == 1
+    assert stats["userStats"]["contractStatus"] == {"expired": 2, "drafts": 0, "completed": 1}
+
+    api.delete(f"/contracts/{created['id']}", headers=auth_headers)
+    stats = api.get("/stats/", headers=auth_headers).json()
+    assert stats["userStats"]["contractStatus"]["completed"] == 0
+
+def test_counters_ignore_rolled_back_writes(db, admin):
+    from app.services import stats_service
+    _seed(db, admin)
+    before = stats_service.get_stats(db, admin.id)
+    db.add(Contrato(id="CNT-2026-099", abogado_id=admin.id, estado="BORRADOR"))
+    db.flush()
+    db.rollback()
+    assert stats_service.get_stats(db, admin.id) == before
+
+def test_reload_racing_a_commit_is_not_installed(db, engine, admin, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+    from app.repositories import stats_repository
+    from app.services import stats_service
+    from app.services.stats_counters import counters
+    _seed(db, admin)
+    admin_id = admin.id
+    query_clients = stats_repository.get_client_counts_by_owner
+
+    def commit_during_reload(session):
+        # The contract GROUP BY already ran; this commit lands before the reload is installed
+        with sessionmaker(bind=engine)() as writer:
+            writer.add(Contrato(id="CNT-2026-098", abogado_id=admin_id, estado="BORRADOR"))
+            writer.commit()
+        return query_clients(session)
+    monkeypatch.setattr(stats_repository, "get_client_counts_by_owner", commit_during_reload)
+    counters.reconcile(db)
+    monkeypatch.setattr(stats_repository, "get_client_counts_by_owner", query_clients)
+
+    assert not counters._loaded
+    # The next read reloads instead of serving counters without the new draft
+    assert stats_service.get_stats(db, admin_id)["userStats"]["myContracts"] == 3
+    assert counters._loaded
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,143 @@
+from datetime import date
+
+from app.models.contract import Contrato
+from app.models.payment import Pago
+from app.services import contract_service
+
+def _contract(db, installments, total=None):
+    contract = Contrato(
+        id="CNT-2026-900",
+        total=total,
+        fecha=date(2026, 1, 15),
+        variables_adicionales={"modalidadPago": "cuotas", "installments": installments},
+    )
+    db.add(contract)
+    db.commit()
+    return contract
+
+def _payments(db):
+    return db.query(Pago).filter(Pago.contrato_id == "CNT-2026-900").order_by(Pago.id).all()
+
+def test_initial_sync_creates_installments(db):
+    contract = _contract(db, [
+        {"fecha": "2026-02-01", "monto": "1,000.00"},
+        {"fecha": "2026-03-01", "monto": "500"},
+    ])
+    contract_service.sync_payments(db, contract)
+    payments = _payments(db)
+    assert [(p.tipo_pago, str(p.monto_abono), p.fecha_vencimiento) for p in payments] == [
+        ("ABONO", "1000.00", date(2026, 2, 1)),
+        ("ABONO", "500.00", date(2026, 3, 1)),
+    ]
+    assert str(payments[0].monto_total_contrato) == "1500.00"
+
+def test_unchanged_schedule_is_skipped(db):
+    contract = _contract(db, [{"fecha": "2026-02-01", "monto": "100"}])
+    contract_service.sync_payments(db, contract)
+    # The request's unit of work commits once the route returns
+    db.commit()
+    ids_before = [p.id for p in _payments(db)]
+    db.refresh(contract)
+
+    statements = []
+    from sqlalchemy import event
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        contract_service.sync_payments(db, contract)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert statements == []
+    assert [p.id for p in _payments(db)] == ids_before
+
+def test_changes_keep_paid_installments(db):
+    contract = _contract(db, [
+        {"fecha": "2026-02-01", "monto": "100"},
+        {"fecha": "2026-03-01", "monto": "100"},
+        {"fecha": "2026-04-01", "monto": "100"},
+    ])
+    contract_service.sync_payments(db, contract)
+    first, second, third = _payments(db)
+    first.estado = "PAGADO"
+    first.fecha_pago = date(2026, 1, 30)
+    db.commit()
+
+    contract.variables_adicionales = {"modalidadPago": "cuotas", "installments": [
+        {"fecha": "2026-02-01", "monto": "100"},
+        {"fecha": "2026-03-15", "monto": "200"},
+    ]}
+    db.commit()
+    contract_service.sync_payments(db, contract)
+    db.expire_all()
+
+    payments = _payments(db)
+    assert [p.id for p in payments] == [first.id, second.id]
+    assert payments[0].estado == "PAGADO"
+    assert payments[0].fecha_pago == date(2026, 1, 30)
+    assert payments[1].fecha_vencimiento == date(2026, 3, 15)
+    assert str(payments[1].monto_abono) == "200.00"
+
+def _pay(db, payment):
+    payment.estado = "PAGADO"
+    payment.fecha_pago = date(2026, 1, 30)
+    db.commit()
+
+def _reschedule(db, contract, installments):
+    contract.variables_adicionales = {"modalidadPago": "cuotas", "installments": installments}
+    db.commit()
+    contract_service.sync_payments(db, contract)
+    db.expire_all()
+    return [(p.estado, str(p.monto_abono), p.fecha_vencimiento, p.fecha_pago) for p in _payments(db)]
+
+def test_removing_a_paid_installment_leaves_it_untouched(db):
+    contract = _contract(db, [
+        {"fecha": "2026-02-01", "monto": "100"},
+        {"fecha": "2026-03-01", "monto": "200"},
+        {"fecha": "2026-04-01", "monto": "300"},
+    ])
+    contract_service.sync_payments(db, contract)
+    _pay(db, _payments(db)[0])
+
+    # The paid row keeps its amount and date; the unpaid ones still follow the schedule
+    assert _reschedule(db, contract, [
+        {"fecha": "2026-03-01", "monto": "200"},
+        {"fecha": "2026-04-01", "monto": "300"},
+    ]) == [
+        ("PAGADO", "100.00", date(2026, 2, 1), date(2026, 1, 30)),
+        ("PENDIENTE", "200.00", date(2026, 3, 1), None),
+        ("PENDIENTE", "300.00", date(2026, 4, 1), None),
+    ]
+
+def test_paid_installment_is_matched_by_date_and_amount(db):
+    contract = _contract(db, [
+        {"fecha": "2026-02-01", "monto": "100"},
+        {"fecha": "2026-03-01", "monto": "200"},
+        {"fecha": "2026-04-01", "monto": "300"},
+    ])
+    contract_service.sync_payments(db, contract)
+    _pay(db, _payments(db)[1])
+
+    # A new installment before the paid one shifts positions, not the paid row
+    assert _reschedule(db, contract, [
+        {"fecha": "2026-02-01", "monto": "100"},
+        {"fecha": "2026-02-15", "monto": "150"},
+        {"fecha": "2026-03-01", "monto": "200"},
+        {"fecha": "2026-04-01", "monto": "300"},
+    ]) == [
+        ("PENDIENTE", "100.00", date(2026, 2, 1), None),
+        ("PAGADO", "200.00", date(2026, 3, 1), date(2026, 1, 30)),
+        ("PENDIENTE", "150.00", date(2026, 2, 15), None),
+        ("PENDIENTE", "300.00", date(2026, 4, 1), None),
+    ]
+
+def test_single_payment_uses_contract_total(db):
+    contract = _contract(db, [], total=750)
+    contract_service.sync_payments(db, contract)
+    (payment,) = _payments(db)
+    assert payment.tipo_pago == "UNICO"
+    assert payment.fecha_vencimiento == date(2026, 1, 15)
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
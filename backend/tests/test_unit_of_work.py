@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from conftest import QueryCounter
+
+@pytest.fixture
+def commits():
+    seen = []
+    listener = lambda conn: seen.append(conn)
+    event.listen(Engine, "commit", listener)
+    yield seen
+    event.remove(Engine, "commit", listener)
+
+def create_client(api, auth_headers):
+    return api.post("/clients/", headers=auth_headers, json={"cedula": "1000001", "nombre": "Rosa", "apellido": "Luna"}).json()
+
+def test_contract_creation_commits_once_without_refresh(api, engine, admin, auth_headers, commits):
+    client = create_client(api, auth_headers)
+    commits.clear()
+    with QueryCounter(engine) as counter:
+        response = api.post("/contracts/", headers=auth_headers, json={
+            "titulo": "Arrendamiento", "cliente_id": client["id"], "abogado_id": admin.id,
+            "variables_adicionales": {"modalidadPago": "unico", "fechaPago": "2026-11-01"}, "total": 1000,
+        })
+    assert response.status_code == 200
+    assert response.json()["fecha"]  # server default, returned by the INSERT
+    assert len(commits) == 1
+    inserted = [i for i, sql in enumerate(counter.statements) if sql.startswith("INSERT INTO contrato")]
+    # nothing reads the contract row back after inserting it
+    assert inserted and not any("FROM contrato" in sql for sql in counter.statements[inserted[0]:])
+
+def test_failed_request_is_rolled_back(api, db, auth_headers):
+    from app.models.client import Cliente
+    create_client(api, auth_headers)
+    # The duplicate check raises after the sequence row was already touched
+    response = api.post("/clients/", headers=auth_headers, json={"cedula": "1000001", "nombre": "Otra", "apellido": "Vez"})
+    assert response.status_code == 400
+    assert db.query(Cliente).count() == 1
+
+def test_writes_are_visible_to_the_next_request(api, auth_headers):
+    client = create_client(api, auth_headers)
+    api.put(f"/clients/{client['id']}", headers=auth_headers, json={"nombre": "Rosalba"})
+    assert api.get(f"/clients/{client['id']}", headers=auth_headers).json()["nombre"] == "Rosalba"
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,92 @@
+"""
+Throughput benchmark of the contract render engine (app/services/contract_renderer.py).
+
+It renders a batch of contracts that share a large clause set, comparing:
+
+  * editor algorithm: one regex replace per known variable over every clause,
+    as renderLiveContent does in RegisterContract.jsx;
+  * compiled, cold:   every clause parsed on first use;
+  * compiled, warm:   compiled templates served from the cache.
+
+No database is needed. Run from backend/:
+
+    python ../scripts/bench_render.py --contracts 500 --clauses 200 --placeholders 8
+"""
+import sys
+import os
+import argparse
+import random
+import re
+import time
+
+# Añadir el directorio actual al path (ejecutar desde backend/)
+sys.path.append(os.getcwd())
+
+from app.models.contract import Contrato
+from app.services import contract_renderer
+from app.services.contract_renderer import STANDARD_VARIABLES, compiled_templates, variable_values
+
+WORDS = "el arrendador entrega al arrendatario el inmueble descrito en la presente cláusula".split()
+
+def build_clauses(count: int, placeholders: int, words: int):
+    names = list(STANDARD_VARIABLES) + [f"Variable {n}" for n in range(20)]
+    clauses = []
+    for n in range(count):
+        parts = []
+        for _ in range(placeholders):
+            parts.append(" ".join(random.choices(WORDS, k=words // placeholders)))
+            parts.append(f"[{random.choice(names)}]")
+        clauses.append({"titulo": f"Cláusula {n + 1}", "texto": " ".join(parts)})
+    return clauses
+
+def build_contracts(count: int, clauses: list):
+    return [
+        Contrato(
+            id=f"CNT-BENCH-{n}",
+            clauses=clauses,
+            variables_adicionales={
+                "cliente": f"Cliente {n}", "dniCliente": str(10_000_000 + n), "ciudadFirma": "Bogotá D.C.",
+                **{f"Variable {v}": f"valor {v}" for v in range(0, 20, 2)},
+            },
+        )
+        for n in range(count)
+    ]
+
+def render_like_editor(contract: Contrato):
+    values = variable_values(contract.variables_adicionales)
+    rendered = []
+    for entry in contract.clauses:
+        live = entry["texto"]
+        for name, value in values.items():
+            live = re.sub(r"\[" + re.escape(name) + r"\]", lambda _: value, live)
+        rendered.append(live)
+    return rendered
+
+def timed(label: str, fn, contracts: list, clause_count: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    rendered = len(contracts) * clause_count
+    print(f"{label:<20} {elapsed * 1000:>10.1f} ms {len(contracts) / elapsed:>12.0f} contratos/s {rendered / elapsed:>14.0f} cláusulas/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contracts", type=int, default=500)
+    parser.add_argument("--clauses", type=int, default=200)
+    parser.add_argument("--placeholders", type=int, default=8, help="Variables por cláusula")
+    parser.add_argument("--words", type=int, default=120, help="Palabras por cláusula")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    clauses = build_clauses(args.clauses, args.placeholders, args.words)
+    contracts = build_contracts(args.contracts, clauses)
+    print(f"{args.contracts} contratos x {args.clauses} cláusulas ({args.placeholders} variables cada una)\n")
+
+    timed("algoritmo del editor", lambda: [render_like_editor(c) for c in contracts], contracts, args.clauses)
+    compiled_templates.clear()
+    timed("compilado, en frío", lambda: contract_renderer.render_contracts(contracts[:1]), contracts[:1], args.clauses)
+    timed("compilado, en caché", lambda: contract_renderer.render_contracts(contracts), contracts, args.clauses)
+
+if __name__ == "__main__":
+    main()
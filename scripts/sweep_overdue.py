@@ -0,0 +1,35 @@
+"""
+Runs the overdue sweep once (app/services/overdue_service.py): PENDIENTE
+installments past their due date and the contracts that have them become VENCIDO.
+
+The API already runs it every OVERDUE_SWEEP_SECONDS; this entry point is for cron
+or for catching up by hand. It takes the same advisory lock, so it is safe to run
+while the API is up. Run from backend/:
+
+    python ../scripts/sweep_overdue.py [--fecha 2026-10-18]
+"""
+import sys
+import os
+import argparse
+from datetime import date
+
+# Añadir el directorio actual al path (ejecutar desde backend/)
+sys.path.append(os.getcwd())
+
+from app.services.overdue_service import run_overdue_sweep
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fecha", type=date.fromisoformat, default=None,
+                        help="Fecha de corte (AAAA-MM-DD); por defecto hoy")
+    args = parser.parse_args()
+
+    result = run_overdue_sweep(args.fecha)
+    if result is None:
+        print("Otro proceso está ejecutando el barrido; no se hizo nada.")
+        return
+    print(f"Pagos vencidos: {result['pagos']}")
+    print(f"Contratos vencidos: {result['contratos']}")
+
+if __name__ == "__main__":
+    main()